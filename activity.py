@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+import settings
+
+# Row labels of the hour of week heatmap (pandas's dayofweek order)
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+def local_dates(frame, timezone=settings.ACTIVITY_TIMEZONE):
+
+    """
+    The tweets's dates in a timezone - the API's dates are UTC.
+
+    Args:
+        frame (DataFrame): The session's tweets (see tweet_buffer.session_frame).
+        timezone (str): The timezone, e.g. 'Asia/Jerusalem'.
+
+    Returns:
+        dates (Series): The local dates, without a timezone (excel doesn't support them).
+    """
+
+    if timezone in (None, 'UTC'):
+        return frame['date']
+
+    return frame['date'].dt.tz_localize('UTC').dt.tz_convert(timezone).dt.tz_localize(None)
+
+
+def time_series(frame, frequency=settings.ACTIVITY_FREQUENCY, timezone=settings.ACTIVITY_TIMEZONE):
+
+    """
+    Tweets, likes & retweets of each hashtag per time bucket - a single groupby of the whole session's tweets.
+
+    Every hashtag gets every bucket between the session's first & last tweets (0 when it has no tweets in it), so all
+    the hashtags share the same time axis.
+
+    Args:
+        frame (DataFrame): The session's tweets (see tweet_buffer.session_frame).
+        frequency (str): The bucket's length, e.g. 'h' (hour) or 'D' (day).
+        timezone (str): The buckets's timezone.
+
+    Returns:
+        series (DataFrame): 'Hashtag', 'Time', 'Tweets', 'Likes' & 'Retweets' of each bucket of each hashtag, by
+                            hashtag & time.
+    """
+
+    columns = ['Hashtag', 'Time', 'Tweets', 'Likes', 'Retweets']
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    buckets = local_dates(frame, timezone).dt.floor(frequency).rename('time')
+    series = frame.groupby([frame['hashtag'], buckets], observed=True).agg(
+        tweets=('tweet_id', 'size'), likes=('likes', 'sum'), retweets=('retweets', 'sum'))
+
+    # The empty buckets of each hashtag count 0
+    tags = frame['hashtag'].cat.remove_unused_categories().cat.categories
+    times = pd.date_range(buckets.min(), buckets.max(), freq=frequency)
+    series = series.reindex(pd.MultiIndex.from_product([tags, times], names=['hashtag', 'time']), fill_value=0)
+
+    series = series.reset_index()
+    series.columns = columns
+
+    return series
+
+
+def hour_of_week(frame, timezone=settings.ACTIVITY_TIMEZONE):
+
+    """
+    Tweets of each hashtag per day of week & hour of day - a single groupby of the whole session's tweets.
+
+    Args:
+        frame (DataFrame): The session's tweets (see tweet_buffer.session_frame).
+        timezone (str): The hours's timezone.
+
+    Returns:
+        heatmap (DataFrame): The tweets of each hashtag & day (rows, Monday first) in each hour (columns 0 - 23).
+    """
+
+    if frame.empty:
+        return pd.DataFrame(columns=np.arange(24))
+
+    dates = local_dates(frame, timezone)
+    counts = frame.groupby([frame['hashtag'], dates.dt.dayofweek.rename('day'), dates.dt.hour.rename('hour')],
+                           observed=True).size()
+
+    tags = frame['hashtag'].cat.remove_unused_categories().cat.categories
+    index = pd.MultiIndex.from_product([tags, np.arange(len(DAYS))], names=['hashtag', 'day'])
+
+    return counts.unstack('hour').reindex(index=index, columns=np.arange(24), fill_value=0).fillna(0).astype(np.int64)
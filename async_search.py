@@ -0,0 +1,280 @@
+import asyncio
+from urllib.parse import urlencode
+
+import aiohttp
+from oauthlib.oauth1 import Client
+from tweepy import (TweepError, RateLimitError)
+
+from rate_limit import (WINDOW, RateLimiter)
+from search_client import (API_ROOT, RETRY_STATUSES, SEARCH_PATH, SEARCH_PARAMS, PagePlan, backoff, fail_tags,
+                           loads)
+from tweet_buffer import TweetBuffer
+import settings
+
+
+class AsyncSearchEngine:
+
+    """
+    asyncio fetch engine which paginates many hashtags concurrently on a single event loop.
+
+    Each hashtag gets a producer which pages backwards through the search results and a consumer which decodes the
+    pages into the hashtag's TweetBuffer. The two are connected by a bounded page queue, so a producer waits when its
+    consumer falls behind, and all the requests share one connection pool limited to `concurrency`.
+
+    Like CredentialPool, every API key has its own RateLimiter for each endpoint, corrected by the 'x-rate-limit-*'
+    headers: each request is signed by the key with the most budget left, and the requests wait (without blocking the
+    loop) only when all the keys ran out. A 429 empties its key and the request waits for another key or the reset.
+
+    Attributes:
+        api_root (str): Base url of the api.
+        concurrency (int): Maximum concurrent requests.
+        queue_size (int): Maximum pages waiting in each hashtag's queue.
+        gzip (bool): Ask for gzip compressed responses.
+        retries (int): Retries of a request which failed with a connection error, a timeout or a 5xx response.
+        timeout (tuple): Connect & read timeouts of a request.
+        retry_backoff (float): Base in seconds of the backoff between the retries.
+        keys (list): (signer, limits) of each key - an oauthlib client which signs its requests & its RateLimiter of
+                     each endpoint's path.
+        __session (ClientSession): aiohttp session, created on the running event loop.
+        __requests (Semaphore): Limits the concurrent requests.
+
+    Methods:
+        __init__(self, auth, api_root=API_ROOT, concurrency=settings.ASYNC_CONCURRENCY,
+                 queue_size=settings.ASYNC_PAGE_QUEUE, gzip=settings.GZIP, retries=settings.RETRIES,
+                 timeout=settings.REQUEST_TIMEOUT, retry_backoff=settings.RETRY_BACKOFF,
+                 rate_limits=settings.RATE_LIMITS, rate_window=WINDOW): Class's constructor - auth is an OAuthHandler
+                 or a list of them (one per API key).
+        search(self, tag_list, num_of_tweets): Search all the hashtags concurrently.
+        close(self): Closes the aiohttp session.
+    """
+
+    def __init__(self, auth, api_root=API_ROOT, concurrency=settings.ASYNC_CONCURRENCY,
+                 queue_size=settings.ASYNC_PAGE_QUEUE, gzip=settings.GZIP, retries=settings.RETRIES,
+                 timeout=settings.REQUEST_TIMEOUT, retry_backoff=settings.RETRY_BACKOFF,
+                 rate_limits=settings.RATE_LIMITS, rate_window=WINDOW):
+
+        """Initializing AsyncSearchEngine Class"""
+        self.api_root = api_root
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.gzip = gzip
+        self.retries = retries
+        self.timeout = timeout
+        self.retry_backoff = retry_backoff
+        self.keys = [(Client(key.consumer_key, client_secret=key.consumer_secret, resource_owner_key=key.access_token,
+                             resource_owner_secret=key.access_token_secret),
+                      {path: RateLimiter(limit, rate_window) for path, limit in rate_limits.items()})
+                     for key in (auth if isinstance(auth, (list, tuple)) else [auth])]
+        self.__session = None
+        self.__requests = None
+        self.__loop = None
+
+    async def __open(self):
+
+        """Creates the aiohttp session & the requests semaphore on the running event loop (once per loop)."""
+
+        loop = asyncio.get_running_loop()
+
+        if self.__session is None or self.__session.closed or self.__loop is not loop:
+            self.__loop = loop
+            self.__requests = asyncio.Semaphore(self.concurrency)
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1]),
+                headers={'Accept-Encoding': 'gzip' if self.gzip else 'identity'})
+
+    async def close(self):
+
+        """Closes the aiohttp session."""
+
+        if self.__session is not None and not self.__session.closed:
+            await self.__session.close()
+
+    async def __acquire(self, path):
+
+        """
+        Takes a call from the key with the most budget left in its window, sleeping until the earliest window when all
+        the keys ran out (the loop keeps serving the other requests).
+
+        Args:
+            path (str): Endpoint's path.
+
+        Returns:
+            (signer, limiter): The chosen key's signer & RateLimiter (None when the endpoint isn't limited).
+        """
+
+        while True:
+            # No await between the check & the take - the requests of a single loop don't race
+            limited = [(limits[path], signer) for signer, limits in self.keys if path in limits]
+
+            if not limited:
+                return self.keys[0][0], None
+
+            for limiter, signer in sorted(limited, key=lambda key: key[0].remaining, reverse=True):
+                if limiter.acquire(block=False):
+                    return signer, limiter
+
+            wait = min(limiter.wait_time() for limiter, _ in limited)
+            print("Rate limit of all {} keys reached, waiting {:.0f} seconds".format(len(limited), wait))
+            await asyncio.sleep(wait)
+
+    async def __get(self, path, params):
+
+        """
+        Performs a signed GET request within the endpoint's rate limit and decodes its json body, retrying connection
+        errors, timeouts, 5xx responses & undecodable bodies after a jittered exponential backoff. A 429 response
+        waits for another key or the window's reset (see __acquire) and doesn't count as a retry.
+
+        Args:
+            path (str): Endpoint's path.
+            params (dict): Query parameters.
+
+        Returns:
+            The decoded json body.
+        """
+
+        attempt = 0
+
+        while True:
+            signer, limiter = await self.__acquire(path)
+
+            # Signed per attempt - the nonce can't be reused
+            uri, headers, _ = signer.sign(self.api_root + path + '?' + urlencode(params), http_method='GET')
+
+            try:
+                async with self.__requests:
+                    async with self.__session.get(uri, headers=headers) as resp:
+                        body = await resp.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = TweepError('Failed to send request: {0!r}'.format(e))
+
+            else:
+                if limiter is not None:
+                    limiter.update(resp.headers)
+
+                if resp.status == 429:
+                    if limiter is None:
+                        raise RateLimitError(body.decode(errors='replace'), resp)
+
+                    # The key is empty until its reset - the next acquire picks another key or waits
+                    limiter.exhaust()
+                    continue
+
+                if resp.status in RETRY_STATUSES:
+                    error = TweepError('Twitter error response: status code = {0}'.format(resp.status), resp)
+                elif resp.status != 200:
+                    raise TweepError('Twitter error response: status code = {0}'.format(resp.status), resp)
+                else:
+                    try:
+                        return loads(body)
+                    except ValueError as e:
+                        error = TweepError('Failed to decode response: {0}'.format(e), resp)
+
+            if attempt >= self.retries:
+                raise error
+
+            await asyncio.sleep(backoff(attempt, self.retry_backoff))
+            attempt += 1
+
+    async def __produce(self, hashtag, num_of_tweets, pages):
+
+        """
+        Pages backwards through the hashtag's search results and puts the pages into its queue.
+
+        Args:
+            hashtag (str): The hashtag to search for.
+            num_of_tweets (int): Number of tweets to be pulled out.
+            pages (Queue): The hashtag's bounded page queue - None marks its end.
+
+        Returns:
+            None
+        """
+
+        plan = PagePlan(num_of_tweets)
+
+        try:
+            while not plan.done:
+                statuses = plan.feed(await self.__get(SEARCH_PATH, dict(SEARCH_PARAMS, q=hashtag, **plan.params())))
+
+                if statuses:
+                    # Waits while the queue is full
+                    await pages.put(statuses)
+        except Exception:
+            # Ends the queue, so the consumer finishes with the pages before the failure (not when it's cancelled -
+            # its consumer failed and nobody takes the pages)
+            await pages.put(None)
+            raise
+
+        await pages.put(None)
+
+        print(plan.summary(hashtag))
+
+    @staticmethod
+    async def __consume(pages, tweets):
+
+        """
+        Decodes the pages of a hashtag's queue into its buffer until the end of the queue.
+
+        Args:
+            pages (Queue): The hashtag's bounded page queue.
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
+
+        Returns:
+            None
+        """
+
+        while True:
+            page = await pages.get()
+
+            if page is None:
+                return
+
+            tweets.extend(page)
+
+    async def __search_hashtag(self, hashtag, num_of_tweets):
+
+        """
+        Search a single hashtag with its own producer, consumer & page queue. A search which fails after its retries
+        gets the failure policy (see fail_tags) - the other hashtags aren't affected.
+
+        Args:
+            hashtag (str): The hashtag to search for.
+            num_of_tweets (int): Number of tweets to be pulled out.
+
+        Returns:
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
+        """
+
+        pages = asyncio.Queue(maxsize=self.queue_size)
+        results = {hashtag: TweetBuffer()}
+
+        producer = asyncio.ensure_future(self.__produce(hashtag, num_of_tweets, pages))
+
+        # The consumer always finishes - the producer ends the queue even when it fails
+        try:
+            await self.__consume(pages, results[hashtag])
+            await producer
+        except Exception as error:
+            # A failed consumer leaves the producer waiting on a full queue - it's cancelled
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            fail_tags(results, [hashtag], error)
+
+        return results[hashtag]
+
+    async def search(self, tag_list, num_of_tweets):
+
+        """
+        Search all the hashtags concurrently.
+
+        Args:
+            tag_list (iterable): The hashtags to search for.
+            num_of_tweets (int): Number of tweets to be pulled out for each hashtag.
+
+        Returns:
+            tweet_matrix (list): The TweetBuffer of each hashtag (same order as tag_list).
+        """
+
+        await self.__open()
+
+        return list(await asyncio.gather(*(self.__search_hashtag(hashtag, num_of_tweets) for hashtag in tag_list)))
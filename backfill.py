@@ -0,0 +1,194 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import (datetime, timedelta, timezone)
+
+from search_client import (MAX_COUNT, SEARCH_PARAMS, PagePlan)
+import settings
+
+# Twitter's epoch (ms) - a tweet id is (ms since the epoch << 22) + worker & sequence bits
+TWEPOCH = 1288834974657
+
+
+def snowflake_id(moment):
+
+    """
+    The smallest tweet id of a moment - ids are time ordered, so a time window is an id range.
+
+    Args:
+        moment (datetime): An aware datetime.
+
+    Returns:
+        The id (int).
+    """
+
+    return (int(moment.timestamp() * 1000) - TWEPOCH) << 22
+
+
+def window_start(days=settings.BACKFILL_DAYS):
+
+    """The smallest tweet id of the search window (the last `days` days)."""
+
+    return snowflake_id(datetime.now(timezone.utc) - timedelta(days=days))
+
+
+class Backfill:
+
+    """
+    Parallel backfill of a single hashtag over disjoint id ranges.
+
+    A first page (the probe) measures the hashtag's density - tweets per id. The window below it is split into
+    disjoint (since_id, max_id] ranges sized to hold about num_of_tweets / (workers * partitions_per_worker) tweets
+    each (in whole pages), and the ranges are paginated concurrently, newest first. A range stops once it & the newer
+    ranges hold num_of_tweets, so the merged result is the newest num_of_tweets of the hashtag, like a serial search.
+    The ranges are created lazily with the density measured so far, so quiet hours don't turn into many empty
+    requests.
+
+    Attributes:
+        search_client (SearchClient): The client which performs the searches (pool_size >= workers).
+        hashtag (str): The searched hashtag.
+        num_of_tweets (int): Number of tweets to be pulled out.
+        workers (int): Concurrent ranges.
+        partition_tweets (int): Expected number of tweets of a range.
+        since_id (int): Bottom of the window (exclusive).
+        parts (list): The statuses of each range, newest range first (the probe's first).
+        requests (int): Number of requests made so far.
+        error (Exception): The error which stopped a range (None while all succeed).
+
+    Methods:
+        __init__(self, search_client, hashtag, num_of_tweets, workers=settings.BACKFILL_WORKERS,
+                 partitions_per_worker=settings.BACKFILL_PARTITIONS, since_id=None): Class's constructor.
+        run(self, tweets): Backfills the hashtag into its TweetBuffer.
+    """
+
+    def __init__(self, search_client, hashtag, num_of_tweets, workers=settings.BACKFILL_WORKERS,
+                 partitions_per_worker=settings.BACKFILL_PARTITIONS, since_id=None):
+
+        """Initializing Backfill Class"""
+        self.search_client = search_client
+        self.hashtag = hashtag
+        self.num_of_tweets = num_of_tweets
+        self.workers = workers
+        # Whole pages, so a range doesn't end with a short page
+        self.partition_tweets = MAX_COUNT * math.ceil(num_of_tweets / (workers * partitions_per_worker * MAX_COUNT))
+        self.since_id = window_start() if since_id is None else since_id
+        self.parts = list()
+        self.requests = 0
+        self.error = None
+        self.__failed = None
+        self.__covered = 0
+        self.__found = 0
+        self.__lock = threading.Lock()
+        self.__slots = threading.Semaphore(workers)
+
+    def __newer(self, index):
+
+        # Number of tweets of a range & the newer ones
+        with self.__lock:
+            return sum(len(part) for part in self.parts[:index + 1])
+
+    def __span(self, upper):
+
+        # Ids of the next range, by the density of the fully searched ranges
+        with self.__lock:
+            if self.__found == 0:
+                return upper - self.since_id
+
+            return math.ceil(self.partition_tweets * self.__covered / self.__found)
+
+    def __cover(self, since_id, max_id, found):
+
+        with self.__lock:
+            self.__covered += max_id - since_id
+            self.__found += found
+
+    def __partition(self, index, since_id, max_id):
+
+        # Paginate the (since_id, max_id] range until it's over or the newer ranges hold num_of_tweets
+        plan = PagePlan(self.num_of_tweets)
+        plan.max_id = max_id
+
+        try:
+            while not plan.done and self.error is None and self.__newer(index) < self.num_of_tweets:
+                statuses = plan.feed(self.search_client.search(self.hashtag, since_id=since_id, **SEARCH_PARAMS,
+                                                               **plan.params()))
+                with self.__lock:
+                    self.parts[index].extend(statuses)
+
+            if plan.exhausted:
+                self.__cover(since_id, max_id, len(self.parts[index]))
+
+        except Exception as error:
+            with self.__lock:
+                if self.__failed is None or index < self.__failed:
+                    self.__failed, self.error = index, error
+
+        finally:
+            with self.__lock:
+                self.requests += plan.requests
+            self.__slots.release()
+
+    def __merge(self):
+
+        # The ranges are disjoint & newest first - concatenating them keeps the newest first order
+        statuses, seen = list(), set()
+        last = len(self.parts) - 1 if self.__failed is None else self.__failed
+
+        # A failed range ends the contiguous tweets - the older ranges are left out
+        for part in self.parts[:last + 1]:
+            for status in part:
+                if status['id'] not in seen:
+                    seen.add(status['id'])
+                    statuses.append(status)
+
+        return statuses[:self.num_of_tweets]
+
+    def run(self, tweets):
+
+        """
+        Backfills the hashtag into its TweetBuffer - when a range fails, the newer tweets collected so far are copied
+        before the error is raised.
+
+        Args:
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
+
+        Parameters:
+            probe (PagePlan): Pagination plan of the first page.
+            upper (int): Top (max_id) of the next range.
+
+        Returns:
+            None
+        """
+
+        probe = PagePlan(self.num_of_tweets)
+        statuses = probe.feed(self.search_client.search(self.hashtag, since_id=self.since_id, **SEARCH_PARAMS,
+                                                        **probe.params()))
+        self.parts.append(statuses)
+        self.requests = probe.requests
+
+        if statuses and not probe.done:
+            self.__cover(probe.max_id, max(status['id'] for status in statuses), len(statuses))
+            upper = probe.max_id
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                while upper > self.since_id and self.error is None:
+                    self.__slots.acquire()
+
+                    if self.__newer(len(self.parts) - 1) >= self.num_of_tweets:
+                        self.__slots.release()
+                        break
+
+                    lower = max(self.since_id, upper - self.__span(upper))
+                    with self.__lock:
+                        self.parts.append(list())
+                    executor.submit(self.__partition, len(self.parts) - 1, lower, upper)
+                    upper = lower
+
+        statuses = self.__merge()
+        tweets.extend(statuses)
+
+        print("{}: backfill of {} tweets over {} id ranges ({} workers), {} requests".format(
+            self.hashtag, len(statuses), len(self.parts), self.workers, self.requests))
+
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,1221 @@
+"""
+Benchmarks of the search & analysis pipeline.
+
+Usage:
+    python benchmark.py              Runs all the benchmarks.
+    python benchmark.py page_decode  Runs only the given benchmarks.
+"""
+
+import gzip
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from http.server import (BaseHTTPRequestHandler, ThreadingHTTPServer)
+from urllib.parse import (parse_qs, urlsplit)
+
+from tweet_buffer import TweetBuffer
+import search_client
+
+
+def make_status(i):
+
+    """
+    Creates a fake status (dict) shaped like a search result with tweet_mode='extended'.
+
+    Args:
+        i (int): Running number of the status - used for its id, user & text.
+
+    Returns:
+        status (dict): The fake status.
+    """
+
+    return {
+        'created_at': 'Wed Oct 10 20:19:24 +0000 2018',
+        'id': TOP_ID - i,
+        'id_str': str(TOP_ID - i),
+        'full_text': 'Tweet number {0} about #python and #data https://t.co/abc{0}'.format(i),
+        'truncated': False,
+        'display_text_range': [0, 50],
+        'entities': {'hashtags': [{'text': 'python', 'indices': [20, 27]}, {'text': 'data', 'indices': [32, 37]}],
+                     'symbols': [], 'user_mentions': [], 'urls': []},
+        'metadata': {'iso_language_code': 'en', 'result_type': 'recent'},
+        'source': '<a href="http://twitter.com/download/iphone" rel="nofollow">Twitter for iPhone</a>',
+        'in_reply_to_status_id': None,
+        'user': {
+            'id': 1000 + i % 250,
+            'id_str': str(1000 + i % 250),
+            'name': 'User {0}'.format(i % 250),
+            'screen_name': 'user{0}'.format(i % 250),
+            'location': 'Tel Aviv',
+            'description': 'Just a fake user for benchmarking',
+            'followers_count': 10 * i,
+            'friends_count': i,
+            'listed_count': 0,
+            'created_at': 'Mon Jan 01 10:00:00 +0000 2018',
+            'favourites_count': 0,
+            'verified': False,
+            'statuses_count': 100,
+            'lang': None,
+            'entities': {'description': {'urls': []}},
+        },
+        'geo': None,
+        'coordinates': None,
+        'place': None,
+        'is_quote_status': False,
+        'retweet_count': i % 7,
+        'favorite_count': i % 11,
+        'favorited': False,
+        'retweeted': False,
+        'lang': 'en',
+    }
+
+
+TOP_ID = 1050118621198921728
+
+
+def make_page(count=100, start=0):
+
+    """
+    Creates the raw body of a fake search page.
+
+    Args:
+        count (int): Number of statuses in the page.
+        start (int): Running number of the first status.
+
+    Returns:
+        The json encoded page (bytes).
+    """
+
+    page = {'statuses': [make_status(i) for i in range(start, start + count)],
+            'search_metadata': {'count': count, 'max_id': TOP_ID - start}}
+
+    return json.dumps(page).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    """Serves the stand-in server's page for every GET request, over HTTP/1.1 keep-alive connections."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+
+        self.server.requests += 1
+        time.sleep(self.server.latency)
+        body = self.server.page if self.server.total is None else self.paged_body()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+
+        for name, value in self.rate_limit_headers().items():
+            self.send_header(name, value)
+
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = self.server.gzip_page if self.server.total is None else gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def rate_limit_headers(self):
+
+        """The response's 'x-rate-limit-*' headers (none by default)."""
+
+        return dict()
+
+    def paged_body(self):
+
+        """
+        Pages through `total` fake tweets according to the request's count, max_id & since_id, like the search
+        endpoint.
+        """
+
+        query = parse_qs(urlsplit(self.path).query)
+        count = int(query.get('count', ['15'])[0])
+        start = TOP_ID - int(query['max_id'][0]) if 'max_id' in query else 0
+        end = min(self.server.total, TOP_ID - int(query['since_id'][0])) if 'since_id' in query else self.server.total
+        count = max(0, min(count, end - start))
+
+        page = {'statuses': [make_status(i) for i in range(start, start + count)],
+                'search_metadata': {'count': count}}
+        if start + count < end:
+            page['search_metadata']['next_results'] = '?max_id={0}'.format(TOP_ID - start - count)
+
+        return json.dumps(page).encode()
+
+    def log_message(self, format, *args):
+
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+
+    """
+    Local stand-in of the search endpoint, used as a context manager which serves in a background thread.
+
+    Attributes:
+        page (bytes): The json page returned for every request (when total is None).
+        gzip_page (bytes): The gzip compressed page.
+        total (int): Number of fake tweets to page through (instead of the fixed page).
+        requests (int): Number of requests served.
+        latency (float): Seconds each search request takes (a network round trip stand-in).
+        api_root (str): Base url to be given to SearchClient.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, page=b'{}', handler=StandInHandler, total=None):
+
+        super().__init__(('127.0.0.1', 0), handler)
+        self.page = page
+        self.gzip_page = gzip.compress(page)
+        self.total = total
+        self.requests = 0
+        self.latency = 0
+        self.api_root = 'http://127.0.0.1:{0}/1.1'.format(self.server_address[1])
+
+    def __enter__(self):
+
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+
+        self.shutdown()
+        self.server_close()
+
+
+class StreamStandInHandler(BaseHTTPRequestHandler):
+
+    """Streams the server's `total` fake tweets as json lines (like the filter stream) and closes the connection."""
+
+    def do_GET(self):
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+
+        lines = [json.dumps(make_status(i)).encode() + b'\r\n' for i in range(1000)]
+        try:
+            for i in range(0, self.server.total, len(lines)):
+                self.wfile.writelines(lines[:self.server.total - i])
+        except ConnectionError:
+            # The collector disconnected
+            pass
+
+    def log_message(self, format, *args):
+
+        pass
+
+
+class StandInStream:
+
+    """Replaces tweepy's Stream - reads the stream stand-in server's lines into the listener."""
+
+    url = None
+
+    def __init__(self, auth, listener):
+
+        self.listener = listener
+        self.running = False
+
+    def filter(self, track=None, languages=None):
+
+        self.running = True
+        with urllib.request.urlopen(self.url) as resp:
+            for line in resp:
+                if not self.running or self.listener.on_data(line.decode()) is False:
+                    break
+
+        self.running = False
+
+    def disconnect(self):
+
+        self.running = False
+
+
+class SparseStandInHandler(StandInHandler):
+
+    """
+    Search stand-in over several hashtags - the server's `volumes` maps each hashtag (without '#') to its number of
+    tweets, and a '#a OR #b' query pages through the union of its hashtags' tweets.
+    """
+
+    def paged_body(self):
+
+        query = parse_qs(urlsplit(self.path).query)
+        count = int(query.get('count', ['15'])[0])
+        max_id = int(query['max_id'][0]) if 'max_id' in query else TOP_ID
+        tags = sorted(self.server.volumes)
+        searched = [tag.lstrip('#').lower() for tag in query['q'][0].split(' OR ')]
+
+        # Tweet j of the k-th hashtag gets the id TOP_ID - (j * len(tags) + k)
+        ids = sorted((TOP_ID - (j * len(tags) + tags.index(tag)) for tag in searched
+                      for j in range(self.server.volumes[tag])), reverse=True)
+        ids = [tweet_id for tweet_id in ids if tweet_id <= max_id]
+
+        statuses = list()
+        for tweet_id in ids[:count]:
+            status = make_status(TOP_ID - tweet_id)
+            status['entities']['hashtags'] = [{'text': tags[(TOP_ID - tweet_id) % len(tags)]}]
+            statuses.append(status)
+
+        page = {'statuses': statuses, 'search_metadata': {'count': len(statuses)}}
+        if len(ids) > count:
+            page['search_metadata']['next_results'] = '?max_id={0}'.format(ids[count])
+
+        return json.dumps(page).encode()
+
+
+class VolumeStandInHandler(StandInHandler):
+
+    """
+    Search stand-in of hashtags with different volumes - the server's `volumes` maps each hashtag to its number of
+    tweets within the last `span` ids, so a busier hashtag has more tweets per id (per time).
+    """
+
+    def paged_body(self):
+
+        query = parse_qs(urlsplit(self.path).query)
+        count = int(query.get('count', ['15'])[0])
+        volume = self.server.volumes[query['q'][0]]
+        step = self.server.span // max(1, volume)
+
+        # Tweet j of the hashtag gets the id TOP_ID - j * step
+        start = -(-(TOP_ID - int(query['max_id'][0])) // step) if 'max_id' in query else 0
+        count = max(0, min(count, volume - start))
+
+        page = {'statuses': [make_status(j * step) for j in range(start, start + count)],
+                'search_metadata': {'count': count}}
+        if start + count < volume:
+            page['search_metadata']['next_results'] = '?max_id={0}'.format(TOP_ID - (start + count) * step)
+
+        return json.dumps(page).encode()
+
+
+class FlakyStandInHandler(StandInHandler):
+
+    """
+    Search stand-in with injected faults: every `fault_every`-th request of the server fails in turn with a 503, a
+    connection reset, a response slower than the client's read timeout or a truncated body, and the hashtags in the
+    server's `down` set fail with a 500 after their first page.
+    """
+
+    FAULTS = ('503', 'reset', 'slow', 'truncated')
+
+    def do_GET(self):
+
+        self.server.calls += 1
+        query = parse_qs(urlsplit(self.path).query)
+
+        if query['q'][0] in self.server.down and 'max_id' in query:
+            fault = '500'
+        elif self.server.calls % self.server.fault_every == 0:
+            fault = self.FAULTS[self.server.calls // self.server.fault_every % len(self.FAULTS)]
+        else:
+            return super().do_GET()
+
+        self.server.requests += 1
+        self.server.faults += 1
+
+        try:
+            if fault in ('500', '503'):
+                self.send_response(int(fault))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            elif fault == 'reset':
+                self.close_connection = True
+            elif fault == 'slow':
+                time.sleep(self.server.slow)
+                super().do_GET()
+            else:
+                body = self.paged_body()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body[:len(body) // 2])
+                self.close_connection = True
+        except ConnectionError:
+            # The client gave up on the slow response
+            pass
+
+
+class RateLimitedStandInHandler(StandInHandler):
+
+    """
+    Search stand-in which enforces a rate limit per API key (the request's oauth_token): `limit` calls per `window`
+    seconds, answering 429 beyond it, with the 'x-rate-limit-*' headers of the key's window.
+    """
+
+    def do_GET(self):
+
+        key = re.search(r'oauth_token="([^"]+)"', self.headers.get('Authorization', '')).group(1)
+        window = int(time.time() // self.server.window)
+
+        with self.server.lock:
+            calls = self.server.usage.get((key, window), 0) + 1
+            self.server.usage[(key, window)] = calls
+
+        self.remaining = self.server.limit - calls
+        self.reset = (window + 1) * self.server.window
+
+        if self.remaining >= 0:
+            return super().do_GET()
+
+        self.server.rejected += 1
+        self.send_response(429)
+        for name, value in self.rate_limit_headers().items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def rate_limit_headers(self):
+
+        return {'x-rate-limit-limit': str(self.server.limit), 'x-rate-limit-remaining': str(max(self.remaining, 0)),
+                'x-rate-limit-reset': str(self.reset)}
+
+
+def stand_in_auth(key=0):
+
+    """Returns dummy credentials (of the key-th API key) for signing requests to a stand-in server."""
+
+    from tweepy import OAuthHandler
+
+    auth = OAuthHandler('consumer_key{0}'.format(key), 'consumer_secret')
+    auth.set_access_token('access_token{0}'.format(key), 'access_token_secret')
+
+    return auth
+
+
+def timeit(func, repeat):
+
+    """Returns the average seconds of a single call to func over repeat calls."""
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_page_decode(repeat=200):
+
+    """
+    Per-page decode cost of the raw json fast path against tweepy's model parsing (the Cursor(...).items() path).
+    """
+
+    from tweepy import API
+    from tweepy.models import Status
+
+    raw = make_page()
+    api = API()
+
+    def model_path():
+        tweets = TweetBuffer()
+        for status in [Status.parse(api, status) for status in json.loads(raw)['statuses']]:
+            tweets.append(status._json)
+
+    def raw_path():
+        tweets = TweetBuffer()
+        tweets.extend(search_client.loads(raw)['statuses'])
+
+    model = timeit(model_path, repeat)
+    fast = timeit(raw_path, repeat)
+
+    print("page_decode: cursor/models {:.3f} ms/page, raw json {:.3f} ms/page ({:.1f}x, orjson={})".format(
+        model * 1000, fast * 1000, model / fast, search_client.orjson is not None))
+
+
+def bench_keep_alive(repeat=300):
+
+    """
+    Per-request latency against a local stand-in endpoint: a fresh session per request (as tweepy's API does for every
+    call) against the shared pooled keep-alive SearchClient, with & without gzip.
+    """
+
+    auth = stand_in_auth()
+
+    with StandInServer(make_page()) as server:
+
+        def fresh_session():
+            client = search_client.SearchClient(auth, server.api_root, gzip=False, rate_limits={})
+            client.search('#python')
+            client.close()
+
+        pooled = search_client.SearchClient(auth, server.api_root, gzip=False, rate_limits={})
+        pooled_gzip = search_client.SearchClient(auth, server.api_root, gzip=True, rate_limits={})
+
+        fresh = timeit(fresh_session, repeat)
+        reused = timeit(lambda: pooled.search('#python'), repeat)
+        reused_gzip = timeit(lambda: pooled_gzip.search('#python'), repeat)
+
+    print("keep_alive: fresh session {:.3f} ms/request, pooled {:.3f} ms/request, pooled+gzip {:.3f} ms/request".format(
+        fresh * 1000, reused * 1000, reused_gzip * 1000))
+
+
+def bench_api_calls(num_of_tweets=1000, totals=(40, 250, 1000, 5000)):
+
+    """
+    API calls per collected tweet of the count-aware PagePlan against a fixed default page size (15, as tweepy's
+    Cursor uses for search) which pages until an empty page, over hashtags of different volumes.
+    """
+
+    auth = stand_in_auth()
+
+    for total in totals:
+        with StandInServer(total=total) as server:
+            client = search_client.SearchClient(auth, server.api_root, rate_limits={})
+
+            # Fixed page size - pages until num_of_tweets or an empty page
+            collected, params = 0, {'count': 15}
+            while collected < num_of_tweets:
+                statuses = client.search('#python', **params)['statuses']
+                if not statuses:
+                    break
+                collected += len(statuses)
+                params['max_id'] = min(status['id'] for status in statuses) - 1
+            fixed = server.requests
+
+            server.requests = 0
+            collected = sum(len(page) for page in client.pages('#python', num_of_tweets))
+            planned = server.requests
+
+        print("api_calls: {} available tweets - fixed page size {} calls, page plan {} calls "
+              "({:.3f} calls/tweet)".format(total, fixed, planned, planned / max(collected, 1)))
+
+
+def bench_stream(total=200000):
+
+    """
+    Throughput of the streaming collection (bounded queue, routing into the hashtags' buffers & batched writes to
+    disk) fed by a local fake stream server.
+    """
+
+    import stream_collector
+
+    with StandInServer(handler=StreamStandInHandler, total=total) as server:
+        StandInStream.url = server.api_root
+        stream_collector.Stream = StandInStream
+
+        with tempfile.TemporaryDirectory() as folder:
+            collector = stream_collector.StreamCollector(None, {'#python': '#python', '#data': '#data'}, total,
+                                                         file_name=os.path.join(folder, 'stream.jsonl'))
+            start = time.perf_counter()
+            tweet_matrix = collector.run(duration=600)
+            elapsed = time.perf_counter() - start
+
+    collected = len(tweet_matrix[0])
+    print("stream: {} tweets in {:.2f} s ({:.0f} tweets/s, {} dropped, {} reconnects)".format(
+        collected, elapsed, collected / elapsed, collector.listener.dropped, collector.reconnects))
+
+
+def bench_query_packing(num_of_tweets=100, tags=40, volume=15):
+
+    """
+    API calls of sparse hashtags searched one by one against OR packed queries - the per-hashtag output must be
+    identical.
+    """
+
+    auth = stand_in_auth()
+    tag_list = ['#sparse{0}'.format(k) for k in range(tags)]
+
+    with StandInServer(handler=SparseStandInHandler, total=0) as server:
+        server.volumes = {tag[1:]: volume for tag in tag_list}
+        client = search_client.SearchClient(auth, server.api_root, rate_limits={})
+
+        single = {tag: [status['id'] for page in client.pages(tag, num_of_tweets) for status in page]
+                  for tag in tag_list}
+        single_requests = server.requests
+
+        server.requests = 0
+        packed = dict()
+        for pack in search_client.pack_queries(tag_list):
+            for tag, statuses in client.packed_search(pack, num_of_tweets).items():
+                packed[tag] = [status['id'] for status in statuses]
+        packed_requests = server.requests
+
+    print("query_packing: {} hashtags x {} tweets - one by one {} calls, packed {} calls, identical output: {}".format(
+        tags, volume, single_requests, packed_requests, single == packed))
+
+
+def bench_user_cache(pages=200):
+
+    """
+    Memory of the user's fields of 20,000 decoded tweets by 250 users: copied into per-tweet columns against user id
+    references into the user cache.
+    """
+
+    from user_cache import UserCache
+
+    raw = [make_page(start=100 * k) for k in range(pages)]
+
+    def per_tweet():
+        columns = ([], [], [], [], [])
+        for page in raw:
+            for status in search_client.loads(page)['statuses']:
+                user = status['user']
+                for column, field in zip(columns, ('screen_name', 'followers_count', 'friends_count', 'created_at',
+                                                   'location')):
+                    column.append(user[field])
+        return columns
+
+    def cached():
+        tweets = TweetBuffer(UserCache())
+        for page in raw:
+            tweets.extend(search_client.loads(page)['statuses'])
+        return tweets.user_ids, tweets.users
+
+    sizes = list()
+    for build in (per_tweet, cached):
+        tracemalloc.start()
+        kept = build()
+        sizes.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        del kept
+
+    print("user_cache: {} tweets - per-tweet user fields {:.0f} KB, user cache {:.0f} KB".format(
+        pages * 100, sizes[0] / 1024, sizes[1] / 1024))
+
+
+def bench_prefetch(num_of_tweets=300, tags=20, latency=0.05):
+
+    """
+    Requests & time of Start for a hashtag list: searched from scratch against continuing the pages prefetched while
+    the list was built - the collected tweets must be identical.
+    """
+
+    from prefetch import Prefetcher
+
+    auth = stand_in_auth()
+    tag_list = ['#tag{0}'.format(k) for k in range(tags)]
+
+    def session(client, prefetcher=None):
+        results = dict()
+        for tag in tag_list:
+            tweets, plan = (prefetcher and prefetcher.take(tag, num_of_tweets)) or (TweetBuffer(), None)
+            for page in client.pages(tag, num_of_tweets, plan):
+                tweets.extend(page)
+            results[tag] = tweets.ids
+        return results
+
+    with StandInServer(total=1000) as server:
+        server.latency = latency
+        client = search_client.SearchClient(auth, server.api_root, rate_limits={})
+
+        start = time.perf_counter()
+        scratch = session(client)
+        scratch_time, scratch_requests = time.perf_counter() - start, server.requests
+
+        # The list is built - the prefetch runs meanwhile
+        prefetcher = Prefetcher(client)
+        prefetcher.sync(tag_list)
+        for job in list(prefetcher.jobs.values()):
+            job.future.result()
+
+        server.requests = 0
+        start = time.perf_counter()
+        prefetched = session(client, prefetcher)
+        prefetched_time, prefetched_requests = time.perf_counter() - start, server.requests
+        prefetcher.close()
+
+    print("prefetch: {} hashtags x {} tweets - Start from scratch {} calls in {:.2f} s, after prefetch {} calls in "
+          "{:.2f} s, identical output: {}".format(tags, num_of_tweets, scratch_requests, scratch_time,
+                                                  prefetched_requests, prefetched_time, scratch == prefetched))
+
+
+STARTUP_SCRIPT = """
+import threading, time
+start = time.perf_counter()
+import exporter, headless, tweet_buffer, warmup
+window = headless.ConsoleWindow()
+warm = {warm}
+if warm:
+    box = dict()
+    threading.Thread(target=lambda: box.update(warmup.warm_up(window, verify=False))).start()
+shown = time.perf_counter() - start
+time.sleep(1)
+start = time.perf_counter()
+result = box if warm else warmup.warm_up(window, verify=False)
+result['tweet_analyzer'].word_counter(tweet_buffer.TweetBuffer(), '#python')
+print(shown, time.perf_counter() - start)
+"""
+
+
+def bench_startup():
+
+    """
+    Fresh interpreters: time until the window would be shown (imports & the warm-up thread's start) and the setup
+    of the first session after Start (auth, clients, analyzer & lazy imports) - cold against warmed up in the
+    background.
+    """
+
+    times = dict()
+    for warm in (False, True):
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT.format(warm=warm)], capture_output=True,
+                                text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        times[warm] = [float(value) for value in output.stdout.split()[-2:]]
+
+    print("startup: window shown after {:.0f} ms (cold) / {:.0f} ms (warm-up), first session setup {:.1f} ms (cold) "
+          "/ {:.1f} ms (warm-up)".format(times[False][0] * 1000, times[True][0] * 1000, times[False][1] * 1000,
+                                         times[True][1] * 1000))
+
+
+def bench_faults(num_of_tweets=300, tags=10, fault_every=4):
+
+    """
+    Fault injection: a session against a flaky stand-in (503s, resets, timeouts & truncated bodies on every
+    `fault_every`-th request, and a hashtag which goes down after its first page) must collect exactly the tweets of
+    a clean run for the healthy hashtags, and apply the failure policy to the hashtag which is down.
+    """
+
+    from session import search_session
+
+    auth = stand_in_auth()
+    tag_list = ['#tag{0}'.format(k) for k in range(tags)]
+
+    def session(client, policy):
+        tweet_matrix = search_session(client, dict.fromkeys(tag_list), num_of_tweets, dict(), policy=policy)
+        return dict(zip(tag_list, tweet_matrix))
+
+    with StandInServer(total=1000) as server:
+        clean = session(search_client.SearchClient(auth, server.api_root, rate_limits={}), 'partial')
+
+    outcome = dict()
+    for policy in ('partial', 'skip'):
+        with StandInServer(handler=FlakyStandInHandler, total=1000) as server:
+            server.calls, server.faults, server.fault_every, server.slow = 0, 0, fault_every, 0.5
+            server.down = {tag_list[-1]}
+            client = search_client.SearchClient(auth, server.api_root, rate_limits={}, retries=4,
+                                                timeout=(1, 0.2), retry_backoff=0.01)
+
+            start = time.perf_counter()
+            flaky = session(client, policy)
+            elapsed = time.perf_counter() - start
+
+        healthy = all(flaky[tag].ids == clean[tag].ids and flaky[tag].failure is None for tag in tag_list[:-1])
+        down = flaky[tag_list[-1]]
+        outcome[policy] = (healthy, len(down), down.failure is not None, server.faults, elapsed)
+
+    for policy, (healthy, kept, failed, faults, elapsed) in outcome.items():
+        print("faults ({}): {} injected faults in {:.2f} s - healthy hashtags identical to a clean run: {}, hashtag "
+              "down after its first page: failed={} with {} tweets kept".format(policy, faults, elapsed, healthy,
+                                                                                failed, kept))
+
+
+def bench_credential_pool(num_of_tweets=300, tags=12, limit=10, window=1.0, keys=(1, 2, 4)):
+
+    """
+    Rate limited throughput of a session against a stand-in which allows `limit` calls per `window` seconds to each
+    API key: a single key against credential pools of several keys - the output must be identical.
+    """
+
+    from credential_pool import CredentialPool
+
+    tag_list = ['#tag{0}'.format(k) for k in range(tags)]
+    rate_limits = {search_client.SEARCH_PATH: limit}
+    results = dict()
+
+    for count in keys:
+        with StandInServer(handler=RateLimitedStandInHandler, total=1000) as server:
+            server.limit, server.window, server.usage, server.rejected = limit, window, dict(), 0
+            server.lock = threading.Lock()
+
+            # Start at the beginning of a window, like a fresh 15 minutes window
+            time.sleep(window - time.time() % window)
+
+            auths = [stand_in_auth(key) for key in range(count)]
+            client = CredentialPool(auths, server.api_root, rate_limits=rate_limits, rate_window=window)
+
+            start = time.perf_counter()
+            ids = {tag: [status['id'] for page in client.pages(tag, num_of_tweets) for status in page]
+                   for tag in tag_list}
+            elapsed = time.perf_counter() - start
+
+        results[count] = (ids, server.requests, elapsed, server.rejected)
+
+    single = results[keys[0]][0]
+    for count, (ids, requests, elapsed, rejected) in results.items():
+        print("credential_pool: {} key(s) - {} pages in {:.2f} s ({:.1f} pages/s, {} rejected), identical output: "
+              "{}".format(count, requests, elapsed, requests / elapsed, rejected, ids == single))
+
+
+def bench_backfill(num_of_tweets=10000, total=20000, latency=0.05, workers=(1, 2, 4, 8)):
+
+    """
+    Time to pull out num_of_tweets of a single hashtag: a serial search against backfills over concurrent id ranges
+    with more & more workers - the output must be identical to the serial search (the newest tweets, no duplicates).
+    """
+
+    from backfill import Backfill
+
+    auth = stand_in_auth()
+    results = dict()
+
+    with StandInServer(total=total) as server:
+        server.latency = latency
+        client = search_client.SearchClient(auth, server.api_root, pool_size=max(workers), rate_limits={})
+
+        start = time.perf_counter()
+        serial = TweetBuffer()
+        for page in client.pages('#python', num_of_tweets):
+            serial.extend(page)
+        results['serial'] = (serial.ids, server.requests, time.perf_counter() - start)
+
+        for count in workers:
+            server.requests = 0
+            start = time.perf_counter()
+            tweets = TweetBuffer()
+            Backfill(client, '#python', num_of_tweets, workers=count, since_id=TOP_ID - total).run(tweets)
+            results[count] = (tweets.ids, server.requests, time.perf_counter() - start)
+
+    for name, (ids, requests, elapsed) in results.items():
+        print("backfill: {} - {} tweets, {} requests in {:.2f} s, identical output: {}, duplicates: {}".format(
+            name if name == 'serial' else '{} workers'.format(name), len(ids), requests, elapsed,
+            ids == results['serial'][0], len(ids) - len(set(ids))))
+
+
+def bench_budget(num_of_tweets=500, requests=30):
+
+    """
+    Tweets collected from hashtags of very different volumes (from dead to viral) for the same budget: num_of_tweets
+    for each hashtag against the same total spread by the BudgetPlanner (a tweets budget), and a fixed number of
+    search requests spent hashtag by hashtag against spread by volume (a requests budget).
+    """
+
+    from budget import BudgetPlanner
+
+    auth = stand_in_auth()
+    volumes = {'#dead': 0, '#quiet': 40, '#slow': 150, '#medium': 1500, '#busy': 6000, '#viral': 20000}
+
+    def fixed(client, count):
+        return {tag: sum(len(page) for page in client.pages(tag, count)) for tag in volumes}
+
+    def planned(client, total, unit):
+        return {tag: len(tweets) for tag, tweets in BudgetPlanner(client, volumes, total, unit).run().items()}
+
+    outcome = dict()
+    with StandInServer(handler=VolumeStandInHandler, total=0) as server:
+        server.volumes, server.span = volumes, 200000
+        client = search_client.SearchClient(auth, server.api_root, rate_limits={})
+
+        # A requests budget spent hashtag by hashtag is the same number of full pages for each one
+        for name, func, args in (
+                ('tweets: fixed per hashtag', fixed, (num_of_tweets,)),
+                ('tweets: budget planner', planned, (num_of_tweets * len(volumes), 'tweets')),
+                ('requests: fixed per hashtag', fixed, (requests // len(volumes) * search_client.MAX_COUNT,)),
+                ('requests: budget planner', planned, (requests, 'requests'))):
+            server.requests = 0
+            outcome[name] = (func(client, *args), server.requests)
+
+    for name, (counts, calls) in outcome.items():
+        print("budget ({}): {} tweets in {} requests - {}".format(
+            name, sum(counts.values()), calls, ', '.join('{} {}'.format(tag, count) for tag, count in counts.items())))
+
+
+def bench_sketches(words=1000000, vocabulary=200000, top=10, seed=7):
+
+    """
+    Accuracy, memory & time of the bounded memory word counters against the exact Counter, over a Zipf distributed
+    stream of words (like the words of a million tweets tag): the top words must match the exact ones and each
+    count's error must be within the sketch's bound.
+    """
+
+    import collections
+    import numpy as np
+    from sketches import (CountMinSketch, SpaceSaving)
+
+    ranks = np.random.default_rng(seed).zipf(1.1, words * 2)
+    stream = ['w{0}'.format(rank) for rank in ranks[ranks <= vocabulary][:words]]
+
+    exact_counts = None
+    for name, counter in (('exact', collections.Counter()), ('space_saving', SpaceSaving()),
+                          ('count_min', CountMinSketch())):
+        tracemalloc.start()
+        start = time.perf_counter()
+        counter.update(iter(stream))
+        elapsed = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        if exact_counts is None:
+            exact_counts = counter
+            print("sketches: exact - {} words, {} distinct, {:.2f} s, {:.0f} KB".format(
+                len(stream), len(counter), elapsed, memory / 1024))
+            continue
+
+        common = counter.most_common(top)
+        exact_top = [word for word, count in exact_counts.most_common(top)]
+        error = max(count - exact_counts[word] for word, count in common)
+        print("sketches: {} - top {} identical: {}, max count error {} (bound {:.0f}, never under: {}), {:.2f} s, "
+              "{:.0f} KB".format(name, top, [word for word, count in common] == exact_top, error,
+                                 counter.error_bound(), all(count >= exact_counts[word] for word, count in common),
+                                 elapsed, memory / 1024))
+
+
+def bench_hll(cardinalities=(1000, 10000, 100000, 1000000), trials=5, seed=3):
+
+    """
+    Distinct counts of HyperLogLog sketches against exact sets: relative error at growing cardinalities (each value
+    added twice), memory of the sketch against the set, and the merge of two overlapping sketches.
+    """
+
+    import numpy as np
+    from sketches import HyperLogLog
+
+    rng = np.random.default_rng(seed)
+
+    for cardinality in cardinalities:
+        errors = list()
+        for trial in range(trials):
+            values = rng.integers(0, 2 ** 62, cardinality)
+            sketch = HyperLogLog()
+            sketch.add(values)
+            sketch.add(values)
+            errors.append(abs(sketch.count() / len(set(values.tolist())) - 1))
+
+        tracemalloc.start()
+        exact = set(values.tolist())
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print("hll: {} distinct - mean error {:.2%}, max error {:.2%} ({} trials), sketch {} KB, set {:.0f} KB".format(
+            cardinality, sum(errors) / trials, max(errors), trials, sketch.registers.nbytes // 1024,
+            memory / 1024))
+        del exact
+
+    first, second = HyperLogLog(), HyperLogLog()
+    first.add(np.arange(0, 600000))
+    second.add(np.arange(400000, 1000000))
+    first.merge(HyperLogLog.from_bytes(second.to_bytes()))
+    print("hll: merge of 600000 & 600000 overlapping by 200000 - {} (exact 1000000)".format(first.count()))
+
+
+def bench_phrases(tweets=100000, words=12, vocabulary=20000, seed=5):
+
+    """
+    Time & memory of the phrase counter (integer encoded bigrams & trigrams counted with numpy) against the unigram
+    word counter and a Counter of string tuples, on a hashtag of Zipf distributed tweets - the top phrases must match
+    the string tuples Counter.
+    """
+
+    import collections
+    import numpy as np
+    from headless import ConsoleWindow
+    from tweet_analyzer import TweetAnalyzer
+
+    ranks = np.random.default_rng(seed).zipf(1.2, tweets * words * 2)
+    ranks = ranks[ranks <= vocabulary][:tweets * words].reshape(tweets, words)
+    buffer = TweetBuffer()
+    buffer.texts = [' '.join('w{0}'.format(rank) for rank in row) for row in ranks.tolist()]
+    buffer.ids = list(range(tweets))
+
+    analyzer = TweetAnalyzer(ConsoleWindow())
+    analyzer.warm_up()
+
+    def string_tuples():
+        counter = collections.Counter()
+        for text in buffer.texts:
+            tokens = analyzer.remove_url(text).lower().split()
+            for n in (2, 3):
+                counter.update(zip(*(tokens[k:] for k in range(n))))
+        return counter
+
+    results = dict()
+    for name, func in (('word_counter (unigrams)', lambda: analyzer.word_counter(buffer, '#python')),
+                       ('phrase_counter (bigrams & trigrams)', lambda: analyzer.phrase_counter(buffer, '#python')),
+                       ('Counter of string tuples', string_tuples)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        results[name] = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("phrases: {} - {:.2f} s, peak {:.0f} MB".format(name, elapsed, peak / 2 ** 20))
+
+    phrases = results['phrase_counter (bigrams & trigrams)']
+    exact = [(' '.join(phrase), count)
+             for phrase, count in results['Counter of string tuples'].most_common(len(phrases))]
+    print("phrases: top {} identical to the string tuples Counter: {}".format(
+        len(phrases), list(zip(phrases['Phrases'], phrases['Count'])) == exact))
+
+
+def bench_cooccurrence(tweets=2000000, tags=5000, per_tweet=3, seed=11):
+
+    """
+    Time of the session's hashtag co-occurrence matrix (sparse incidence product) against nested dict loops over the
+    pairs of each tweet's hashtags, for millions of tweets - the counts must be identical.
+    """
+
+    import collections
+    import numpy as np
+    from scipy import sparse
+    from cooccurrence import Cooccurrence
+
+    ranks = np.random.default_rng(seed).zipf(1.3, tweets * per_tweet * 2)
+    ranks = ranks[ranks <= tags][:tweets * per_tweet].reshape(tweets, per_tweet)
+    buffer = TweetBuffer()
+    buffer.ids = list(range(tweets))
+    buffer.hashtags = [tuple('tag{0}'.format(rank) for rank in set(row)) for row in ranks.tolist()]
+
+    start = time.perf_counter()
+    cooccurrence = Cooccurrence()
+    cooccurrence.add(buffer)
+    matrix = cooccurrence.build()
+    sparse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = collections.defaultdict(collections.Counter)
+    for hashtags in buffer.hashtags:
+        for first in hashtags:
+            for second in hashtags:
+                if first != second:
+                    pairs[first][second] += 1
+    loops_time = time.perf_counter() - start
+
+    top = max(pairs, key=lambda tag: sum(pairs[tag].values()))
+    identical = all(dict(pairs[tag]) == {other[1:]: count for other, count, share in
+                                         cooccurrence.strongest_pairs(tag, len(cooccurrence.vocabulary))}
+                    for tag in (top, 'tag2', 'tag50'))
+    print("cooccurrence: {} tweets, {} hashtags, {} pairs - sparse {:.2f} s, nested dict loops {:.2f} s, identical "
+          "counts: {}".format(tweets, len(cooccurrence.vocabulary) - 1, sparse.triu(matrix, k=1).nnz,
+                              sparse_time, loops_time, identical))
+
+
+def bench_distinctive(tags=5, tweets=20000, words=12, seed=13):
+
+    """
+    The session's text analyses (phrases & distinctive words of every hashtag) tokenizing each hashtag once against
+    once per analysis, and whether the words shared by all the hashtags stay out of each hashtag's top words.
+    """
+
+    import random
+    from headless import ConsoleWindow
+    from tweet_analyzer import TweetAnalyzer
+
+    random.seed(seed)
+    common = ['new', 'today', 'great', 'love', 'check', 'thanks', 'week', 'people']
+    tag_list = ['#tag{0}'.format(k) for k in range(tags)]
+    own = {tag: ['{0}word{1}'.format(tag[1:], j) for j in range(5)] for tag in tag_list}
+
+    tweet_matrix = list()
+    for tag in tag_list:
+        buffer = TweetBuffer()
+        buffer.texts = [' '.join(random.choice(common * 3 + own[tag]) for _ in range(words)) for _ in range(tweets)]
+        buffer.ids = list(range(tweets))
+        tweet_matrix.append(buffer)
+
+    analyzer = TweetAnalyzer(ConsoleWindow())
+    analyzer.warm_up()
+
+    start = time.perf_counter()
+    for tag, buffer in zip(tag_list, tweet_matrix):
+        analyzer.phrase_counter(buffer, tag)
+    analyzer.distinctive_terms([analyzer.encode(buffer) for buffer in tweet_matrix], tag_list)
+    twice = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encoded = [analyzer.encode(buffer) for buffer in tweet_matrix]
+    for tag, buffer, tokens in zip(tag_list, tweet_matrix, encoded):
+        analyzer.phrase_counter(buffer, tag, tokens)
+    distinctive_df = analyzer.distinctive_terms(encoded, tag_list)
+    once = time.perf_counter() - start
+
+    words_df = analyzer.word_counter(tweet_matrix[0], tag_list[0])
+    print("distinctive: {} hashtags x {} tweets - tokenized per analysis {:.2f} s, tokenized once {:.2f} s".format(
+        tags, tweets, twice, once))
+    top = distinctive_df.groupby('Hashtag').head(len(words_df))
+    print("distinctive: shared words among a hashtag's top {} popular words {}, among each hashtag's top {} "
+          "distinctive words {}".format(len(words_df), sum(word in common for word in words_df['Words']),
+                                        len(words_df), sum(word in common for word in top['Word'])))
+
+
+def bench_sentiment(tweets=200000, words=12, vocabulary=20000, seed=17):
+
+    """
+    Sentiment scoring throughput - the tweets's token ids scored at once with numpy against a loop per word over the
+    same lexicon & negations, with the tokenizing (shared with the phrases & distinctive words) timed apart.
+    """
+
+    import random
+    import numpy as np
+    from headless import ConsoleWindow
+    from sentiment import (NEGATION_SCALAR, NEGATION_WINDOW, NEGATIONS, NORMALIZATION_ALPHA)
+    from tweet_analyzer import TweetAnalyzer
+
+    random.seed(seed)
+    analyzer = TweetAnalyzer(ConsoleWindow())
+    lexicon = analyzer.sentiment_scorer.lexicon
+    pool = list(lexicon) + sorted(NEGATIONS) + ['word{0}'.format(k) for k in range(vocabulary)]
+
+    buffer = TweetBuffer()
+    buffer.texts = [' '.join(random.choice(pool) for _ in range(words)) for _ in range(tweets)]
+    buffer.ids = list(range(tweets))
+
+    start = time.perf_counter()
+    encoded = analyzer.encode(buffer)
+    encoding = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = analyzer.sentiment(buffer, encoded)
+    vectorized = time.perf_counter() - start
+
+    token_lists = [analyzer.remove_url(text).lower().split() for text in buffer.texts]
+    start = time.perf_counter()
+    looped = list()
+    for tokens in token_lists:
+        total = 0.0
+        for i, token in enumerate(tokens):
+            valence = lexicon.get(token, 0.0)
+            if any(previous in NEGATIONS for previous in tokens[max(0, i - NEGATION_WINDOW):i]):
+                valence *= NEGATION_SCALAR
+            total += valence
+        looped.append(total / (total * total + NORMALIZATION_ALPHA) ** 0.5)
+    loop = time.perf_counter() - start
+
+    print("sentiment: {} tweets - tokenizing {:.2f} s, numpy scoring {:.3f} s ({:,.0f} tweets/s), loop per word "
+          "{:.2f} s ({:,.0f} tweets/s), max difference {:.2g}".format(
+              tweets, encoding, vectorized, tweets / vectorized, loop, tweets / loop,
+              float(np.abs(scores - np.array(looped)).max())))
+
+
+def bench_activity(tags=20, tweets=50000, days=7, seed=19):
+
+    """
+    The session's activity (tweets, likes & retweets per hour & the hour of week heatmap) as a single groupby of the
+    combined table against a data frame & resample per hashtag.
+    """
+
+    import numpy as np
+    import pandas as pd
+    import activity
+    from tweet_buffer import TWITTER_DATE_FORMAT, session_frame
+
+    rng = np.random.default_rng(seed)
+    tag_list = ['#tag{0}'.format(k) for k in range(tags)]
+    start_date = pd.Timestamp('2018-10-10')
+
+    tweet_matrix = list()
+    for _ in tag_list:
+        buffer = TweetBuffer()
+        moments = start_date + pd.to_timedelta(np.sort(rng.integers(0, days * 86400, tweets)), unit='s')
+        buffer.dates = moments.strftime(TWITTER_DATE_FORMAT).tolist()
+        buffer.ids = rng.integers(1, 1 << 62, tweets).tolist()
+        buffer.user_ids = rng.integers(1, 1 << 40, tweets).tolist()
+        buffer.likes = rng.integers(0, 100, tweets).tolist()
+        buffer.retweets = rng.integers(0, 50, tweets).tolist()
+        tweet_matrix.append(buffer)
+
+    begin = time.perf_counter()
+    per_tag = list()
+    for buffer in tweet_matrix:
+        df = pd.DataFrame({'date': pd.to_datetime(buffer.dates, format=TWITTER_DATE_FORMAT), 'likes': buffer.likes,
+                           'retweets': buffer.retweets})
+        series = df.set_index('date').resample('h').agg({'likes': 'sum', 'retweets': 'sum'})
+        series['tweets'] = df.set_index('date').resample('h').size()
+        df.groupby([df['date'].dt.dayofweek, df['date'].dt.hour]).size().unstack(fill_value=0)
+        per_tag.append(series)
+    separate = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    frame = session_frame(tweet_matrix, tag_list)
+    series = activity.time_series(frame)
+    activity.hour_of_week(frame)
+    combined = time.perf_counter() - begin
+
+    print("activity: {} hashtags x {} tweets - a data frame per hashtag {:.2f} s, combined table {:.2f} s, "
+          "same tweets per hashtag {}".format(tags, tweets, separate, combined,
+                                              series.groupby('Hashtag')['Tweets'].sum().tolist()
+                                              == [int(s['tweets'].sum()) for s in per_tag]))
+
+
+def bench_influencers(tags=20, tweets=100000, users=200000, n=10, seed=23):
+
+    """
+    Influencer ranking of a multi-million tweets session - a single groupby of the combined table by hashtag & user
+    code with nlargest, against a groupby by screen name & a full sort of each hashtag's data frame.
+    """
+
+    import numpy as np
+    import pandas as pd
+    import influence
+    import settings
+    from tweet_buffer import session_frame
+    from user_cache import (UserCache, UserProfile)
+
+    rng = np.random.default_rng(seed)
+    cache = UserCache()
+    followers = rng.zipf(1.5, users).clip(max=10 ** 7)
+    for user_id in range(users):
+        cache.put(user_id, UserProfile('user{0}'.format(user_id), int(followers[user_id]), 0, None, '', 0))
+
+    tag_list = ['#tag{0}'.format(k) for k in range(tags)]
+    tweet_matrix = list()
+    for k in range(tags):
+        buffer = TweetBuffer(cache)
+        buffer.ids = (np.arange(tweets) + k * tweets).tolist()
+        buffer.user_ids = (rng.zipf(1.3, tweets) % users).tolist()
+        buffer.dates = ['Wed Oct 10 20:19:24 +0000 2018'] * tweets
+        buffer.likes = rng.zipf(2.0, tweets).clip(max=10 ** 6).tolist()
+        buffer.retweets = rng.zipf(2.5, tweets).clip(max=10 ** 6).tolist()
+        tweet_matrix.append(buffer)
+
+    frame = session_frame(tweet_matrix, tag_list)
+
+    start = time.perf_counter()
+    separate = list()
+    for tag, buffer in zip(tag_list, tweet_matrix):
+        df = pd.DataFrame({'User': [cache.get(user_id).screen_name for user_id in buffer.user_ids],
+                           'Followers': [cache.get(user_id).followers for user_id in buffer.user_ids],
+                           'Likes': buffer.likes, 'Retweets': buffer.retweets})
+        grouped = df.groupby('User').agg(tweets=('Likes', 'size'), likes=('Likes', 'sum'),
+                                         retweets=('Retweets', 'sum'), followers=('Followers', 'first'))
+        grouped['score'] = (settings.INFLUENCE_REACH_WEIGHT * np.log10(1 + grouped['followers'] * grouped['tweets'])
+                            + settings.INFLUENCE_ENGAGEMENT_WEIGHT * np.log10(
+                                1 + grouped['likes'] + settings.INFLUENCE_RETWEET_WEIGHT * grouped['retweets']))
+        separate.append(grouped.sort_values('score', ascending=False).head(n).index.tolist())
+    per_tag = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top = influence.top_influencers(frame, n, cache)
+    combined = time.perf_counter() - start
+
+    same = [top.loc[top['Hashtag'] == tag, 'User'].tolist() for tag in tag_list] == separate
+    print("influencers: {} hashtags x {} tweets - a data frame & sort per hashtag {:.2f} s, combined table & nlargest "
+          "{:.2f} s, same top users {}".format(tags, tweets, per_tag, combined, same))
+
+
+BENCHMARKS = {
+    'page_decode': bench_page_decode,
+    'keep_alive': bench_keep_alive,
+    'api_calls': bench_api_calls,
+    'stream': bench_stream,
+    'query_packing': bench_query_packing,
+    'user_cache': bench_user_cache,
+    'prefetch': bench_prefetch,
+    'startup': bench_startup,
+    'faults': bench_faults,
+    'credential_pool': bench_credential_pool,
+    'backfill': bench_backfill,
+    'budget': bench_budget,
+    'sketches': bench_sketches,
+    'hll': bench_hll,
+    'phrases': bench_phrases,
+    'cooccurrence': bench_cooccurrence,
+    'distinctive': bench_distinctive,
+    'sentiment': bench_sentiment,
+    'activity': bench_activity,
+    'influencers': bench_influencers,
+}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
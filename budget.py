@@ -0,0 +1,188 @@
+import math
+
+from search_client import (MAX_COUNT, SEARCH_PARAMS, PagePlan, fail_tags)
+from tweet_buffer import TweetBuffer
+import settings
+
+
+def apportion(total, weights):
+
+    """
+    Splits an integer total proportionally to the weights (largest remainder method).
+
+    Args:
+        total (int): The amount to split.
+        weights (list): Non negative weights - all equal when they sum to 0.
+
+    Returns:
+        shares (list): Integer shares of the weights, summing to total.
+    """
+
+    weight = sum(weights)
+    if weight <= 0:
+        weights, weight = [1] * len(weights), len(weights)
+
+    quotas = [total * w / weight for w in weights]
+    shares = [int(quota) for quota in quotas]
+
+    # The leftover units go to the largest fractions
+    for i in sorted(range(len(quotas)), key=lambda i: shares[i] - quotas[i])[:total - sum(shares)]:
+        shares[i] += 1
+
+    return shares
+
+
+class TagBudget:
+
+    """
+    The search of a single hashtag under a BudgetPlanner.
+
+    Attributes:
+        hashtag (str): The searched hashtag.
+        tweets (TweetBuffer): The hashtag's tweets.
+        plan (PagePlan): The search's pagination plan.
+        top (int): Id of the hashtag's newest tweet (None before the first page).
+        spent (int): The budget spent on the hashtag (tweets or requests).
+    """
+
+    def __init__(self, hashtag):
+
+        """Initializing TagBudget Class"""
+        self.hashtag = hashtag
+        self.tweets = TweetBuffer()
+        self.plan = PagePlan(0)
+        self.top = None
+        self.spent = 0
+
+    @property
+    def active(self):
+
+        """True while the hashtag has more results & its search didn't fail."""
+
+        return not self.plan.exhausted and self.tweets.failure is None
+
+    @property
+    def density(self):
+
+        """The hashtag's volume - tweets per id of the searched id range (tweet ids are time ordered)."""
+
+        if self.top is None or self.plan.max_id is None:
+            return 0
+
+        return len(self.tweets) / max(1, self.top - self.plan.max_id)
+
+
+class BudgetPlanner:
+
+    """
+    Spreads a session's total budget of tweets or search requests over its hashtags by their observed volume.
+
+    Every hashtag first gets a floor (one page by default), which measures its volume. The rest of the budget is
+    handed out in rounds: each round splits what's left over the active hashtags proportionally to their volume, and
+    each hashtag pages on until its share is spent or its results are over. A hashtag whose results are over (or
+    whose search failed) leaves the next rounds, so its leftover budget goes to the hashtags which still have tweets.
+
+    Attributes:
+        search_client (SearchClient): The client which performs the searches.
+        total (int): The session's budget.
+        unit (str): 'tweets' or 'requests' - what the budget counts.
+        floor (int): The budget each hashtag gets before the proportional rounds.
+        tags (dict): Hashtag -> its TagBudget.
+        spent (int): The budget spent so far.
+
+    Methods:
+        __init__(self, search_client, tag_list, total, unit='tweets', floor=settings.BUDGET_FLOOR): Class's
+                                                                                                    constructor.
+        remaining(self): The budget which is left.
+        run(self, progress=None): Searches the hashtags within the budget.
+    """
+
+    def __init__(self, search_client, tag_list, total, unit='tweets', floor=settings.BUDGET_FLOOR):
+
+        """Initializing BudgetPlanner Class"""
+        self.search_client = search_client
+        self.total = total
+        self.unit = unit
+        self.tags = {hashtag: TagBudget(hashtag) for hashtag in tag_list}
+        self.spent = 0
+
+        # The floor is given in tweets - in pages for a requests budget, and never more than an even split
+        floor = floor if unit == 'tweets' else math.ceil(floor / MAX_COUNT)
+        self.floor = min(floor, total // max(1, len(self.tags)))
+
+    def remaining(self):
+
+        """The budget which is left."""
+
+        return self.total - self.spent
+
+    def __page(self, tag, share):
+
+        # Fetch a single page of up to `share` tweets (a full page for a requests budget)
+        count = min(MAX_COUNT, share) if self.unit == 'tweets' else MAX_COUNT
+        tag.plan.retarget(len(tag.tweets) + count, len(tag.tweets))
+
+        try:
+            statuses = tag.plan.feed(self.search_client.search(tag.hashtag, **SEARCH_PARAMS, **tag.plan.params()))
+            if not statuses:
+                # A page without a new tweet (e.g. only duplicates) costs no tweets - searching on would never end
+                tag.plan.exhausted = True
+            elif tag.top is None:
+                tag.top = max(status['id'] for status in statuses)
+            tag.tweets.extend(statuses)
+        except Exception as error:
+            # Only this hashtag fails - its budget goes to the other hashtags
+            results = {tag.hashtag: tag.tweets}
+            fail_tags(results, [tag.hashtag], error)
+            tag.tweets = results[tag.hashtag]
+            return 0
+
+        cost = len(statuses) if self.unit == 'tweets' else 1
+        tag.spent += cost
+        self.spent += cost
+
+        return cost
+
+    def __spend(self, tag, share, progress):
+
+        # Page a hashtag until its share is spent or its results are over
+        while share > 0 and tag.active:
+            share -= self.__page(tag, share)
+
+            if progress is not None:
+                progress(self.spent / self.total)
+
+    def run(self, progress=None):
+
+        """
+        Searches the hashtags within the budget.
+
+        Args:
+            progress (function): Called after each page with the spent fraction of the budget.
+
+        Parameters:
+            active (list): The hashtags which still have tweets.
+            shares (list): Each active hashtag's share of the budget's rest in this round.
+
+        Returns:
+            results (dict): Hashtag -> TweetBuffer of its tweets.
+        """
+
+        for tag in self.tags.values():
+            self.__spend(tag, self.floor, progress)
+
+        while self.remaining() > 0:
+            active = [tag for tag in self.tags.values() if tag.active]
+            if not active:
+                break
+
+            shares = apportion(self.remaining(), [tag.density for tag in active])
+            for tag, share in zip(active, shares):
+                self.__spend(tag, min(share, self.remaining()), progress)
+
+        for tag in self.tags.values():
+            print("{}: {} tweets for {} {} of the budget ({} requests)".format(
+                tag.hashtag, len(tag.tweets), tag.spent, self.unit, tag.plan.requests))
+        print("Budget: {} of {} {} spent".format(self.spent, self.total, self.unit))
+
+        return {hashtag: tag.tweets for hashtag, tag in self.tags.items()}
@@ -0,0 +1,156 @@
+import itertools
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+from scipy import sparse
+
+from vocabulary import (UNKNOWN, Vocabulary)
+
+
+class Cooccurrence:
+
+    """
+    Hashtag co-occurrence of a whole session, from the hashtags in the tweets's entities.
+
+    Each TweetBuffer adds its tweets's hashtags as integer ids. The tweets x hashtags incidence matrix is built at once
+    as a sparse COO matrix (a tweet found by several searched hashtags is counted once) and converted to CSR, and the
+    hashtag x hashtag co-occurrence matrix is its product with itself - its diagonal is each hashtag's number of tweets.
+
+    Attributes:
+        vocabulary (Vocabulary): Hashtag (lowercase, without '#') -> its id.
+        matrix (csr_matrix): The hashtag x hashtag co-occurrence counts (None until built).
+
+    Methods:
+        __init__(self): Class's constructor.
+        add(self, tweets): Adds the hashtags of a TweetBuffer's tweets.
+        build(self): Builds the co-occurrence matrix.
+        strongest_pairs(self, hashtag, n): The hashtags which occur most with a hashtag.
+        write_graphml(self, file_name, min_weight): Writes the co-occurrence graph as a GraphML file.
+    """
+
+    def __init__(self):
+
+        """Initializing Cooccurrence Class"""
+        self.vocabulary = Vocabulary()
+        self.matrix = None
+        self.__tweet_ids = list()
+        self.__tag_ids = list()
+
+    def add(self, tweets):
+
+        """
+        Adds the hashtags of a TweetBuffer's tweets.
+
+        Args:
+            tweets (TweetBuffer): Columnar buffer of a hashtag's tweets.
+
+        Returns:
+            None
+        """
+
+        lengths = np.fromiter((len(hashtags) for hashtags in tweets.hashtags), dtype=np.int64, count=len(tweets))
+        self.__tag_ids.append(np.array(self.vocabulary.encode(itertools.chain.from_iterable(tweets.hashtags)),
+                                       dtype=np.int64))
+        self.__tweet_ids.append(np.repeat(np.array(tweets.ids, dtype=np.int64), lengths))
+        self.matrix = None
+
+    def build(self):
+
+        """
+        Builds the co-occurrence matrix.
+
+        Parameters:
+            rows (ndarray): The (distinct) tweet of each hashtag occurrence.
+            incidence (csr_matrix): Tweets x hashtags, 1 where the tweet has the hashtag.
+
+        Returns:
+            matrix (csr_matrix): The hashtag x hashtag co-occurrence counts.
+        """
+
+        tweet_ids = np.concatenate(self.__tweet_ids) if self.__tweet_ids else np.zeros(0, dtype=np.int64)
+        tag_ids = np.concatenate(self.__tag_ids) if self.__tag_ids else np.zeros(0, dtype=np.int64)
+
+        known = tag_ids != UNKNOWN
+        unique, rows = np.unique(tweet_ids[known], return_inverse=True)
+
+        incidence = sparse.coo_matrix((np.ones(len(rows), dtype=np.int32), (rows, tag_ids[known])),
+                                      shape=(len(unique), len(self.vocabulary))).tocsr()
+
+        # The same tweet of several searched hashtags (or a repeated hashtag) counts once
+        incidence.data[:] = 1
+
+        self.matrix = (incidence.T @ incidence).tocsr()
+
+        return self.matrix
+
+    def strongest_pairs(self, hashtag, n):
+
+        """
+        The hashtags which occur most with a hashtag.
+
+        Args:
+            hashtag (str): The hashtag (with or without '#').
+            n (int): Number of pairs.
+
+        Returns:
+            pairs (list): (hashtag, tweets together, share of the hashtag's tweets) tuples, strongest first.
+        """
+
+        if self.matrix is None:
+            self.build()
+
+        tag_id = self.vocabulary.ids.get(hashtag.lstrip('#').lower())
+        if tag_id is None:
+            return list()
+
+        row = self.matrix.getrow(tag_id)
+        total = self.matrix[tag_id, tag_id]
+        others = row.indices != tag_id
+        columns, counts = row.indices[others], row.data[others]
+
+        top = np.argsort(-counts, kind='stable')[:n]
+
+        return [('#' + self.vocabulary.words[column], int(count), count / total)
+                for column, count in zip(columns[top].tolist(), counts[top].tolist())]
+
+    def write_graphml(self, file_name, min_weight=1):
+
+        """
+        Writes the co-occurrence graph as a GraphML file (e.g. for Gephi) - a node per hashtag with its tweets, and an
+        edge per pair which occurs in at least min_weight tweets.
+
+        Args:
+            file_name (str): The GraphML file's name.
+            min_weight (int): Minimal tweets of an edge.
+
+        Returns:
+            None
+        """
+
+        if self.matrix is None:
+            self.build()
+
+        edges = sparse.triu(self.matrix, k=1).tocoo()
+        strong = edges.data >= min_weight
+        sources, targets, weights = edges.row[strong], edges.col[strong], edges.data[strong]
+
+        nodes = np.unique(np.concatenate((sources, targets)))
+        tweets = self.matrix.diagonal()
+
+        with open(file_name, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                    '<key id="tweets" for="node" attr.name="tweets" attr.type="int"/>\n'
+                    '<key id="weight" for="edge" attr.name="weight" attr.type="int"/>\n'
+                    '<graph id="hashtags" edgedefault="undirected">\n')
+
+            for node in nodes.tolist():
+                f.write('<node id={}><data key="tweets">{}</data></node>\n'.format(
+                    quoteattr('#' + self.vocabulary.words[node]), tweets[node]))
+
+            for source, target, weight in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+                f.write('<edge source={} target={}><data key="weight">{}</data></edge>\n'.format(
+                    quoteattr('#' + self.vocabulary.words[source]), quoteattr('#' + self.vocabulary.words[target]),
+                    weight))
+
+            f.write('</graph>\n</graphml>\n')
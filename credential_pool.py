@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+
+from tweepy import OAuthHandler
+
+from rate_limit import (WINDOW, RateLimiter)
+from search_client import (API_ROOT, SearchClient)
+import settings
+
+
+def load_credentials(file_name=settings.CREDENTIALS_FILE):
+
+    """
+    Loads the key sets of a credentials file - a json list of objects with the same names as twitter_credentials
+    (CONSUMER_KEY, CONSUMER_SECRET, ACCESS_TOKEN & ACCESS_TOKEN_SECRET).
+
+    Args:
+        file_name (str): The credentials file.
+
+    Returns:
+        auths (list): OAuthHandler of each key set (empty when the file doesn't exist).
+    """
+
+    if not os.path.exists(file_name):
+        return list()
+
+    with open(file_name, 'r') as f:
+        key_sets = json.load(f)
+
+    auths = list()
+    for keys in key_sets:
+        auth = OAuthHandler(keys['CONSUMER_KEY'], keys['CONSUMER_SECRET'])
+        auth.set_access_token(keys['ACCESS_TOKEN'], keys['ACCESS_TOKEN_SECRET'])
+        auths.append(auth)
+
+    return auths
+
+
+class CredentialPool(SearchClient):
+
+    """
+    SearchClient which spreads its requests over several API keys.
+
+    Every key has its own RateLimiter for each endpoint. Each request (page) is signed by the key with the most
+    budget left in its window, and waits only when all the keys ran out - so the rate limited throughput grows with
+    the number of keys. A key which gets a 429 response is emptied and the request moves to another key. The keys
+    share the client's keep-alive connection pool.
+
+    Attributes:
+        keys (list): (signer, limits) of each key - limits maps an endpoint's path to the key's RateLimiter.
+
+    Methods:
+        __init__(self, auths, api_root=API_ROOT, rate_limits=settings.RATE_LIMITS, rate_window=WINDOW, **options):
+                 Class's constructor (options are passed to SearchClient).
+        acquire(self, path): Takes a call from the key with the most budget left, waiting when all the keys ran out.
+        wait_time(self, path): Seconds until any key has a call available.
+    """
+
+    def __init__(self, auths, api_root=API_ROOT, rate_limits=settings.RATE_LIMITS, rate_window=WINDOW, **options):
+
+        """Initializing CredentialPool Class"""
+        super().__init__(auths[0], api_root, rate_limits=dict(), rate_window=rate_window, **options)
+
+        self.keys = [(auth.apply_auth(), {path: RateLimiter(limit, rate_window) for path, limit in rate_limits.items()})
+                     for auth in auths]
+        self.__lock = threading.Lock()
+
+    def acquire(self, path):
+
+        """
+        Takes a call from the key with the most budget left in its window, waiting for the earliest window when all
+        the keys ran out.
+
+        Args:
+            path (str): Endpoint's path.
+
+        Returns:
+            (oauth, limiter): The chosen key's signer & RateLimiter (None when the endpoint isn't limited).
+        """
+
+        while True:
+            with self.__lock:
+                limited = [(limits[path], oauth) for oauth, limits in self.keys if path in limits]
+
+                if not limited:
+                    return self.keys[0][0], None
+
+                for limiter, oauth in sorted(limited, key=lambda key: key[0].remaining, reverse=True):
+                    if limiter.acquire(block=False):
+                        return oauth, limiter
+
+                wait = min(limiter.wait_time() for limiter, _ in limited)
+
+            print("Rate limit of all {} keys reached, waiting {:.0f} seconds".format(len(limited), wait))
+            time.sleep(wait)
+
+    def wait_time(self, path):
+
+        """Seconds until any key has a call of the endpoint available (0 when it isn't limited)."""
+
+        waits = [limits[path].wait_time() for _, limits in self.keys if path in limits]
+
+        return min(waits) if waits else 0
+
+
+def build_search_client(auth, file_name=settings.CREDENTIALS_FILE):
+
+    """
+    Builds the search client - a CredentialPool when the credentials file holds several key sets, otherwise a
+    SearchClient of auth.
+
+    Args:
+        auth (OAuthHandler): The default credentials (twitter_credentials).
+        file_name (str): The credentials file.
+
+    Returns:
+        search_client (SearchClient): The client.
+    """
+
+    auths = load_credentials(file_name)
+
+    if len(auths) > 1:
+        return CredentialPool(auths)
+
+    return SearchClient(auths[0] if auths else auth)
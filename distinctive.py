@@ -0,0 +1,136 @@
+import numpy as np
+from scipy import sparse
+
+import settings
+
+
+def term_tag_matrix(encoded, terms):
+
+    """
+    Counts the terms of every hashtag into a single sparse term x hashtag matrix.
+
+    Args:
+        encoded (list): (ids, tweet_numbers) of each hashtag's tweets (see Vocabulary.encode_tweets).
+        terms (int): Number of terms (the vocabulary's size).
+
+    Returns:
+        counts (csc_matrix): The count of each term (row) in each hashtag (column).
+    """
+
+    ids = np.concatenate([token_ids for token_ids, tweet_numbers in encoded] or [np.zeros(0, dtype=np.int64)])
+    columns = np.repeat(np.arange(len(encoded)), [len(token_ids) for token_ids, tweet_numbers in encoded])
+
+    # The duplicates (a term's occurrences in a hashtag) are summed by the conversion
+    return sparse.coo_matrix((np.ones(len(ids), dtype=np.int64), (ids, columns)),
+                             shape=(terms, len(encoded))).tocsc()
+
+
+def nonzero_entries(counts):
+
+    """
+    The non zero counts of a term x hashtag matrix with their term (row) & hashtag (column).
+
+    Args:
+        counts (spmatrix): Term x hashtag counts.
+
+    Returns:
+        (counts, rows, columns, data): The counts as csc_matrix, each entry's row & column and its float count.
+    """
+
+    counts = counts.tocsc()
+    columns = np.repeat(np.arange(counts.shape[1]), np.diff(counts.indptr))
+
+    return counts, counts.indices, columns, counts.data.astype(np.float64)
+
+
+def tf_idf(counts):
+
+    """
+    TF-IDF of each term in each hashtag - the term's share of the hashtag's terms, weighted by the smoothed inverse
+    number of hashtags which have it (log((1 + hashtags) / (1 + df))), so the words of every hashtag score 0.
+
+    Args:
+        counts (csc_matrix): Term x hashtag counts (see term_tag_matrix).
+
+    Returns:
+        scores (csc_matrix): The scores, at the non zero counts.
+    """
+
+    counts, rows, columns, data = nonzero_entries(counts)
+
+    document_frequency = np.diff(counts.tocsr().indptr)
+    idf = np.log((1 + counts.shape[1]) / (1 + document_frequency))
+    column_totals = np.asarray(counts.sum(axis=0)).ravel()
+
+    return sparse.csc_matrix((data / column_totals[columns] * idf[rows], counts.indices, counts.indptr),
+                             shape=counts.shape)
+
+
+def log_odds(counts, prior=settings.LOG_ODDS_PRIOR):
+
+    """
+    Log-odds ratio of each term in each hashtag against all the other hashtags, with an informative Dirichlet prior
+    (the term's share of the whole session, scaled by `prior`), as a z-score (Monroe, Colaresi & Quinn, 2008).
+    Frequent words of every hashtag score about 0, a hashtag's own words score high.
+
+    Args:
+        counts (csc_matrix): Term x hashtag counts (see term_tag_matrix).
+        prior (float): Scale of the prior's pseudo counts relative to the session's counts.
+
+    Returns:
+        scores (csc_matrix): The z-scores, at the non zero counts.
+    """
+
+    counts, rows, columns, data = nonzero_entries(counts)
+
+    term_totals = np.asarray(counts.sum(axis=1)).ravel().astype(np.float64)
+    column_totals = np.asarray(counts.sum(axis=0)).ravel().astype(np.float64)
+    total = column_totals.sum()
+
+    alpha = prior * term_totals[rows]
+    alpha_total = prior * total
+
+    # The term's counts in the hashtag & in the rest of the hashtags
+    inside, outside = data, term_totals[rows] - data
+    inside_total = column_totals[columns]
+    outside_total = total - inside_total
+
+    delta = (np.log((inside + alpha) / (inside_total + alpha_total - inside - alpha))
+             - np.log((outside + alpha) / (outside_total + alpha_total - outside - alpha)))
+    variance = 1 / (inside + alpha) + 1 / (outside + alpha)
+
+    return sparse.csc_matrix((delta / np.sqrt(variance), counts.indices, counts.indptr), shape=counts.shape)
+
+
+def top_terms(scores, counts, skip, n):
+
+    """
+    The highest scored terms of each hashtag.
+
+    Args:
+        scores (csc_matrix): Term x hashtag scores (see tf_idf & log_odds).
+        counts (csc_matrix): Term x hashtag counts.
+        skip (ndarray): Boolean array of the terms which are left out (stop words, the hashtags themselves) - the
+                        terms which don't score above 0 are left out as well.
+        n (int): Number of terms of each hashtag.
+
+    Returns:
+        top (list): For each hashtag, a list of (term id, score, count) tuples, highest first.
+    """
+
+    scores, counts = scores.tocsc(), counts.tocsc()
+    top = list()
+
+    for column in range(scores.shape[1]):
+        start, end = scores.indptr[column], scores.indptr[column + 1]
+        rows, values = scores.indices[start:end], scores.data[start:end]
+
+        # Only the words which are more frequent in the hashtag than in the others
+        kept = ~skip[rows] & (values > 0)
+        rows, values = rows[kept], values[kept]
+        order = np.argsort(-values, kind='stable')[:n]
+
+        top.append([(row, score, int(counts[row, column]))
+                    for row, score in zip(rows[order].tolist(), values[order].tolist())])
+
+    return top
@@ -0,0 +1,186 @@
+from datetime import datetime
+
+import pandas as pd
+
+import activity
+from cooccurrence import Cooccurrence
+import influence
+from sketches import HyperLogLog
+from snapshot import save_snapshot
+from tweet_buffer import session_frame
+from tweet_store import TweetStore
+import settings
+
+
+def export_to_excel(tweet_matrix, tag_list, tweet_analyzer, save=True):
+
+    """
+    Performs Data analysis and extracting it to an excel file.
+
+    Args:
+        tweet_matrix (list): A list of TweetBuffer which stores all the tweets and their data for each hashtag.
+        tag_list (dict): Hashtags list itself (same order as tweet_matrix).
+        tweet_analyzer (TweetAnalyzer): Analyzer which performs the analysis of each hashtag.
+        save (bool): Saves the session - appends its tweets to the data base & writes its Arrow snapshot
+                     (False when re-analyzing a snapshot).
+
+    Parameters:
+        store (TweetStore): The SQLite data base where the tweets of every session are appended.
+        file_name (str): Excel file's name in format 'tweets_day_month_year_hour_minutes.xlsx'.
+        writer (XlsxWriter): Creates a Pandas Excel writer using XlsxWriter as the engine.
+        workbook (Workbook): Get the xlsxwriter objects from the dataframe writer object.
+        worksheet (Worksheet):  Object for the Excel worksheet which has the ability to insert items.
+        df (DataFrame): A dataframe which storing all the data extracted from the tweets & their analysis.
+        word_count_df (DataFrame): Creates Data Frame for each tag of Popular Words.
+                                   Adds the Word Count Data Frame to the main Data Frame for future extraction.
+        source_count_df (DataFrame): Creates Data Frame for the aamount of each User Source and
+                                     Adds this Data Frame to the main Data Frame for future extraction.
+        phrase_count_df (DataFrame): Creates Data Frame for each tag of Popular Phrases (bigrams & trigrams) and
+                                     Adds it to the main Data Frame for future extraction.
+        failures (list): Hashtag, policy, number of tweets & error of each hashtag whose search failed.
+        reach (list): Hashtag, tweets, distinct tweets & distinct users (HyperLogLog estimates) of each hashtag.
+        all_users, all_tweets (HyperLogLog): The merged sketches of all the hashtags.
+        cooccurrence (Cooccurrence): Hashtag co-occurrence of the whole session's tweets.
+        pairs (list): Hashtag, co-occurring hashtag, tweets together & share of each searched hashtag's strongest pairs.
+        encoded (list): The token ids of each hashtag's tweets (tokenized once, see TweetAnalyzer.encode).
+        encoded_tags (list): The hashtags of encoded.
+        scores (ndarray): The sentiment score of each of the hashtag's tweets (its 'Sentiment' column).
+        frame (DataFrame): The tweets of all the hashtags in a single data frame (see tweet_buffer.session_frame).
+
+    Returns:
+        file_name (str): Excel file's name.
+    """
+
+    # Export information into an Excel file in format 'tweets_day_month_year_hour_minutes.xlsx'
+    file_name = 'tweets' + datetime.now().strftime("_%d_%m_%y_%H_%M") + '.xlsx'
+    writer = pd.ExcelWriter(file_name, engine='xlsxwriter')
+    workbook = writer.book
+
+    if save and settings.SNAPSHOTS:
+        # Keeps the session's columnar table for re-analysis without the API
+        save_snapshot(tweet_matrix, tag_list, file_name.replace('.xlsx', '.arrow'))
+
+    # Opens the data base which stores all the tweets and their data.
+    store = TweetStore() if save else None
+    failures = list()
+    reach = list()
+    all_users, all_tweets = HyperLogLog(), HyperLogLog()
+    cooccurrence = Cooccurrence()
+    encoded, encoded_tags = list(), list()
+
+    try:
+        for item, tag in zip(tweet_matrix, tag_list):
+
+            if item.failure is not None:
+                failures.append([tag, 'Partial' if len(item) > 0 else 'Skipped', len(item), item.failure])
+
+            if len(item) > 0:
+                # Creates Data Frame for each hashtag
+                df = tweet_analyzer.tweets_to_data_frame(item)
+
+                # Tokenizes the hashtag's tweets once for the sentiment, the phrases & the distinctive words
+                encoded.append(tweet_analyzer.encode(item))
+                encoded_tags.append(tag)
+
+                # Scores the sentiment of each tweet
+                scores = tweet_analyzer.sentiment(item, encoded[-1])
+                df['Sentiment'] = scores
+
+                # Appends the hashtag's tweets to the data base
+                if store is not None:
+                    store.append(tag, df, file_name)
+
+                # Estimates the distinct users & tweets of the hashtag
+                users, tweet_ids = tweet_analyzer.reach(item)
+                reach.append([tag, len(item), tweet_ids.count(), users.count()])
+                all_users.merge(users)
+                all_tweets.merge(tweet_ids)
+
+                # Adds the hashtags of the tweets's entities to the session's co-occurrence
+                cooccurrence.add(item)
+
+                # Get Info about the amount for popular words
+                word_count_df = tweet_analyzer.word_counter(item, tag, encoded[-1])
+                df = tweet_analyzer.word_counter_to_data_frame(df, word_count_df)
+
+                # Get Info about the amount from each User Source
+                source_count_df = df['Source'].value_counts()
+                df = tweet_analyzer.user_source_counter_to_data_frame(df, source_count_df)
+
+                # Get Info about the amount for popular phrases
+                phrase_count_df = tweet_analyzer.phrase_counter(item, tag, encoded[-1])
+                df = tweet_analyzer.phrase_counter_to_data_frame(df, phrase_count_df)
+
+                # Get Info about the sentiment distribution
+                df = tweet_analyzer.sentiment_to_data_frame(df, scores)
+
+                # Convert the dataframe to an XlsxWriter Excel object.
+                df.to_excel(writer, sheet_name=tag)
+                worksheet = writer.sheets[tag]
+
+                # Adds Popular Words's Graph
+                tweet_analyzer.words_counter_graph(workbook, worksheet, word_count_df, tag)
+
+                # Adds Most User Source's Graph
+                tweet_analyzer.user_source_graph(workbook, worksheet, df, tag)
+
+                # Adds Sentiment Distribution's Graph
+                tweet_analyzer.sentiment_graph(workbook, worksheet, df, tag)
+
+                # Reduce the zoom a little
+                worksheet.set_zoom(90)
+
+            else:
+
+                # Create Data Frame to inform the user that the specific hashtag couldn't be found
+                message = "Couldn't Find Tweets For This Hashtag" if item.failure is None else "Search Failed"
+                df = pd.DataFrame(data=[message], columns=['tweets'])
+                # Convert the dataframe to an XlsxWriter Excel object.
+                df.to_excel(writer, sheet_name=tag)
+
+        if reach:
+            # Distinct users & tweets of each hashtag and of all the hashtags together (a tweet may have several)
+            reach.append(['All Hashtags', sum(row[1] for row in reach), all_tweets.count(), all_users.count()])
+            df = pd.DataFrame(data=reach, columns=['Hashtag', 'Tweets', 'Distinct Tweets', 'Distinct Users'])
+            df.to_excel(writer, sheet_name='Reach', index=False)
+
+            # The strongest co-occurring hashtags of each searched hashtag, across the whole session
+            cooccurrence.build()
+            pairs = [[tag, other, count, share] for tag in tag_list
+                     for other, count, share in cooccurrence.strongest_pairs(tag, settings.TOP_PAIRS)]
+            df = pd.DataFrame(data=pairs, columns=['Hashtag', 'Co-occurring Hashtag', 'Tweets Together', 'Share'])
+            df.to_excel(writer, sheet_name='Co-occurrence', index=False)
+
+            if settings.GRAPH_MIN_WEIGHT is not None:
+                cooccurrence.write_graphml(file_name.replace('.xlsx', '.graphml'), settings.GRAPH_MIN_WEIGHT)
+
+            # The most distinctive words of each hashtag against the other hashtags
+            df = tweet_analyzer.distinctive_terms(encoded, encoded_tags)
+            df.to_excel(writer, sheet_name='Distinctive Words', index=False)
+
+            # Tweets, likes & retweets of each hashtag over time & per hour of week, grouped at once for all the
+            # hashtags
+            frame = session_frame(tweet_matrix, tag_list)
+            df = activity.time_series(frame)
+            df.to_excel(writer, sheet_name='Activity', index=False)
+            tweet_analyzer.activity_graph(workbook, writer.sheets['Activity'], df)
+            tweet_analyzer.hour_of_week_sheet(writer, activity.hour_of_week(frame))
+
+            # The most influential users of each hashtag & of the whole session
+            df = influence.top_influencers(frame)
+            df.to_excel(writer, sheet_name='Influencers', index=False)
+
+        if failures:
+            # Lists the hashtags whose search failed after its retries
+            df = pd.DataFrame(data=failures, columns=['Hashtag', 'Result', 'Tweets', 'Error'])
+            df.to_excel(writer, sheet_name='Failed Searches', index=False)
+
+    finally:
+        # The data base is closed even when the analysis fails
+        if store is not None:
+            store.close()
+
+    # Close the Pandas Excel writer and exit the Excel file.
+    writer.save()
+
+    return file_name
@@ -0,0 +1,116 @@
+"""
+Headless mode - searches a saved hashtag list & exports it into an excel file without the UI.
+
+Usage:
+    python headless.py search hashtag_list.json 100
+    python headless.py reanalyze tweets_19_10_26_12_00.arrow
+    python headless.py hydrate [--hashtag #python]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+
+from async_search import AsyncSearchEngine
+from credential_pool import (build_search_client, load_credentials)
+from exporter import export_to_excel
+from hydrate import hydrate
+from snapshot import load_snapshot
+from tweet_analyzer import TweetAnalyzer
+from tweet_store import TweetStore
+from user_cache import refresh_users
+from warmup import build_auth
+
+
+class ConsoleStatusBar:
+
+    """Status bar replacement which prints the status messages to the console."""
+
+    def clear(self):
+
+        pass
+
+    def append(self, text):
+
+        print(re.sub(r"<[^>]+>", "", text))
+
+
+class ConsoleWindow:
+
+    """Stands for the App main window, sharing the console status bar with TweetAnalyzer."""
+
+    get_statusbar_table = ConsoleStatusBar()
+
+
+async def search(auth, tag_list, num_of_tweets):
+
+    """
+    Search the hashtags with the asyncio engine.
+
+    Args:
+        auth (OAuthHandler): Twitter credentials for authentication.
+        tag_list (dict): Hashtags list itself.
+        num_of_tweets (int): Number of tweets to be pulled out for each hashtag.
+
+    Returns:
+        tweet_matrix (list): The TweetBuffer of each hashtag.
+    """
+
+    # Every key set of the credentials file spreads the rate limit, like the search client's CredentialPool
+    engine = AsyncSearchEngine(load_credentials() or auth)
+
+    try:
+        return await engine.search(tag_list, num_of_tweets)
+    finally:
+        await engine.close()
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Search a hashtag list & export its tweets into an excel file.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    search_command = commands.add_parser('search', help="search a hashtag list & export it")
+    search_command.add_argument('hashtag_list', help="json file of a saved hashtag list")
+    search_command.add_argument('num_of_tweets', type=int, help="number of tweets for each hashtag")
+
+    reanalyze_command = commands.add_parser('reanalyze', help="re-analyze & re-export a session snapshot")
+    reanalyze_command.add_argument('snapshot', help="arrow snapshot of a session")
+
+    hydrate_command = commands.add_parser('hydrate', help="refresh likes & retweets of the stored tweets")
+    hydrate_command.add_argument('--hashtag', help="only the tweets of this hashtag")
+
+    args = parser.parse_args(argv)
+
+    # Only the API commands need the credentials - a snapshot is re-analyzed offline
+    if args.command == 'hydrate':
+        with TweetStore() as store:
+            refreshed, failed = hydrate(build_search_client(build_auth()), store, args.hashtag)
+
+        print("{} tweets were refreshed!".format(refreshed))
+        if failed:
+            print("{} tweets weren't refreshed - {} batches failed".format(sum(len(ids) for ids, _ in failed),
+                                                                          len(failed)))
+        return
+
+    if args.command == 'search':
+        with open(args.hashtag_list, 'r') as f:
+            tag_list = json.load(f)
+
+        auth = build_auth()
+        tweet_matrix = asyncio.run(search(auth, tag_list, args.num_of_tweets))
+        refresh_users(build_search_client(auth), tweet_matrix)
+        file_name = export_to_excel(tweet_matrix, tag_list, TweetAnalyzer(ConsoleWindow()))
+
+    else:
+        # The likes & retweets refreshed by hydrate since the session replace the snapshot's
+        with TweetStore() as store:
+            tweet_matrix, tag_list = load_snapshot(args.snapshot, store=store)
+        file_name = export_to_excel(tweet_matrix, tag_list, TweetAnalyzer(ConsoleWindow()), save=False)
+
+    print("{} was created successfully!".format(file_name))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from search_client import LOOKUP_SIZE
+import settings
+
+
+def hydrate(search_client, store, hashtag=None, workers=settings.HYDRATE_WORKERS):
+
+    """
+    Refreshes the likes & retweets of the stored tweets through statuses/lookup (100 ids per call) instead of
+    searching them again. The batches run concurrently within the lookup's rate limit and only the metrics are
+    updated - the text analysis isn't redone. A batch which fails doesn't stop the others: the found tweets are
+    written and the failed batches are returned.
+
+    Args:
+        search_client (SearchClient): The client which performs the lookups.
+        store (TweetStore): The data base of the tweets.
+        hashtag (str): Only tweets of this hashtag (all the stored tweets when None).
+        workers (int): Concurrent lookup batches.
+
+    Parameters:
+        ids (list): The ids of the tweets to refresh.
+        batches (list): Lists of up to LOOKUP_SIZE ids.
+        metrics (list): (likes, retweets, tweet_id) tuples of the found tweets.
+
+    Returns:
+        (refreshed, failed): Number of refreshed tweets (deleted & protected tweets aren't returned by the lookup) &
+                             the (ids, error) of each failed batch.
+    """
+
+    ids = store.tweet_ids(hashtag)
+    batches = [ids[i:i + LOOKUP_SIZE] for i in range(0, len(ids), LOOKUP_SIZE)]
+
+    def lookup(batch):
+        try:
+            return [(status['favorite_count'], status['retweet_count'], status['id'])
+                    for status in search_client.lookup(batch, trim_user='true', include_entities='false')], None
+        except Exception as e:
+            return list(), e
+
+    metrics = list()
+    failed = list()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch, (batch_metrics, error) in zip(batches, executor.map(lookup, batches)):
+            if error is None:
+                metrics.extend(batch_metrics)
+            else:
+                print('Hydrate Error ({0} tweets from {1}): {2}'.format(len(batch), batch[0], error))
+                failed.append((batch, error))
+
+    store.update_metrics(metrics)
+
+    return len(metrics), failed
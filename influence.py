@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from tweet_buffer import UNKNOWN_USER
+from user_cache import shared_cache
+import settings
+
+COLUMNS = ['Hashtag', 'User', 'Followers', 'Tweets', 'Likes', 'Retweets', 'Reach', 'Engagement', 'Score']
+
+
+def user_scores(frame, groups, followers):
+
+    """
+    Reach, engagement & influence score of each group of tweets (a user's tweets in a hashtag).
+
+    The reach is the user's followers x its tweets (the potential impressions) and the engagement is its likes plus
+    its retweets x INFLUENCE_RETWEET_WEIGHT. The score weights the log of both, so neither the biggest accounts nor
+    a single viral tweet rank by themselves.
+
+    Args:
+        frame (DataFrame): The tweets - 'likes' & 'retweets' columns.
+        groups (list): The group keys of the tweets (arrays, e.g. the hashtag & user codes).
+        followers (ndarray): The followers of each user code.
+
+    Returns:
+        scores (DataFrame): 'tweets', 'likes', 'retweets', 'followers', 'reach', 'engagement' & 'score' of each group,
+                            indexed by its keys.
+    """
+
+    scores = frame[['likes', 'retweets']].groupby(groups, sort=False).agg(
+        tweets=('likes', 'size'), likes=('likes', 'sum'), retweets=('retweets', 'sum'))
+
+    scores['followers'] = followers[scores.index.get_level_values('user')]
+    scores['reach'] = scores['followers'] * scores['tweets']
+    scores['engagement'] = scores['likes'] + settings.INFLUENCE_RETWEET_WEIGHT * scores['retweets']
+    scores['score'] = (settings.INFLUENCE_REACH_WEIGHT * np.log10(1 + scores['reach'])
+                       + settings.INFLUENCE_ENGAGEMENT_WEIGHT * np.log10(1 + scores['engagement']))
+
+    return scores
+
+
+def top_influencers(frame, n=settings.TOP_INFLUENCERS, users=shared_cache):
+
+    """
+    The most influential users of each hashtag & of the whole session - the session's tweets are grouped at once by
+    hashtag & user code, and the top of each group is taken by nlargest (no sort of all the users). A tweet found by
+    several hashtags counts once in the whole session's ranking.
+
+    Args:
+        frame (DataFrame): The session's tweets (see tweet_buffer.session_frame).
+        n (int): Users of each hashtag.
+        users (UserCache): The cache of the tweets users's profiles.
+
+    Parameters:
+        codes (ndarray): Each tweet's user as an index into the distinct users.
+        profiles (list): The profile of each distinct user - looked up once per user.
+
+    Returns:
+        influencers_df (DataFrame): Hashtag, user & scores of each hashtag's top users, then of 'All Hashtags'.
+    """
+
+    if frame.empty:
+        return pd.DataFrame(columns=COLUMNS)
+
+    codes, user_ids = pd.factorize(frame['user_id'])
+    profiles = [users.get(user_id) or UNKNOWN_USER for user_id in user_ids.tolist()]
+    screen_names = np.array([profile.screen_name for profile in profiles], dtype=object)
+    followers = np.array([profile.followers for profile in profiles], dtype=np.int64)
+
+    tags = frame['hashtag'].cat.categories
+    tag_codes = pd.Series(frame['hashtag'].cat.codes.to_numpy(), name='hashtag', index=frame.index)
+    codes = pd.Series(codes, name='user', index=frame.index)
+
+    # Every hashtag's top users, then the whole session's top users
+    scores = user_scores(frame, [tag_codes, codes], followers)
+
+    # nlargest over positions - pandas drops the rest of a (hashtag, user) MultiIndex a row at a time
+    flat = pd.Series(scores['score'].to_numpy())
+    top = flat.groupby(scores.index.get_level_values('hashtag').to_numpy()).nlargest(n)
+    top = scores.iloc[top.index.get_level_values(1)]
+
+    distinct = ~frame['tweet_id'].duplicated().to_numpy()
+    overall = user_scores(frame[distinct], [codes[distinct]], followers)
+    overall = overall.loc[overall['score'].nlargest(n).index]
+
+    rows = pd.concat([
+        pd.DataFrame({'Hashtag': np.asarray(tags)[top.index.get_level_values('hashtag')],
+                      'User': screen_names[top.index.get_level_values('user')]}),
+        pd.DataFrame({'Hashtag': 'All Hashtags', 'User': screen_names[overall.index.to_numpy()]}),
+    ], ignore_index=True)
+
+    metrics = pd.concat([top, overall], ignore_index=True)
+    for column in COLUMNS[2:]:
+        rows[column] = metrics[column.lower()].to_numpy()
+
+    return rows
@@ -1,19 +1,25 @@
+import asyncio
 import sys
 from datetime import datetime
 import json
 import webbrowser
-import pandas as pd
 
-from PyQt5.QtCore import (QSize, QThread)
+from PyQt5.QtCore import (QSize, QThread, QTimer)
 from PyQt5.QtGui import (QIcon, QPixmap, QImage, QPalette, QBrush)
 from PyQt5.QtWidgets import (QTextBrowser, QMainWindow, QApplication, QLabel, QLineEdit,QListWidget, QPushButton,
                              QMessageBox, QAction, QFileDialog, QDialog, QInputDialog)
 
-from tweepy import (API, OAuthHandler)
-
-from threads import ThreadsClass
+from async_search import AsyncSearchEngine
+from credential_pool import (build_search_client, load_credentials)
+from exporter import export_to_excel
+from prefetch import Prefetcher
+from snapshot import load_snapshot
+from threads import (HydrateClass, SearchJob, ThreadsClass, WarmUpClass)
 from tweet_analyzer import TweetAnalyzer
-import twitter_credentials
+from tweet_store import TweetStore
+from user_cache import refresh_users
+from warmup import (build_api, build_auth)
+import settings
 
 
 class App(QMainWindow):
@@ -32,6 +38,7 @@ class App(QMainWindow):
         __statusbar_table (QTextBrowser): Status var at the UI to inform the user about the actions.
         __twitter_client (API): API instance.
         __tweet_analyzer (TweetAnalyzer): Initialize TweetAnalyzer Object in order to use class's methods.
+        __warm_analyzer (TweetAnalyzer): Analyzer prepared by the start-up warm-up for the next session.
 
     Methods:
         super().__init__(): QMainWindow Base Class __init__ constructor.
@@ -39,6 +46,12 @@ class App(QMainWindow):
         __data_and_analysis_to_excel(self, result): Performs Data analysis and extracting it to an excel file.
         __start_session(self): Main Method which initializing Authentication,Stream & Using QThreads for the future
                                search.
+        __stop_session(self): Stops a streaming collection.
+        __async_search(self, job): Searches a session's hashtags & refreshes its users's profiles off the event loop.
+        __async_search_done(self, task, job): Callback of the asyncio search task - passes its result to the export.
+        __start_warm_up(self): Starts the background warm-up of the auth, clients & analyzer.
+        __warm_up_done(self, result): Keeps the warmed up objects for the first session.
+        __sync_prefetch(self): Prefetches the hashtags which entered the list & cancels the ones which left it.
         __copyrights_btn_links(self, name): A method designed to identify links for buttons serving the copyright part.
         __create_button(self, width, height, top, left, image, func, text=None): Generic Method for creating a button
                                in UI.
@@ -53,6 +66,9 @@ class App(QMainWindow):
         __clear_hashtag_list(self): A method designed to clear/clean hashtags list
         __load_hashtag_from_json(self): Data Serialization - A Method designed to load hashtags list from a json file.
         __save_hashtag_to_json(self): Data Serialization - A Method designed to save hashtags list into a json file.
+        __reanalyze_snapshot(self): Re-analyze & re-export a session snapshot without the API.
+        __hydrate_data_base(self): Refreshes the likes & retweets of the tweets in the data base.
+        __hydrate_done(self, result): Reports the data base's refresh.
         __set_event_action(self, action, func): A method toe set an event action when occurred.
         __set_main_window_conf(self, width, height, brush_size, img_path): Main window configuration method.
         get_statusbar_table(self): Share current status_bar's object with TweetAnalyzer's object to update it.
@@ -62,6 +78,14 @@ class App(QMainWindow):
     """
 
     status_bar = None
+    auth = None
+    twitter_client = None
+    search_client = None
+    async_engine = None
+    prefetcher = None
+    search_worker = None
+    search_thread = None
+    hydrate_thread = None
 
     def __init__(self):
 
@@ -80,9 +104,14 @@ class App(QMainWindow):
         self.__statusbar_table = self.__create_text_browser(250, 485, 800, 50, "font-size: 30px;")
         self.__twitter_client = None
         self.__tweet_analyzer = None
+        self.__warm_analyzer = None
         #self.search_thread = None
         self.__init_ui()
 
+        # Warm up once the window is shown
+        if settings.WARM_UP:
+            QTimer.singleShot(0, self.__start_warm_up)
+
     @classmethod
     def set_status_bar_class_var(cls, instance):
 
@@ -94,7 +123,9 @@ class App(QMainWindow):
     def __twitter_client_auth(self):
 
         """
-        Client Authentication with Twitter's API
+        Client Authentication with Twitter's API.
+        The auth, API & SearchClient are built once and shared by all the sessions, so the pooled keep-alive
+        connections of the search client are reused across searches.
 
         Args:
             No Args
@@ -103,6 +134,8 @@ class App(QMainWindow):
             self.__statusbar_table (QTextBrowser): Status bar @ the bottom of UI.
             App.auth (OAuthHandler): Stores the twitter credentials for authentication.
             App.twitter_client (API): API instance.
+            App.search_client (SearchClient): Thin http client for the raw json search fetch mode (a CredentialPool
+                                              when credentials.json holds several key sets).
 
         Returns:
             App.twitter_client (API): API instance.
@@ -113,10 +146,14 @@ class App(QMainWindow):
 
         try:
 
+            # Reuse the long-lived clients of a previous session
+            if App.twitter_client is not None:
+                return App.twitter_client
+
             # Initializing Twitter Client Authentication
-            App.auth = OAuthHandler(twitter_credentials.CONSUMER_KEY, twitter_credentials.CONSUMER_SECRET)
-            App.auth.set_access_token(twitter_credentials.ACCESS_TOKEN, twitter_credentials.ACCESS_TOKEN_SECRET)
-            App.twitter_client = API(App.auth)
+            App.auth = build_auth()
+            App.twitter_client = build_api(App.auth)
+            App.search_client = build_search_client(App.auth)
 
             # Checking if the authentication successful.
             assert App.twitter_client
@@ -128,112 +165,39 @@ class App(QMainWindow):
         except Exception as e:
             self.__statusbar_table.append('<center>Authentication Error: {0}'.format(e))
 
-    def __data_and_analysis_to_excel(self, result):
+    def __data_and_analysis_to_excel(self, job):
 
         """
         Performs Data analysis and extracting it to an excel file.
 
         Args:
-            result (List): A list of lists which stores all the tweets and their data.
+            job (SearchJob): The done search job - its hashtags list & the TweetBuffer of each hashtag.
 
         Parameters:
             self.__statusbar_table (QTextBrowser): Status bar @ the bottom of UI.
             self.__tweet_matrix (Dict): Out Tweets main list.
-            App.auth (OAuthHandler): Stores the twitter credentials for authentication.
-            App.twitter_client (API): API instance.
-            writer (XlsxWriter): Creates a Pandas Excel writer using XlsxWriter as the engine.
-            workbook (Workbook): Get the xlsxwriter objects from the dataframe writer object.
-            worksheet (Worksheet):  Object for the Excel worksheet which has the ability to insert items.
-            df (DataFrame): A dataframe which storing all the data extracted from the tweets & their analysis.
-            df_db (DataFrame): A dataframe which storing all the data which pulled out during the search for tha main
-                                data base sheet.
-            df_temp (DataFrame): A dataframe which is a copy of main data frame (df).
-            word_count_df (DataFrame): Creates Data Frame for each tag of Popular Words.
-                                       Adds the Word Count Data Frame to the main Data Frame for future extraction.
-            source_count_df (DataFrame): Creates Data Frame for the aamount of each User Source and
-                                         Adds this Data Frame to the main Data Frame for future extraction.
+            self.__tweet_analyzer (TweetAnalyzer): The job's analyzer (the one prepared by the warm-up when ready).
 
         Methods:
-            self.stream_tweets(self.__tag_list): Initialize a Stream & Use Search Engine with User's Hashtags.
-            App.__twitter_client_auth(self): Initializing Twitter Client Authentication.
-            self.__tweet_analyzer.tweets_to_data_frame(item): Extracting relevant information into a data frame.
-            self.__tweet_analyzer.word_counter(item, tag): A method to count popular words for each hashtag.
-            self.__tweet_analyzer.word_counter_to_data_frame(df, word_count_df): Adding A space Between Rows and
-                                        Creating Data Frame of Words Count for future extraction to Excel File.
-            self.__tweet_analyzer.words_counter_graph(workbook, worksheet, word_count_df, tag): Creates a bar graph
-                                        within an Excel file with the analysis of the popular word.
-            self.__tweet_analyzer.user_source_counter_to_data_frame(df, source_count_df): Adding A space Between Rows
-                                        and Creating Data Frame of Source Count for future extraction to Excel File.
-            self.__tweet_analyzer.user_source_graph(self, workbook, worksheet, df, tag): Creates a pie graph within
-                                        an Excel file with the analysis of the most user source.
+            export_to_excel(self.__tweet_matrix, job.tag_list, self.__tweet_analyzer): Performs the analysis of
+                                        each hashtag & writes the excel file.
 
         Returns:
             None.
         """
 
-        self.__tweet_matrix = result
+        self.__tweet_matrix = job.tweet_matrix
         self.__statusbar_table.clear()
 
         try:
             if self.__tweet_matrix:
 
-                # Export information into an Excel file in format 'tweets_day_month_year_hour_minutes.xlsx'
-                writer = pd.ExcelWriter('tweets' + datetime.now().strftime("_%d_%m_%y_%H_%M") + '.xlsx',
-                                        engine='xlsxwriter')
-                workbook = writer.book
-
-                # Creating Data Base Main Sheet to store all the tweets and their data.
-                df_db = pd.DataFrame()
-                df_db.to_excel(writer, sheet_name='Data Base', startrow=1, header=False)
-
-                for item, tag in zip(self.__tweet_matrix, self.__tag_list):
-
-                    if len(item) > 0:
-                        # Creates Data Frame for each hashtag
-                        df = self.__tweet_analyzer.tweets_to_data_frame(item)
-
-                        # Get Info about the amount for popular words
-                        word_count_df = self.__tweet_analyzer.word_counter(item, tag)
-                        df = self.__tweet_analyzer.word_counter_to_data_frame(df, word_count_df)
-
-                        # Get Info about the amount from each User Source
-                        source_count_df = df['Source'].value_counts()
-                        df = self.__tweet_analyzer.user_source_counter_to_data_frame(df, source_count_df)
-
-                        # Data Frame's manipulation for the Data Base main sheet.
-                        df_temp = df.copy()
-                        df_temp = df_temp.drop(columns=[' ', '  ', '   ', 'Popular Words', 'Count', 'Source Count',
-                                                        'Unique Source'])
+                # Use the analyzer prepared by the warm-up
+                self.__tweet_analyzer = self.__warm_analyzer or TweetAnalyzer(self)
+                self.__warm_analyzer = None
 
-                        df_temp = df_temp.assign(Hashtag=[tag] * len(df.index))
-
-                        df_db = df_db.append(df_temp)
-                        df_db.to_excel(writer, sheet_name="Data Base", index=False)
-
-                        # Convert the dataframe to an XlsxWriter Excel object.
-                        df.to_excel(writer, sheet_name=tag)
-                        worksheet = writer.sheets[tag]
-
-                        # Adds Popular Words's Graph
-                        self.__tweet_analyzer.words_counter_graph(workbook, worksheet, word_count_df, tag)
-
-                        # Adds Most User Source's Graph
-                        self.__tweet_analyzer.user_source_graph(workbook, worksheet, df, tag)
-
-                        # Reduce the zoom a little
-                        worksheet.set_zoom(90)
-
-                    else:
-
-                        # Create Data Frame to inform the user that the specific hashtag couldn't be found
-                        df = pd.DataFrame(data=["Couldn't Find Tweets For This Hashtag"], columns=['tweets'])
-                        # Convert the dataframe to an XlsxWriter Excel object.
-                        df.to_excel(writer, sheet_name=tag)
-
-                worksheet_database = writer.sheets['Data Base']
-                worksheet_database.right_to_left()
-                # Close the Pandas Excel writer and exit the Excel file.
-                writer.save()
+                # Export information into an Excel file in format 'tweets_day_month_year_hour_minutes.xlsx'
+                export_to_excel(self.__tweet_matrix, job.tag_list, self.__tweet_analyzer)
 
                 self.__tweet_matrix.clear()
                 self.__statusbar_table.append("<center>Excel file was created successfully!")
@@ -241,7 +205,6 @@ class App(QMainWindow):
 
                 #self.__tweet_analyzer = TweetAnalyzer(self)
 
-                del self.__twitter_client
                 del self.__tweet_analyzer
         except IndexError:
             print("Error on line {}".format(sys.exc_info()[-1].tb_lineno))
@@ -264,9 +227,11 @@ class App(QMainWindow):
             self.__tag_list (dict): Hashtags list itself.
             self.__num_of_tweets (int): An integer which stores the amount of tweets to be exported.
             self.__twitter_client (API): API instance.
-            self.__tweet_analyzer ('): Initializing TweetAnalyzer object in order to use its methods.
-            self.__search (ThreadsClass): Our threads class in order to perform our search via twitter api.
-            self.search_thread (QThread): An object to control the threads.
+            job (SearchJob): The session's hashtags list & number of tweets.
+            App.search_worker (ThreadsClass): Our long-lived threads class which performs the searches of all the
+                                              sessions via twitter api.
+            App.search_thread (QThread): The worker's thread - started once & reused by every session.
+            App.async_engine (AsyncSearchEngine): The asyncio search engine ('asyncio' search backend).
 
         Returns:
             None
@@ -280,16 +245,34 @@ class App(QMainWindow):
             try:
                     # Creating a Stream Channel with Twitter API
                     self.__twitter_client = App.__twitter_client_auth(self)
-                    self.__tweet_analyzer = TweetAnalyzer(self)
+                    job = SearchJob(self.__tag_list, self.__num_of_tweets)
+
+                    if settings.SEARCH_BACKEND == 'asyncio':
+                        # Search all the hashtags concurrently on the qasync event loop
+                        if App.async_engine is None:
+                            App.async_engine = AsyncSearchEngine(load_credentials() or App.auth)
+
+                        self.__statusbar_table.append("<center>Start Searching... Please Wait!")
 
-                    self.__statusbar_table.append("<center>Start Searching... Please Wait!")
+                        task = asyncio.ensure_future(self.__async_search(job))
+                        task.add_done_callback(lambda done: self.__async_search_done(done, job))
 
-                    self.__search = ThreadsClass(self.__twitter_client, self.__num_of_tweets, self.__tag_list,self.__statusbar_table, self)
-                    self.search_thread = QThread()
-                    self.search_thread.started.connect(self.__search.run)  # Init worker run() at startup (optional)
-                    self.__search.signal.connect(self.__data_and_analysis_to_excel)# Connect your signals/slots
-                    self.__search.moveToThread(self.search_thread)  # Move the Worker object to the Thread object
-                    self.search_thread.start()
+                    else:
+                        # A single worker thread serves all the sessions - created with the first one
+                        if App.search_worker is None:
+                            App.search_worker = ThreadsClass(self.__twitter_client, self.__statusbar_table, self)
+                            App.search_thread = QThread()
+                            App.search_worker.signal.connect(self.__data_and_analysis_to_excel)# Connect your signals/slots
+                            App.search_worker.moveToThread(App.search_thread)  # Move the Worker object to the Thread object
+                            App.search_thread.start()
+
+                        # Queue the job behind the running ones
+                        ahead = App.search_worker.submit_job(job)
+
+                        if ahead:
+                            self.__statusbar_table.append("<center>Search Was Queued Behind {} Session(s)!".format(ahead))
+                        else:
+                            self.__statusbar_table.append("<center>Start Searching... Please Wait!")
 
             except AssertionError as ae:
                 self.__statusbar_table.append("<center>AssertionError: {}".format(ae))
@@ -303,6 +286,170 @@ class App(QMainWindow):
         else:
             self.__statusbar_table.append("<center>You Didn't Enter Hashtag or Number Of Tweets.")
 
+    def __stop_session(self):
+
+        """
+        Stops a streaming collection - the tweets collected so far are exported as usual.
+
+        Args:
+            No Args.
+
+        Parameters:
+            App.search_worker (ThreadsClass): Our threads class which performs the collection.
+
+        Returns:
+            None
+        """
+
+        # Clean The Status Bar
+        self.__statusbar_table.clear()
+
+        try:
+            if App.search_worker is not None and App.search_worker.collector is not None:
+                App.search_worker.stop()
+                self.__statusbar_table.append("<center>Stopping The Stream... Please Wait!")
+            else:
+                self.__statusbar_table.append("<center>There Is No Running Stream To Stop.")
+
+        except Exception as e:
+            self.__statusbar_table.append("<center>Error has Occurred: {}".format(e))
+
+    async def __async_search(self, job):
+
+        """
+        Searches a session's hashtags on the qasync event loop, then refreshes the expired profiles of the tweets's
+        users in bulk on the loop's default executor - the lookups are blocking requests which would freeze the UI.
+
+        Args:
+            job (SearchJob): The searched hashtags list.
+
+        Returns:
+            tweet_matrix (list): The TweetBuffer of each hashtag.
+        """
+
+        tweet_matrix = await App.async_engine.search(list(job.tag_list), job.num_of_tweets)
+
+        # The profiles are best effort - the searched tweets are exported anyway
+        await asyncio.get_running_loop().run_in_executor(None, refresh_users, App.search_client, tweet_matrix)
+
+        return tweet_matrix
+
+    def __async_search_done(self, task, job):
+
+        """
+        Callback of the asyncio search task - passes its result to the excel export.
+
+        Args:
+            task (Task): The finished search task.
+            job (SearchJob): The searched hashtags list.
+
+        Returns:
+            None
+        """
+
+        try:
+            job.tweet_matrix = task.result()
+
+        except Exception as e:
+            self.__statusbar_table.clear()
+            self.__statusbar_table.append("<center>Search Error: {}".format(e))
+
+        else:
+            self.__data_and_analysis_to_excel(job)
+
+    def __start_warm_up(self):
+
+        """
+        Starts the background warm-up (see warmup.warm_up) of the auth, clients & analyzer, so the first session
+        doesn't pay for them.
+
+        Args:
+            No Args.
+
+        Parameters:
+            self.__warm_up (WarmUpClass): The warm-up worker.
+            self.warm_up_thread (QThread): The warm-up's thread.
+
+        Returns:
+            None
+        """
+
+        try:
+            self.__warm_up = WarmUpClass(self)
+            self.warm_up_thread = QThread()
+            self.warm_up_thread.started.connect(self.__warm_up.run)
+            self.__warm_up.signal.connect(self.__warm_up_done)
+            self.__warm_up.moveToThread(self.warm_up_thread)
+            self.warm_up_thread.start()
+
+        except Exception as e:
+            print('Warm-up Error: {0}'.format(e))
+
+    def __warm_up_done(self, result):
+
+        """
+        Keeps the warmed up objects for the first session (unless a session already built its own).
+
+        Args:
+            result (dict): The warm-up's result (see warmup.warm_up).
+
+        Returns:
+            None
+        """
+
+        self.warm_up_thread.quit()
+
+        if 'error' in result:
+            self.__statusbar_table.append("<center>Warm-Up Error: {}".format(result['error']))
+            return
+
+        if App.twitter_client is None:
+            App.auth = result['auth']
+            App.twitter_client = result['twitter_client']
+            App.search_client = result['search_client']
+
+        self.__warm_analyzer = result['tweet_analyzer']
+
+        if 'screen_name' in result:
+            self.__statusbar_table.append("<center>Connected As @{}!".format(result['screen_name']))
+
+        print("Warm-up took {:.3f} seconds".format(result['seconds']))
+
+    def __sync_prefetch(self):
+
+        """
+        Speculative prefetch - starts fetching the first pages of the hashtags which entered the list and cancels the
+        hashtags which were removed or edited, so Start continues from the prefetched pages.
+
+        Args:
+            No Args.
+
+        Parameters:
+            App.prefetcher (Prefetcher): Background prefetcher shared by all the sessions.
+
+        Returns:
+            None
+        """
+
+        # Packed & budgeted sessions don't search the hashtags one by one - they don't take the prefetched pages
+        if not (settings.PREFETCH and settings.SEARCH_BACKEND == 'qthread' and settings.FETCH_MODE == 'raw'
+                and settings.COLLECTION_MODE == 'search' and settings.BUDGET is None and not settings.QUERY_PACKING):
+            return
+
+        # Reuses the clients of the warm-up or of a previous session - a list edit never authenticates (nor clears
+        # the status bar)
+        if App.search_client is None:
+            return
+
+        try:
+            if App.prefetcher is None:
+                App.prefetcher = Prefetcher(App.search_client)
+
+            App.prefetcher.sync(self.__tag_list)
+
+        except Exception as e:
+            print('Prefetch Error: {0}'.format(e))
+
     def __copyrights_btn_links(self, name):
 
         """   Copyrights Links Section
@@ -548,6 +695,8 @@ class App(QMainWindow):
                     if self.__tag_list.get(text) is None:
 
                         self.__tag_list[text] = text
+                        self.__sync_prefetch()
+
                         # Updating the Hashtag Table in the UI
                         row = self.__hashtag_table.currentRow()
                         self.__hashtag_table.insertItem(row, text)
@@ -599,6 +748,7 @@ class App(QMainWindow):
             text = str(item.text())
 
             del self.__tag_list[text]
+            self.__sync_prefetch()
 
             item = self.__hashtag_table.takeItem(row)
             del item
@@ -634,6 +784,8 @@ class App(QMainWindow):
 
                                 del self.__tag_list[text]
                                 self.__tag_list[string] = string
+                                self.__sync_prefetch()
+
                                 self.__statusbar_table.append(
                                     "<center>Hashtag {} Has Been Changed to {}!".format(text, string))
                             else:
@@ -674,6 +826,7 @@ class App(QMainWindow):
 
                 # Clear the hashtag list
                 self.__tag_list.clear()
+                self.__sync_prefetch()
 
                 # Clear the Display of hashtag list @ the UI
                 self.__hashtag_table.clear()
@@ -732,6 +885,9 @@ class App(QMainWindow):
                     if tag[0] is not "#" or len(tag) < 2:
                         raise FileExistsError(" The Hashtag List Inside Isn't Valid!")
 
+            # Prefetch the loaded hashtags
+            self.__sync_prefetch()
+
             # Clear the Hashtag Tabele in the UI
             self.__hashtag_table.clear()
 
@@ -749,6 +905,108 @@ class App(QMainWindow):
         else:
             self.__statusbar_table.append("<center>Hashtag List Successfully Loaded!")
 
+    def __reanalyze_snapshot(self):
+
+        """  Re-analyze & re-export a session snapshot without the API.
+
+        Args:
+           No Args
+
+        Parameters:
+             self.__statusbar_table (QTextBrowser): Status bar @ the bottom of UI.
+             file (QFileDialog) = An object that handles the arrow snapshot file.
+             tweet_matrix (list): The TweetBuffer of each hashtag of the snapshot.
+             tag_list (dict): The hashtags of the snapshot.
+
+        Returns:
+            None
+        """
+
+        # Clear the Status bar
+        self.__statusbar_table.clear()
+
+        try:
+            file = QFileDialog.getOpenFileName(self, 'Open Session Snapshot For Re-Analysis', "",
+                                               "arrow file (*.arrow)")
+
+            if file[0]:
+                # Memory map the snapshot (with the likes & retweets refreshed since) & rerun the analysis into a new
+                # excel file
+                with TweetStore() as store:
+                    tweet_matrix, tag_list = load_snapshot(file[0], store=store)
+                file_name = export_to_excel(tweet_matrix, tag_list, TweetAnalyzer(self), save=False)
+
+                self.__statusbar_table.append("<center>{} was created successfully!".format(file_name))
+
+        except FileNotFoundError as fnfe:
+            self.__statusbar_table.append("<center>File Not Found Error: {}".format(fnfe))
+        except Exception as e:
+            self.__statusbar_table.append("<center>Re-Analysis Error: {}".format(e))
+
+    def __hydrate_data_base(self):
+
+        """  Starts refreshing the likes & retweets of all the tweets in the data base through statuses/lookup, on a
+             background thread (see HydrateClass).
+
+        Args:
+           No Args
+
+        Parameters:
+             self.__statusbar_table (QTextBrowser): Status bar @ the bottom of UI.
+             self.__hydrate (HydrateClass): The refresh worker.
+             self.hydrate_thread (QThread): The refresh's thread.
+
+        Returns:
+            None
+        """
+
+        # Clear the Status bar
+        self.__statusbar_table.clear()
+
+        try:
+            if self.hydrate_thread is not None and self.hydrate_thread.isRunning():
+                self.__statusbar_table.append("<center>The Data Base Is Already Being Refreshed... Please Wait!")
+                return
+
+            App.__twitter_client_auth(self)
+
+            self.__hydrate = HydrateClass(App.search_client)
+            self.hydrate_thread = QThread()
+            self.hydrate_thread.started.connect(self.__hydrate.run)
+            self.__hydrate.signal.connect(self.__hydrate_done)
+            self.__hydrate.moveToThread(self.hydrate_thread)
+            self.hydrate_thread.start()
+
+            self.__statusbar_table.append("<center>Refreshing The Data Base... Please Wait!")
+
+        except Exception as e:
+            self.__statusbar_table.append("<center>Refresh Error: {}".format(e))
+
+    def __hydrate_done(self, result):
+
+        """
+        Reports the data base's refresh.
+
+        Args:
+            result (dict): The refreshed tweets & the failed batches, or the 'error' which stopped the refresh.
+
+        Returns:
+            None
+        """
+
+        self.hydrate_thread.quit()
+        self.__statusbar_table.clear()
+
+        if 'error' in result:
+            self.__statusbar_table.append("<center>Refresh Error: {}".format(result['error']))
+            return
+
+        self.__statusbar_table.append("<center>{} Tweets Were Refreshed!".format(result['refreshed']))
+
+        if result['failed']:
+            self.__statusbar_table.append("<center>{} Tweets Weren't Refreshed - {} Lookups Failed: {}".format(
+                sum(len(ids) for ids, _ in result['failed']), len(result['failed']), result['failed'][-1][1]))
+
     def __save_hashtag_to_json(self):
 
         """ Data Serialization - A Method designed to save hashtags list into a json file.
@@ -820,6 +1078,10 @@ class App(QMainWindow):
             close = close.exec()
 
             if close == QMessageBox.Yes:
+                if App.prefetcher is not None:
+                    App.prefetcher.close()
+                if App.search_thread is not None:
+                    App.search_thread.quit()
                 event.accept()
             else:
                 event.ignore()
@@ -917,6 +1179,17 @@ class App(QMainWindow):
         # Main Window Configurtaion
         self.__set_main_window_conf(1500, 1024, 10, "images/background.png")
 
+        # File Menu - Re-analyze a session snapshot
+        file_menu = self.menuBar().addMenu("File")
+        reanalyze_action = QAction("Re-analyze Snapshot...", self)
+        reanalyze_action.triggered.connect(self.__reanalyze_snapshot)
+        file_menu.addAction(reanalyze_action)
+
+        # File Menu - Refresh likes & retweets of the data base
+        hydrate_action = QAction("Refresh Likes && Retweets", self)
+        hydrate_action.triggered.connect(self.__hydrate_data_base)
+        file_menu.addAction(hydrate_action)
+
         """" Top Frame """
 
         # Banner\Logo
@@ -954,6 +1227,7 @@ class App(QMainWindow):
 
         # Start Button & Status Bar
         self.__start_button = self.__create_button(190, 40, 550, 425, 'images/start.png', self.__start_session)
+        self.__stop_button = self.__create_button(190, 40, 750, 425, 'images/stop_export.png', self.__stop_session)
 
         # Copyrights Frame
         self.__github_button = self.__create_button(198, 42, 546, 550, 'images/copyright.png', self.__copyrights_btn_links,
@@ -971,6 +1245,20 @@ class App(QMainWindow):
 def main():
     app = QApplication(sys.argv)
     #app = QApplication([])
+
+    if settings.SEARCH_BACKEND == 'asyncio':
+        # Bridge asyncio & Qt - a single event loop runs both the UI & the search engine
+        import qasync
+
+        loop = qasync.QEventLoop(app)
+        asyncio.set_event_loop(loop)
+
+        main_window = App()
+        ta = TweetAnalyzer(main_window)
+
+        with loop:
+            sys.exit(loop.run_forever())
+
     main_window = App()
     ta = TweetAnalyzer(main_window)
     sys.exit(app.exec_())
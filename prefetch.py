@@ -0,0 +1,165 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tweepy import TweepError
+
+from search_client import (SEARCH_PARAMS, SEARCH_PATH, PagePlan)
+from tweet_buffer import TweetBuffer
+import settings
+
+
+class PrefetchJob:
+
+    """
+    The speculative search of a single hashtag.
+
+    Attributes:
+        hashtag (str): The searched hashtag.
+        plan (PagePlan): The search's pagination plan - continued by the session.
+        tweets (TweetBuffer): The prefetched tweets.
+        started (float): Epoch time of the prefetch.
+        cancelled (Event): Set when the hashtag was removed or edited.
+        error (Exception): The error which stopped the prefetch (None when it succeeded).
+        future (Future): The prefetch's task.
+    """
+
+    def __init__(self, hashtag, num_of_tweets):
+
+        """Initializing PrefetchJob Class"""
+        self.hashtag = hashtag
+        self.plan = PagePlan(num_of_tweets)
+        self.tweets = TweetBuffer()
+        self.started = time.time()
+        self.cancelled = threading.Event()
+        self.error = None
+        self.future = None
+
+
+class Prefetcher:
+
+    """
+    Background prefetcher of the hashtags's first pages while the hashtag list is built.
+
+    Each hashtag which enters the list starts a job which fetches its first pages in a thread pool. A removed or
+    edited hashtag cancels its job. When the session starts it takes the jobs & continues their pagination plans, so
+    only the missing pages are searched. A prefetch never waits for the rate limit window - it just stops.
+
+    Attributes:
+        search_client (SearchClient): The client which performs the searches.
+        num_of_tweets (int): Number of tweets prefetched for each hashtag.
+        max_age (float): Seconds a prefetch stays usable.
+        jobs (dict): Hashtag -> its PrefetchJob.
+
+    Methods:
+        __init__(self, search_client, num_of_tweets=settings.PREFETCH_TWEETS, max_age=settings.PREFETCH_MAX_AGE,
+                 workers=settings.POOL_SIZE): Class's constructor.
+        sync(self, tag_list): Starts the jobs of the new hashtags & cancels the jobs of the removed ones.
+        cancel(self, hashtag): Cancels the job of a hashtag.
+        take(self, hashtag, num_of_tweets): Takes the prefetched tweets & pagination plan of a hashtag.
+        close(self): Cancels all the jobs & shuts the thread pool down.
+    """
+
+    def __init__(self, search_client, num_of_tweets=settings.PREFETCH_TWEETS, max_age=settings.PREFETCH_MAX_AGE,
+                 workers=settings.POOL_SIZE):
+
+        """Initializing Prefetcher Class"""
+        self.search_client = search_client
+        self.num_of_tweets = num_of_tweets
+        self.max_age = max_age
+        self.jobs = dict()
+        self.__executor = ThreadPoolExecutor(max_workers=workers)
+        self.__lock = threading.Lock()
+
+    def __fetch(self, job):
+
+        # Fetch the pages until the plan is done, the job is cancelled or the rate limit window is over
+        try:
+            while not job.plan.done and not job.cancelled.is_set():
+                if self.search_client.wait_time(SEARCH_PATH) > 0:
+                    break
+
+                job.tweets.extend(job.plan.feed(self.search_client.search(job.hashtag, **SEARCH_PARAMS,
+                                                                          **job.plan.params())))
+        except TweepError as error:
+            job.error = error
+
+    def sync(self, tag_list):
+
+        """
+        Starts the jobs of the hashtags which entered the list & cancels the jobs of the hashtags which left it.
+
+        Args:
+            tag_list (dict): Hashtags list itself.
+
+        Returns:
+            None
+        """
+
+        with self.__lock:
+            for hashtag in [hashtag for hashtag in self.jobs if hashtag not in tag_list]:
+                self.__cancel(hashtag)
+
+            for hashtag in tag_list:
+                if hashtag not in self.jobs:
+                    job = PrefetchJob(hashtag, self.num_of_tweets)
+                    job.future = self.__executor.submit(self.__fetch, job)
+                    self.jobs[hashtag] = job
+
+    def __cancel(self, hashtag):
+
+        job = self.jobs.pop(hashtag, None)
+
+        if job is not None:
+            job.cancelled.set()
+            job.future.cancel()
+
+    def cancel(self, hashtag):
+
+        """Cancels the job of a hashtag."""
+
+        with self.__lock:
+            self.__cancel(hashtag)
+
+    def take(self, hashtag, num_of_tweets):
+
+        """
+        Takes the prefetched tweets & pagination plan of a hashtag, waiting for its job when it is still running.
+
+        Args:
+            hashtag (str): The hashtag.
+            num_of_tweets (int): The session's number of tweets.
+
+        Returns:
+            (tweets, plan): The prefetched TweetBuffer (trimmed to num_of_tweets) & the PagePlan to continue, or
+                            None when there is no usable prefetch (the hashtag should be searched from scratch).
+        """
+
+        with self.__lock:
+            job = self.jobs.pop(hashtag, None)
+
+        if job is None or time.time() - job.started > self.max_age:
+            return None
+
+        job.future.result()
+
+        if job.error is not None:
+            return None
+
+        if len(job.tweets) > num_of_tweets:
+            job.tweets = TweetBuffer.from_columns({name: column[:num_of_tweets]
+                                                   for name, column in job.tweets.columns().items()})
+
+        job.plan.retarget(num_of_tweets, len(job.tweets))
+
+        return job.tweets, job.plan
+
+    def close(self):
+
+        """Cancels all the jobs & shuts the thread pool down."""
+
+        with self.__lock:
+            for hashtag in list(self.jobs):
+                self.__cancel(hashtag)
+
+        self.__executor.shutdown(wait=False)
@@ -0,0 +1,115 @@
+import threading
+import time
+
+# Length of Twitter's rate limit window in seconds
+WINDOW = 15 * 60
+
+
+class RateLimiter:
+
+    """
+    Thread safe tracker of a single endpoint's rate limit window.
+
+    A request takes one call from the window's budget and waits for the next window when the budget is over. The
+    budget & the window's reset time are corrected by the 'x-rate-limit-*' headers of every response.
+
+    Attributes:
+        limit (int): Calls per window.
+        remaining (int): Calls left in the current window.
+        reset (float): Epoch time of the current window's end.
+
+    Methods:
+        __init__(self, limit, window=WINDOW): Class's constructor.
+        acquire(self, block=True): Takes a call from the budget, waiting for the next window when needed.
+        update(self, headers): Corrects the budget by the response's rate limit headers.
+        exhaust(self): Empties the budget of the current window (e.g. after a 429 response).
+        wait_time(self): Seconds until a call is available.
+    """
+
+    def __init__(self, limit, window=WINDOW):
+
+        """Initializing RateLimiter Class"""
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset = time.time() + window
+        self.__lock = threading.Lock()
+
+    def __renew(self, now):
+
+        # A new window starts with the whole budget
+        if now >= self.reset:
+            self.remaining = self.limit
+            self.reset = now + self.window
+
+    def wait_time(self):
+
+        """
+        Seconds until a call is available.
+
+        Returns:
+            0 when there is budget left, otherwise the seconds until the window's reset.
+        """
+
+        with self.__lock:
+            now = time.time()
+            self.__renew(now)
+
+            return 0 if self.remaining > 0 else self.reset - now
+
+    def acquire(self, block=True):
+
+        """
+        Takes a call from the budget.
+
+        Args:
+            block (bool): Wait for the next window when the budget is over.
+
+        Returns:
+            True when a call was taken (always when blocking).
+        """
+
+        while True:
+            with self.__lock:
+                now = time.time()
+                self.__renew(now)
+
+                if self.remaining > 0:
+                    self.remaining -= 1
+                    return True
+
+                wait = self.reset - now
+
+            if not block:
+                return False
+
+            print("Rate limit reached, waiting {:.0f} seconds".format(wait))
+            time.sleep(wait)
+
+    def update(self, headers):
+
+        """
+        Corrects the budget by the response's rate limit headers.
+
+        Args:
+            headers (dict): The response's headers.
+
+        Returns:
+            None
+        """
+
+        remaining = headers.get('x-rate-limit-remaining')
+        reset = headers.get('x-rate-limit-reset')
+
+        with self.__lock:
+            if remaining is not None:
+                self.remaining = min(self.remaining, int(remaining))
+            if reset is not None:
+                self.reset = float(reset)
+
+    def exhaust(self):
+
+        """Empties the budget of the current window (e.g. after a 429 response)."""
+
+        with self.__lock:
+            self.remaining = 0
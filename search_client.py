@@ -0,0 +1,544 @@
+import json
+import math
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from tweepy import (TweepError, RateLimitError)
+
+from rate_limit import (WINDOW, RateLimiter)
+from tweet_buffer import TweetBuffer
+import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+API_ROOT = "https://api.twitter.com/1.1"
+SEARCH_PATH = "/search/tweets.json"
+LOOKUP_PATH = "/statuses/lookup.json"
+USERS_LOOKUP_PATH = "/users/lookup.json"
+
+# Maximum ids of a single statuses/lookup or users/lookup call
+LOOKUP_SIZE = 100
+
+# Search parameters shared by every fetch backend
+SEARCH_PARAMS = {'result_type': 'mixed', 'tweet_mode': 'extended', 'include_entities': 'true', 'lang': 'en'}
+
+# Maximum 'count' of a single search page
+MAX_COUNT = 100
+
+# Transient error responses which are retried
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def pack_queries(tag_list, limit=settings.QUERY_LENGTH_LIMIT):
+
+    """
+    Packs the hashtags into '#a OR #b OR ...' queries up to the query length limit.
+
+    Args:
+        tag_list (iterable): The hashtags.
+        limit (int): Maximum length of a single query.
+
+    Returns:
+        packs (list): Lists of hashtags - each list is searched as a single query.
+    """
+
+    packs = list()
+    length = 0
+
+    for tag in tag_list:
+        if packs and length + len(' OR ') + len(tag) <= limit:
+            packs[-1].append(tag)
+            length += len(' OR ') + len(tag)
+        else:
+            packs.append([tag])
+            length = len(tag)
+
+    return packs
+
+
+def backoff(attempt, base=settings.RETRY_BACKOFF, cap=settings.RETRY_BACKOFF_CAP):
+
+    """
+    Jittered exponential backoff - a random delay up to base * 2^attempt (capped), so retries of concurrent requests
+    don't hit the endpoint together.
+
+    Args:
+        attempt (int): Number of the failed attempt (0 for the first).
+        base (float): Delay's base in seconds.
+        cap (float): Maximum delay in seconds.
+
+    Returns:
+        Seconds to wait before the next attempt.
+    """
+
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def fail_tags(results, tags, error, policy=settings.TAG_FAILURE):
+
+    """
+    Applies the failure policy to the hashtags of a search which failed after its retries.
+
+    Args:
+        results (dict): Hashtag -> TweetBuffer of its tweets.
+        tags (list): The hashtags of the failed search.
+        error (Exception): The search's error.
+        policy (str): 'partial' keeps the tweets fetched so far, 'skip' drops them.
+
+    Returns:
+        None
+    """
+
+    for tag in tags:
+        if policy == 'skip':
+            results[tag] = TweetBuffer()
+
+        results[tag].failure = str(error)
+
+    print("Search of {} failed ({}): {}".format(' OR '.join(tags), policy, error))
+
+
+def loads(content):
+
+    """
+    Decode a json response body, with orjson when it is installed.
+
+    Args:
+        content (bytes): The raw response body.
+
+    Returns:
+        The decoded json object.
+    """
+
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class PagePlan:
+
+    """
+    Count-aware pagination plan of a single search query.
+
+    Every page asks for the maximum count that is still needed, so num_of_tweets are collected in
+    ceil(num_of_tweets / max_count) requests at best. The plan stops as soon as a page comes back short or without
+    'next_results', drops duplicate tweets and counts the wasted requests (requests which added no new tweet).
+
+    Attributes:
+        remaining (int): Number of tweets which are still needed.
+        pages_needed (int): Minimum number of requests for num_of_tweets.
+        requests (int): Number of requests made so far.
+        wasted (int): Number of requests which added no new tweet.
+        done (bool): True when the pagination is over.
+        exhausted (bool): True when the search results are over.
+        max_id (int): max_id of the next page.
+
+    Methods:
+        __init__(self, num_of_tweets, max_count=MAX_COUNT): Class's constructor.
+        params(self): Page parameters (count & max_id) of the next request.
+        feed(self, page): Consumes a decoded page and returns its new statuses.
+        retarget(self, num_of_tweets, collected): Changes the plan's total, e.g. to continue a prefetched search.
+        summary(self, q): A line which summarises the requests of the query.
+    """
+
+    def __init__(self, num_of_tweets, max_count=MAX_COUNT):
+
+        """Initializing PagePlan Class"""
+        self.remaining = num_of_tweets
+        self.max_count = max_count
+        self.pages_needed = math.ceil(num_of_tweets / max_count)
+        self.requests = 0
+        self.wasted = 0
+        self.done = num_of_tweets <= 0
+        self.exhausted = False
+        self.max_id = None
+        self.__count = 0
+        self.__seen = set()
+
+    def params(self):
+
+        """
+        Page parameters of the next request.
+
+        Returns:
+            params (dict): 'count' & 'max_id' (once known) of the next page.
+        """
+
+        self.__count = min(self.max_count, self.remaining)
+        params = {'count': self.__count}
+
+        if self.max_id is not None:
+            params['max_id'] = self.max_id
+
+        return params
+
+    def feed(self, page):
+
+        """
+        Consumes a decoded search page.
+
+        Args:
+            page (dict): The decoded page with 'statuses' & 'search_metadata'.
+
+        Returns:
+            statuses (list): The page's new statuses, trimmed to the remaining tweets.
+        """
+
+        self.requests += 1
+        statuses = page['statuses']
+
+        new = [status for status in statuses if status['id'] not in self.__seen]
+        trimmed = len(new) > self.remaining
+        new = new[:max(self.remaining, 0)]
+        self.__seen.update(status['id'] for status in new)
+        self.remaining -= len(new)
+
+        if not new:
+            self.wasted += 1
+
+        if trimmed:
+            # The next page starts right below the oldest kept tweet - a retargeted plan (e.g. a packed query which
+            # still misses tweets) gets the trimmed ones again
+            self.max_id = min(status['id'] for status in new) - 1 if new else self.max_id
+        elif statuses:
+            # The next page starts right below the oldest tweet of this page
+            self.max_id = min(status['id'] for status in statuses) - 1
+
+        if not trimmed and (len(statuses) < self.__count or 'next_results' not in page.get('search_metadata', {})):
+            self.exhausted = True
+
+        self.done = self.exhausted or self.remaining <= 0
+
+        return new
+
+    def retarget(self, num_of_tweets, collected):
+
+        """
+        Changes the plan's total, e.g. to continue a prefetched search up to the session's number of tweets.
+
+        Args:
+            num_of_tweets (int): The new total number of tweets.
+            collected (int): Number of tweets which are already used.
+
+        Returns:
+            None
+        """
+
+        self.remaining = num_of_tweets - collected
+        self.pages_needed = math.ceil(num_of_tweets / self.max_count)
+        self.done = self.exhausted or self.remaining <= 0
+
+    def summary(self, q):
+
+        """A line which summarises the requests of the query."""
+
+        return "{}: {} requests ({} needed, {} wasted) for {} tweets".format(
+            q, self.requests, self.pages_needed, self.wasted, len(self.__seen))
+
+
+class SearchClient:
+
+    """
+    Thin HTTP client for the search endpoint which skips tweepy's model parsing.
+
+    The pages are returned as plain decoded json so they can be copied straight into a TweetBuffer.
+    A single client is meant to be shared by all the searches & sessions - its session keeps a pool of keep-alive
+    connections, so the TLS handshakes & connection setup are paid only once per pooled connection.
+
+    Attributes:
+        auth (OAuthHandler): Twitter credentials for authentication.
+        api_root (str): Base url of the api.
+        session (Session): Long-lived requests session with a pool of keep-alive connections.
+        limits (dict): Endpoint's path -> its RateLimiter (the rate limit scheduler of the client's requests).
+        retries (int): Retries of a request which failed with a connection error, a timeout or a 5xx response.
+        timeout (tuple): Connect & read timeouts of a request.
+        retry_backoff (float): Base in seconds of the backoff between the retries.
+        rate_window (float): Length in seconds of the rate limit window.
+        __oauth (OAuth1): Request signer built once from auth.
+
+    Methods:
+        __init__(self, auth, api_root=API_ROOT, pool_size=settings.POOL_SIZE, gzip=settings.GZIP,
+                 rate_limits=settings.RATE_LIMITS, retries=settings.RETRIES, timeout=settings.REQUEST_TIMEOUT,
+                 retry_backoff=settings.RETRY_BACKOFF, rate_window=WINDOW): Class's constructor.
+        close(self): Closes the pooled connections.
+        acquire(self, path): Takes a call of the endpoint's rate limit & picks the credentials which sign it.
+        wait_time(self, path): Seconds until the endpoint has a call available.
+        request(self, method, path, params): Performs a signed request within the endpoint's rate limit, retrying
+                                             the transient failures.
+        get(self, path, **params): Performs a signed GET request and decodes its json body.
+        post(self, path, **params): Performs a signed POST request and decodes its json body.
+        lookup(self, ids, **params): Requests up to 100 tweets by their ids.
+        lookup_users(self, user_ids): Requests the profiles of users by their ids, 100 users per call.
+        search(self, q, **params): Requests a single page of the search endpoint.
+        pages(self, q, num_of_tweets, plan=None, **params): Generator of search pages until num_of_tweets were returned.
+        packed_search(self, tags, num_of_tweets, **params): Searches several hashtags with a single OR query.
+    """
+
+    def __init__(self, auth, api_root=API_ROOT, pool_size=settings.POOL_SIZE, gzip=settings.GZIP,
+                 rate_limits=settings.RATE_LIMITS, retries=settings.RETRIES, timeout=settings.REQUEST_TIMEOUT,
+                 retry_backoff=settings.RETRY_BACKOFF, rate_window=WINDOW):
+
+        """Initializing SearchClient Class"""
+        self.auth = auth
+        self.api_root = api_root
+        self.retries = retries
+        self.timeout = timeout
+        self.retry_backoff = retry_backoff
+        self.rate_window = rate_window
+        self.__oauth = auth.apply_auth()
+
+        # Keep-alive connection pool sized to the search concurrency
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+        self.session.headers['Accept-Encoding'] = 'gzip' if gzip else 'identity'
+
+        self.limits = {path: RateLimiter(limit, rate_window) for path, limit in rate_limits.items()}
+
+    def close(self):
+
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def acquire(self, path):
+
+        """
+        Takes a call of the endpoint's rate limit (waiting for its next window when needed) and picks the credentials
+        which sign it.
+
+        Args:
+            path (str): Endpoint's path.
+
+        Returns:
+            (oauth, limiter): The request's signer & the RateLimiter the call was taken from (None when the endpoint
+                              isn't limited).
+        """
+
+        limiter = self.limits.get(path)
+        if limiter is not None:
+            limiter.acquire()
+
+        return self.__oauth, limiter
+
+    def wait_time(self, path):
+
+        """Seconds until the endpoint has a call available (0 when it isn't limited)."""
+
+        limiter = self.limits.get(path)
+
+        return 0 if limiter is None else limiter.wait_time()
+
+    def request(self, method, path, params):
+
+        """
+        Performs a signed request within the endpoint's rate limit and decodes its json body.
+
+        Connection errors, timeouts, 5xx responses & undecodable bodies are retried after a jittered exponential
+        backoff - the last error is raised when the retries are over.
+
+        Args:
+            method (str): 'GET' or 'POST'.
+            path (str): Endpoint's path, e.g. '/search/tweets.json'.
+            params (dict): Query (GET) or form (POST) parameters.
+
+        Returns:
+            The decoded json body.
+        """
+
+        for attempt in range(self.retries + 1):
+            oauth, limiter = self.acquire(path)
+
+            try:
+                if method == 'GET':
+                    resp = self.session.get(self.api_root + path, params=params, auth=oauth, timeout=self.timeout)
+                else:
+                    resp = self.session.post(self.api_root + path, data=params, auth=oauth, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = TweepError('Failed to send request: {0}'.format(e))
+
+            else:
+                if limiter is not None:
+                    limiter.update(resp.headers)
+
+                if resp.status_code == 429:
+                    if limiter is not None:
+                        limiter.exhaust()
+
+                    # Another key of a credential pool may still have budget
+                    if limiter is None or self.wait_time(path) > 0:
+                        raise RateLimitError(resp.text, resp)
+
+                    error = RateLimitError(resp.text, resp)
+                    continue
+
+                elif resp.status_code in RETRY_STATUSES:
+                    error = TweepError('Twitter error response: status code = {0}'.format(resp.status_code), resp)
+                elif resp.status_code != 200:
+                    raise TweepError('Twitter error response: status code = {0}'.format(resp.status_code), resp)
+                else:
+                    try:
+                        return loads(resp.content)
+                    except ValueError as e:
+                        error = TweepError('Failed to decode response: {0}'.format(e), resp)
+
+            if attempt < self.retries:
+                delay = backoff(attempt, self.retry_backoff)
+                print("{} (attempt {} of {}), retrying in {:.1f} seconds".format(error, attempt + 1,
+                                                                               self.retries + 1, delay))
+                time.sleep(delay)
+
+        raise error
+
+    def get(self, path, **params):
+
+        """
+        Performs a signed GET request and decodes its json body.
+
+        Args:
+            path (str): Endpoint's path, e.g. '/search/tweets.json'.
+            params (dict): Query parameters.
+
+        Returns:
+            The decoded json body.
+        """
+
+        return self.request('GET', path, params)
+
+    def post(self, path, **params):
+
+        """
+        Performs a signed POST request and decodes its json body.
+
+        Args:
+            path (str): Endpoint's path, e.g. '/statuses/lookup.json'.
+            params (dict): Form parameters.
+
+        Returns:
+            The decoded json body.
+        """
+
+        return self.request('POST', path, params)
+
+    def lookup(self, ids, **params):
+
+        """
+        Requests up to 100 tweets by their ids - deleted & protected tweets are left out.
+
+        Args:
+            ids (list): Up to LOOKUP_SIZE tweet ids.
+            params (dict): Extra parameters (tweet_mode, include_entities...).
+
+        Returns:
+            statuses (list): The decoded tweets.
+        """
+
+        return self.post(LOOKUP_PATH, id=','.join(str(tweet_id) for tweet_id in ids), **params)
+
+    def lookup_users(self, user_ids):
+
+        """
+        Requests the profiles of users by their ids, LOOKUP_SIZE users per call - suspended users are left out.
+
+        Args:
+            user_ids (list): User ids.
+
+        Returns:
+            users (list): The decoded user objects.
+        """
+
+        users = list()
+        for i in range(0, len(user_ids), LOOKUP_SIZE):
+            users.extend(self.post(USERS_LOOKUP_PATH, include_entities='false',
+                                   user_id=','.join(str(user_id) for user_id in user_ids[i:i + LOOKUP_SIZE])))
+
+        return users
+
+    def search(self, q, **params):
+
+        """
+        Requests a single page of the search endpoint.
+
+        Args:
+            q (str): The search query (hashtag).
+            params (dict): Extra search parameters (count, max_id, lang...).
+
+        Returns:
+            page (dict): The decoded page with 'statuses' & 'search_metadata'.
+        """
+
+        return self.get(SEARCH_PATH, q=q, **params)
+
+    def pages(self, q, num_of_tweets, plan=None, **params):
+
+        """
+        Pages backwards through the search results of a query with a count-aware PagePlan.
+
+        Args:
+            q (str): The search query (hashtag).
+            num_of_tweets (int): Number of tweets to be pulled out.
+            plan (PagePlan): Continue this plan (e.g. of a prefetched search) instead of starting a new one.
+            params (dict): Extra search parameters.
+
+        Returns:
+            Generator of status lists (each list is a decoded page, trimmed to num_of_tweets in total).
+        """
+
+        plan = plan or PagePlan(num_of_tweets)
+
+        while not plan.done:
+            statuses = plan.feed(self.search(q, **params, **plan.params()))
+
+            if statuses:
+                yield statuses
+
+        print(plan.summary(q))
+
+    def packed_search(self, tags, num_of_tweets, **params):
+
+        """
+        Searches several hashtags with a single '#a OR #b OR ...' query and routes each tweet back to every searched
+        hashtag in its entities, until each hashtag has num_of_tweets or the results are over.
+
+        Each hashtag is counted on its own: a hashtag which has its tweets leaves the query, and the next pages (below
+        the same max_id) only bring the tweets of the other hashtags. So a busy hashtag neither takes the sparse
+        hashtags's share nor costs pages once it's full, and each hashtag gets the same tweets as its own search.
+
+        Args:
+            tags (list): The hashtags of the query (see pack_queries).
+            num_of_tweets (int): Number of tweets to be pulled out for each hashtag.
+            params (dict): Extra search parameters.
+
+        Returns:
+            routed (dict): Hashtag -> list of its statuses.
+        """
+
+        routed = {tag: list() for tag in tags}
+
+        # Hashtag without '#' (lowercase, like the entities) -> its list
+        lists = {tag[1:].lower(): routed[tag] for tag in tags}
+
+        plan = PagePlan(num_of_tweets * len(tags))
+        searched = list(tags)
+
+        while searched and not plan.exhausted:
+            for status in plan.feed(self.search(' OR '.join(searched), **params, **plan.params())):
+                for hashtag in {hashtag['text'].lower() for hashtag in status['entities']['hashtags']}:
+                    statuses = lists.get(hashtag)
+
+                    if statuses is not None and len(statuses) < num_of_tweets:
+                        statuses.append(status)
+
+            # The full hashtags leave the query - the plan asks only for the other hashtags's missing tweets
+            searched = [tag for tag in searched if len(routed[tag]) < num_of_tweets]
+            plan.retarget(sum(num_of_tweets - len(routed[tag]) for tag in searched), 0)
+
+        print(plan.summary(' OR '.join(tags)))
+
+        return routed
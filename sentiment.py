@@ -0,0 +1,131 @@
+import os
+
+import numpy as np
+
+import settings
+
+# The bundled lexicon - a word & its valence (-4 to +4) per line
+LEXICON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sentiment_lexicon.txt')
+
+# Tokens which flip the valence of the next NEGATION_WINDOW tokens (without punctuation, as the tweets are tokenized)
+NEGATIONS = {'not', 'no', 'never', 'nothing', 'nobody', 'none', 'neither', 'nor', 'nowhere', 'without', 'aint',
+             'cant', 'cannot', 'dont', 'doesnt', 'didnt', 'isnt', 'arent', 'wasnt', 'werent', 'wont', 'wouldnt',
+             'shouldnt', 'couldnt', 'hasnt', 'havent', 'hadnt'}
+NEGATION_WINDOW = 3
+NEGATION_SCALAR = -0.74
+
+# Normalization of a tweet's valence into the compound score - valence / sqrt(valence ^ 2 + NORMALIZATION_ALPHA)
+NORMALIZATION_ALPHA = 15
+
+
+def load_lexicon(path=LEXICON_FILE):
+
+    """
+    Loads a sentiment lexicon.
+
+    Args:
+        path (str): The lexicon file - a word & its valence separated by a tab per line ('#' lines are comments).
+
+    Returns:
+        lexicon (dict): Word -> its valence.
+    """
+
+    lexicon = dict()
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip() and not line.startswith('#'):
+                word, valence = line.split('\t')[:2]
+                lexicon[word] = float(valence)
+
+    return lexicon
+
+
+class SentimentScorer:
+
+    """
+    Lexicon based (VADER-style) sentiment of integer encoded tweets, scored in batches with numpy.
+
+    The valence of every id of the vocabulary is looked up once, as the vocabulary grows, so scoring a batch is
+    array indexing: each token's valence is flipped & damped (x NEGATION_SCALAR) when one of the NEGATION_WINDOW
+    tokens before it in its tweet is a negation, the valences are summed per tweet with a single bincount (a segment
+    sum), and each sum is normalized into a compound score in [-1, 1].
+
+    Attributes:
+        lexicon (dict): Word -> its valence.
+        valence (ndarray): The valence of each id of the vocabulary (0 for the words which aren't in the lexicon).
+        negation (ndarray): Boolean array of the ids of the negations.
+
+    Methods:
+        __init__(self, lexicon=None): Class's constructor - loads the bundled lexicon when None.
+        score(self, vocabulary, ids, tweets, count): The compound score of each tweet.
+        distribution(scores, bins): The number of tweets in each score range.
+    """
+
+    def __init__(self, lexicon=None):
+
+        """Initializing SentimentScorer Class"""
+        self.lexicon = lexicon if lexicon is not None else load_lexicon()
+        self.valence = np.zeros(0, dtype=np.float64)
+        self.negation = np.zeros(0, dtype=bool)
+
+    def __grow(self, vocabulary):
+
+        # Looks up the ids added to the vocabulary since the last batch
+        new_words = vocabulary.words[len(self.valence):]
+        if not new_words:
+            return
+
+        self.valence = np.concatenate((self.valence, np.array([self.lexicon.get(word, 0.0) for word in new_words])))
+        self.negation = np.concatenate((self.negation, np.array([word in NEGATIONS for word in new_words],
+                                                                dtype=bool)))
+
+    def score(self, vocabulary, ids, tweets, count):
+
+        """
+        The compound score of each tweet - below 0 is negative, above 0 is positive.
+
+        Args:
+            vocabulary (Vocabulary): The vocabulary which encoded the tweets.
+            ids (ndarray): The tokens's ids (see Vocabulary.encode_tweets).
+            tweets (ndarray): The tweet's number of each token (non decreasing).
+            count (int): Number of tweets (the tweets without tokens score 0).
+
+        Returns:
+            scores (ndarray): The compound score of each tweet, in [-1, 1].
+        """
+
+        self.__grow(vocabulary)
+
+        valence = self.valence[ids]
+        negation = self.negation[ids]
+
+        # A token is negated when a negation precedes it within the window & the same tweet
+        negated = np.zeros(len(ids), dtype=bool)
+        for k in range(1, NEGATION_WINDOW + 1):
+            negated[k:] |= negation[:-k] & (tweets[k:] == tweets[:-k])
+        valence[negated] *= NEGATION_SCALAR
+
+        sums = np.bincount(tweets, weights=valence, minlength=count)
+
+        return sums / np.sqrt(sums * sums + NORMALIZATION_ALPHA)
+
+    @staticmethod
+    def distribution(scores, bins=settings.SENTIMENT_BINS):
+
+        """
+        The number of tweets in each score range.
+
+        Args:
+            scores (ndarray): Compound scores (see score).
+            bins (int): Number of equal ranges between -1 and 1.
+
+        Returns:
+            (labels, counts): Each range's label (e.g. '-1.0 to -0.8') & its number of tweets.
+        """
+
+        counts, edges = np.histogram(scores, bins=bins, range=(-1, 1))
+        edges = np.round(edges, 1) + 0.0
+        labels = ['{:.1f} to {:.1f}'.format(low, high) for low, high in zip(edges[:-1].tolist(), edges[1:].tolist())]
+
+        return labels, counts
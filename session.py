@@ -0,0 +1,104 @@
+import time
+from datetime import datetime
+
+from budget import BudgetPlanner
+from search_client import (SEARCH_PARAMS, fail_tags, pack_queries)
+from tweet_buffer import TweetBuffer
+import settings
+
+
+def search_tags(search_client, tags, num_of_tweets, search_hashtag=None, policy=settings.TAG_FAILURE):
+
+    """
+    Search a single hashtag, or a pack of hashtags with one OR query, applying the failure policy when the search
+    fails - only this search fails, the session's other hashtags are still searched & exported.
+
+    Args:
+        search_client (SearchClient): The client which performs the searches.
+        tags (list): The hashtags of the search.
+        num_of_tweets (int): Number of tweets of each hashtag.
+        search_hashtag (function): search_hashtag(hashtag, results) searches a single hashtag into results[hashtag] -
+                                   the search client's raw pages when None.
+        policy (str): The failure policy (see search_client.fail_tags).
+
+    Returns:
+        results (dict): Hashtag -> TweetBuffer of its tweets.
+    """
+
+    results = {hashtag: TweetBuffer() for hashtag in tags}
+
+    try:
+        if len(tags) > 1:
+            for hashtag, statuses in search_client.packed_search(tags, num_of_tweets, **SEARCH_PARAMS).items():
+                results[hashtag].extend(statuses)
+
+        elif search_hashtag is not None:
+            search_hashtag(tags[0], results)
+
+        else:
+            for page in search_client.pages(tags[0], num_of_tweets, **SEARCH_PARAMS):
+                results[tags[0]].extend(page)
+
+    except Exception as error:
+        fail_tags(results, tags, error, policy)
+
+    return results
+
+
+def search_session(search_client, tag_list, num_of_tweets, results, search_hashtag=None, progress=None,
+                   packing=False, budget=None, policy=settings.TAG_FAILURE):
+
+    """
+    Searches the hashtags of a session into results, one search after the other. Each search fails on its own (see
+    search_tags), so the hashtags which were searched are always in results - even when the session itself stops.
+
+    Args:
+        search_client (SearchClient): The client which performs the searches.
+        tag_list (dict): Hashtags list itself.
+        num_of_tweets (int): Number of tweets of each hashtag.
+        results (dict): Hashtag -> TweetBuffer of its tweets, filled as the searches are done.
+        search_hashtag (function): Searches a single hashtag (see search_tags).
+        progress (function): Called after each search with the done fraction of the session.
+        packing (bool): Packs sparse hashtags into OR queries (see search_client.pack_queries).
+        budget (str): Spreads a total budget of 'tweets' or 'requests' over the hashtags (see BudgetPlanner) - None
+                      searches num_of_tweets for each hashtag.
+        policy (str): The failure policy (see search_client.fail_tags).
+
+    Parameters:
+        searches (list): The hashtags of each search.
+        planner (BudgetPlanner): Spreads the budget over the hashtags.
+
+    Returns:
+        tweet_matrix (list): The TweetBuffer of each hashtag (same order as tag_list).
+    """
+
+    searches = pack_queries(tag_list) if packing else [[hashtag] for hashtag in tag_list]
+
+    if budget is not None:
+        # A total budget spread over the hashtags by their volume
+        total = settings.REQUEST_BUDGET if budget == 'requests' else num_of_tweets * len(tag_list)
+        planner = BudgetPlanner(search_client, tag_list, total, budget)
+        searches = list()
+
+        try:
+            results.update(planner.run(progress))
+        except Exception as error:
+            # Keeps what the planner fetched - the hashtags which weren't done fail
+            results.update({hashtag: tag.tweets for hashtag, tag in planner.tags.items()})
+            fail_tags(results, [hashtag for hashtag, tag in planner.tags.items() if tag.active], error, policy)
+
+    for search_item, tags in enumerate(searches, 1):
+
+        # Starting time
+        start = time.time()
+        clock = datetime.now().strftime("%H:%M:%S")
+
+        # Capture the hashtags's tweets
+        results.update(search_tags(search_client, tags, num_of_tweets, search_hashtag, policy))
+
+        if progress is not None:
+            progress(search_item / len(searches))
+
+        print("Search #{} took {} from {}".format(search_item, time.time() - start, clock))
+
+    return [results[hashtag] for hashtag in tag_list]
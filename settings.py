@@ -0,0 +1,172 @@
+"""
+Variables that configure the search & analysis behaviour of the application
+"""
+
+# Search fetch mode:
+#   'raw'    - requests the search endpoint directly and decodes the json pages straight into TweetBuffer columns.
+#   'cursor' - tweepy's Cursor(...).items() path which builds a Status/User model for every tweet.
+FETCH_MODE = "raw"
+
+# Size of the keep-alive connection pool shared by all the searches - match it to the search concurrency.
+POOL_SIZE = 4
+
+# Ask for gzip compressed responses.
+GZIP = True
+
+# Search backend of the UI:
+#   'qthread' - a ThreadsClass worker on a QThread doing blocking calls.
+#   'asyncio' - AsyncSearchEngine on a qasync event loop which paginates all the hashtags concurrently.
+SEARCH_BACKEND = "qthread"
+
+# Maximum concurrent requests of the asyncio backend.
+ASYNC_CONCURRENCY = 8
+
+# Maximum pages waiting to be decoded in each hashtag's queue (backpressure on the pagination).
+ASYNC_PAGE_QUEUE = 2
+
+# Collection mode:
+#   'search' - searches the recent tweets of each hashtag.
+#   'stream' - collects real-time tweets of the hashtags from the filter stream.
+COLLECTION_MODE = "search"
+
+# Maximum seconds of a streaming collection (the Stop button ends it earlier).
+STREAM_SECONDS = 300
+
+# Maximum raw stream messages waiting to be analyzed - more are dropped.
+STREAM_QUEUE_SIZE = 10000
+
+# The streamed tweets are written to disk every STREAM_BATCH_SIZE tweets or every STREAM_BATCH_SECONDS seconds.
+STREAM_BATCH_SIZE = 500
+STREAM_BATCH_SECONDS = 5
+
+# Pack several hashtags into a single '#a OR #b OR ...' search query ('raw' fetch mode) - saves most of the
+# requests of sparse hashtags. The results are routed back to each hashtag by the tweet's entities.
+QUERY_PACKING = False
+
+# Maximum length of a search query.
+QUERY_LENGTH_LIMIT = 500
+
+# SQLite data base which every session appends its tweets to.
+DATABASE_FILE = "tweets.db"
+
+# Save each session's tweets as an Arrow snapshot ('tweets_<date>.arrow') which can be re-analyzed without the API.
+SNAPSHOTS = True
+
+# Calls per 15 minutes window of each endpoint (user auth) - the client waits for the next window when it runs out.
+RATE_LIMITS = {
+    "/search/tweets.json": 180,
+    "/statuses/lookup.json": 900,
+    "/users/lookup.json": 900,
+}
+
+# Concurrent statuses/lookup batches of the hydration (refreshing likes & retweets of stored tweets).
+HYDRATE_WORKERS = 4
+
+# Seconds a cached user profile stays fresh - expired profiles are refreshed in bulk through users/lookup.
+USER_CACHE_TTL = 24 * 60 * 60
+
+# Maximum cached user profiles - the least recently used profiles are evicted beyond it (keep it above the distinct
+# users of a session, whose profiles are read back when it's exported).
+USER_CACHE_SIZE = 500000
+
+# Speculatively fetch the first pages of each hashtag while the list is built (raw fetch mode, QThread search backend)
+# - the session continues from the prefetched pages.
+PREFETCH = True
+
+# Number of tweets prefetched for each hashtag (two full pages).
+PREFETCH_TWEETS = 200
+
+# Seconds a prefetched hashtag stays usable - older prefetches are searched again.
+PREFETCH_MAX_AGE = 10 * 60
+
+# Warm up the auth, the clients & the analyzer on a background thread once the window is shown.
+WARM_UP = True
+
+# Modules imported by the warm-up ahead of the first export (pandas loads xlsxwriter only when writing excel).
+WARM_UP_MODULES = ('xlsxwriter',)
+
+# Verify the credentials during the warm-up - it also opens the search client's first keep-alive connection.
+VERIFY_CREDENTIALS = False
+
+# Retries of a failed request (connection errors, timeouts & 5xx responses) before its hashtag fails.
+RETRIES = 4
+
+# Base & cap in seconds of the jittered exponential backoff between the retries.
+RETRY_BACKOFF = 1.0
+RETRY_BACKOFF_CAP = 30
+
+# Connect & read timeouts in seconds of a single request.
+REQUEST_TIMEOUT = (5, 30)
+
+# A hashtag whose search failed after the retries - 'partial' exports the tweets fetched so far, 'skip' none.
+# The other hashtags are exported either way.
+TAG_FAILURE = 'partial'
+
+# Json file of several API key sets (a list of objects named like twitter_credentials) - the searches are spread over
+# the keys, each with its own rate limits. Without it, twitter_credentials is used.
+CREDENTIALS_FILE = "credentials.json"
+
+# Backfill a hashtag of at least BACKFILL_MIN_TWEETS tweets over disjoint id ranges searched concurrently (raw fetch
+# mode) - the result is still the newest tweets of the hashtag.
+BACKFILL = True
+BACKFILL_MIN_TWEETS = 2000
+
+# Concurrent id ranges of a backfill (keep it <= POOL_SIZE) & the ranges per worker the window is split into.
+BACKFILL_WORKERS = POOL_SIZE
+BACKFILL_PARTITIONS = 4
+
+# Days the search window goes back (the standard search API's 7 days).
+BACKFILL_DAYS = 7
+
+# Spread a session's total budget over its hashtags by their observed volume instead of num_of_tweets for each one
+# (raw fetch mode): 'tweets' makes num_of_tweets x hashtags a total tweets budget, 'requests' spends REQUEST_BUDGET
+# search requests. None searches num_of_tweets for each hashtag.
+BUDGET = None
+REQUEST_BUDGET = 180
+
+# Tweets each hashtag gets before the budget is spread by volume - it measures the hashtag's volume.
+BUDGET_FLOOR = 100
+
+# Word counter of the popular words: 'exact' (a Counter over the whole vocabulary) or a bounded memory sketch -
+# 'space_saving' (SKETCH_CAPACITY counters, counts over by at most words / SKETCH_CAPACITY) or 'count_min'
+# (counts over by at most SKETCH_EPSILON x words with probability 1 - SKETCH_DELTA).
+WORD_COUNTER = 'exact'
+SKETCH_CAPACITY = 1000
+SKETCH_EPSILON = 0.001
+SKETCH_DELTA = 0.01
+
+# Precision of the HyperLogLog sketches of each hashtag's distinct users & tweets - 2^precision bytes per sketch,
+# about 1.04 / sqrt(2^precision) standard error (12: 4 KB, 1.6%; 13: 8 KB, 1.15%) - at least 11.
+HLL_PRECISION = 13
+
+# Phrases (bigrams & trigrams) of each hashtag in the export, & the maximal number of distinct phrases kept while
+# counting (the least counted are dropped beyond it).
+TOP_PHRASES = 10
+NGRAM_CAPACITY = 200000
+
+# Hashtags which occur most with each searched hashtag in the export's co-occurrence sheet, & the minimal tweets of an
+# edge of the co-occurrence graph file ('tweets_<date>.graphml', None to skip the file).
+TOP_PAIRS = 10
+GRAPH_MIN_WEIGHT = 2
+
+# Most distinctive words of each hashtag against the session's other hashtags: 'log_odds' (log-odds ratio with an
+# informative Dirichlet prior of LOG_ODDS_PRIOR x the session's counts) or 'tfidf'.
+DISTINCTIVE_SCORE = 'log_odds'
+LOG_ODDS_PRIOR = 0.01
+TOP_DISTINCTIVE = 10
+
+# Score ranges of each hashtag's sentiment distribution chart (equal ranges of the compound score, from -1 to 1).
+SENTIMENT_BINS = 10
+
+# Time buckets of the export's activity sheet ('h' - hourly, 'D' - daily) & the timezone of its buckets & of the hour
+# of week heatmap (the API's dates are UTC, e.g. 'Asia/Jerusalem').
+ACTIVITY_FREQUENCY = 'h'
+ACTIVITY_TIMEZONE = 'UTC'
+
+# Most influential users of each hashtag & of the session in the export. A user's score is
+# INFLUENCE_REACH_WEIGHT x log10(1 + followers x tweets) + INFLUENCE_ENGAGEMENT_WEIGHT x log10(1 + likes +
+# INFLUENCE_RETWEET_WEIGHT x retweets).
+TOP_INFLUENCERS = 10
+INFLUENCE_REACH_WEIGHT = 1.0
+INFLUENCE_ENGAGEMENT_WEIGHT = 1.0
+INFLUENCE_RETWEET_WEIGHT = 2.0
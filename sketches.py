@@ -0,0 +1,454 @@
+import collections
+import hashlib
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+import settings
+
+
+def word_hashes(word, count=1):
+
+    """
+    Stable independent 64 bit hashes of a word - unlike hash(), they're the same in every process, so sketches can be
+    merged.
+
+    Args:
+        word (str): The word.
+        count (int): Number of hashes (up to 8).
+
+    Returns:
+        The hashes (bytes of `count` little endian 64 bit integers).
+    """
+
+    return hashlib.blake2b(word.encode(), digest_size=8 * count).digest()
+
+
+class SpaceSaving:
+
+    """
+    Space-Saving heavy hitters summary - approximate word counts in `capacity` counters, whatever the vocabulary.
+
+    A new word takes the counter of the least counted word when the counters are full, and inherits its count as the
+    word's possible overestimate. A count is never under the word's frequency and over it by at most
+    total / capacity, and every word more frequent than total / capacity is kept.
+
+    Attributes:
+        capacity (int): Number of counters (the memory cap).
+        total (int): Number of counted words.
+        counts (dict): Word -> its count.
+        errors (dict): Word -> its count's maximal overestimate.
+
+    Methods:
+        __init__(self, capacity=settings.SKETCH_CAPACITY): Class's constructor.
+        update(self, words): Counts the words.
+        most_common(self, n): The n most counted words.
+        error_bound(self): Maximal overestimate of any count.
+    """
+
+    def __init__(self, capacity=settings.SKETCH_CAPACITY):
+
+        """Initializing SpaceSaving Class"""
+        self.capacity = capacity
+        self.total = 0
+        self.counts = dict()
+        self.errors = dict()
+        self.__heap = list()
+
+    def __evict(self):
+
+        # Pop the least counted word - every word has a single heap entry, which may be under its current count
+        while True:
+            count, word = heapq.heappop(self.__heap)
+            if self.counts[word] == count:
+                del self.counts[word], self.errors[word]
+                return count
+
+            heapq.heappush(self.__heap, (self.counts[word], word))
+
+    def update(self, words):
+
+        """
+        Counts the words.
+
+        Args:
+            words (iterable): The words.
+
+        Returns:
+            None
+        """
+
+        counts = self.counts
+
+        for word in words:
+            self.total += 1
+            count = counts.get(word)
+
+            if count is not None:
+                counts[word] = count + 1
+                continue
+
+            if len(counts) < self.capacity:
+                error = 0
+            else:
+                error = self.__evict()
+
+            counts[word], self.errors[word] = error + 1, error
+            heapq.heappush(self.__heap, (error + 1, word))
+
+    def most_common(self, n=None):
+
+        """
+        The n most counted words.
+
+        Args:
+            n (int): Number of words (all the kept words when None).
+
+        Returns:
+            List of (word, count) tuples, most counted first.
+        """
+
+        return heapq.nlargest(n or len(self.counts), self.counts.items(), key=lambda item: item[1])
+
+    def error_bound(self):
+
+        """Maximal overestimate of any count - total / capacity."""
+
+        return self.total / self.capacity
+
+
+class CountMinSketch:
+
+    """
+    Count-Min sketch with a heap of the top candidates - approximate word counts in a fixed depth x width table.
+
+    Each word adds 1 to one cell of every row (picked by its hash) and its count is the minimum of its cells. A count
+    is never under the word's frequency and over it by at most epsilon * total with probability 1 - delta. The words
+    are counted in batches with numpy, and the `capacity` most counted words are kept as the top-k candidates.
+
+    Attributes:
+        width (int): Cells of a row - ceil(e / epsilon).
+        depth (int): Rows - ceil(ln(1 / delta)), up to 8.
+        epsilon (float): Relative error of a count.
+        capacity (int): Number of top-k candidates.
+        total (int): Number of counted words.
+        table (ndarray): The depth x width counters.
+        candidates (dict): The most counted words -> their counts.
+
+    Methods:
+        __init__(self, epsilon=settings.SKETCH_EPSILON, delta=settings.SKETCH_DELTA,
+                 capacity=settings.SKETCH_CAPACITY, batch=10000): Class's constructor.
+        update(self, words): Counts the words.
+        estimate(self, words): The estimated counts of words.
+        most_common(self, n): The n most counted candidates.
+        error_bound(self): Maximal overestimate of a count (with probability 1 - delta).
+        merge(self, other): Adds the counts of a sketch of the same shape (e.g. of another tag or session).
+    """
+
+    def __init__(self, epsilon=settings.SKETCH_EPSILON, delta=settings.SKETCH_DELTA,
+                 capacity=settings.SKETCH_CAPACITY, batch=10000):
+
+        """Initializing CountMinSketch Class"""
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = min(8, math.ceil(math.log(1 / delta)))
+        self.epsilon = epsilon
+        self.capacity = capacity
+        self.total = 0
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.candidates = dict()
+        self.__batch = batch
+
+    def __cells(self, words):
+
+        # Column of each word in every row - an independent hash of the word for each row
+        hashes = np.frombuffer(b''.join(word_hashes(word, self.depth) for word in words), dtype='<u8')
+
+        return (hashes.reshape(len(words), self.depth).T % np.uint64(self.width)).astype(np.intp)
+
+    def estimate(self, words):
+
+        """
+        The estimated counts of words.
+
+        Args:
+            words (list): The words.
+
+        Returns:
+            counts (ndarray): The minimum of each word's cells.
+        """
+
+        if not words:
+            return np.zeros(0, dtype=np.int64)
+
+        return self.table[np.arange(self.depth)[:, np.newaxis], self.__cells(words)].min(axis=0)
+
+    def __update_batch(self, words):
+
+        unique, counts = np.unique(np.array(words, dtype=object), return_counts=True)
+        unique = unique.tolist()
+        cells = self.__cells(unique)
+
+        for row in range(self.depth):
+            np.add.at(self.table[row], cells[row], counts)
+        self.total += len(words)
+
+        # The batch's words compete with the current candidates
+        self.candidates.update(zip(self.candidates, self.estimate(list(self.candidates)).tolist()))
+        self.candidates.update(zip(unique, self.table[np.arange(self.depth)[:, np.newaxis], cells].min(axis=0)
+                                   .tolist()))
+        if len(self.candidates) > self.capacity:
+            self.candidates = dict(heapq.nlargest(self.capacity, self.candidates.items(), key=lambda item: item[1]))
+
+    def update(self, words):
+
+        """
+        Counts the words in batches.
+
+        Args:
+            words (iterable): The words.
+
+        Returns:
+            None
+        """
+
+        words = iter(words)
+        batch = list(itertools.islice(words, self.__batch))
+
+        while batch:
+            self.__update_batch(batch)
+            batch = list(itertools.islice(words, self.__batch))
+
+    def most_common(self, n=None):
+
+        """
+        The n most counted candidates.
+
+        Args:
+            n (int): Number of words (all the candidates when None).
+
+        Returns:
+            List of (word, count) tuples, most counted first.
+        """
+
+        return heapq.nlargest(n or len(self.candidates), self.candidates.items(), key=lambda item: item[1])
+
+    def error_bound(self):
+
+        """Maximal overestimate of a count (with probability 1 - delta) - epsilon * total."""
+
+        return self.epsilon * self.total
+
+    def merge(self, other):
+
+        """
+        Adds the counts of a sketch of the same shape (e.g. of another tag or session).
+
+        Args:
+            other (CountMinSketch): The other sketch.
+
+        Returns:
+            None
+        """
+
+        self.table += other.table
+        self.total += other.total
+
+        candidates = set(self.candidates) | set(other.candidates)
+        self.candidates = dict(heapq.nlargest(self.capacity, zip(candidates, self.estimate(list(candidates)).tolist()),
+                                              key=lambda item: item[1]))
+
+
+def splitmix64(values):
+
+    """
+    SplitMix64 finalizer - a fast, well mixed 64 bit hash of integers (e.g. tweet & user ids), vectorized.
+
+    Args:
+        values (array_like): Integers.
+
+    Returns:
+        hashes (ndarray): uint64 hash of each value.
+    """
+
+    z = np.asarray(values, dtype=np.int64).astype(np.uint64)
+
+    with np.errstate(over='ignore'):
+        z = z + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+    return z ^ (z >> np.uint64(31))
+
+
+# Least HyperLogLog precision - the 64 - precision bits which are ranked must fit a float64's 53 bits mantissa
+MIN_HLL_PRECISION = 64 - 53
+
+
+class HyperLogLog:
+
+    """
+    HyperLogLog sketch - the approximate number of distinct integers (e.g. users or tweets) in 2^precision bytes.
+
+    Each value is hashed with splitmix64: the hash's top `precision` bits pick a register, which keeps the maximal
+    rank (position of the first 1 bit) of the rest of the bits. The count is estimated with Ertl's improved estimator
+    (no bias tables), with a standard error of about 1.04 / sqrt(2^precision) - 1.15% with the default 8 KB.
+    Sketches of the same precision merge by their registers's maximum, so hashtags, sessions & machines can be
+    combined (to_bytes / from_bytes).
+
+    Attributes:
+        precision (int): Bits of the register index - at least MIN_HLL_PRECISION, so the rest of the bits fit a
+                         float64's mantissa & their rank is exact.
+        registers (ndarray): 2^precision uint8 registers.
+
+    Methods:
+        __init__(self, precision=settings.HLL_PRECISION): Class's constructor.
+        add(self, values): Adds integers.
+        merge(self, other): Adds the values of another sketch.
+        count(self): The estimated number of distinct values.
+        to_bytes(self): The sketch's registers as bytes.
+        from_bytes(cls, data): A sketch of serialized registers.
+    """
+
+    def __init__(self, precision=settings.HLL_PRECISION):
+
+        """Initializing HyperLogLog Class"""
+        if precision < MIN_HLL_PRECISION:
+            raise ValueError("HyperLogLog's precision must be at least {0} (got {1})".format(MIN_HLL_PRECISION,
+                                                                                              precision))
+
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+
+        """
+        Adds integers.
+
+        Args:
+            values (array_like): Integers (e.g. tweet or user ids).
+
+        Returns:
+            None
+        """
+
+        hashes = splitmix64(values)
+        if len(hashes) == 0:
+            return
+
+        rest = 64 - self.precision
+        index = (hashes >> np.uint64(rest)).astype(np.intp)
+
+        # Rank of the rest of the bits - rest - floor(log2(bits)), exact through frexp (rest <= 53, see __init__)
+        exponent = np.frexp((hashes & np.uint64((1 << rest) - 1)).astype(np.float64))[1]
+        rank = (rest + 1 - exponent).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+
+        """
+        Adds the values of another sketch of the same precision.
+
+        Args:
+            other (HyperLogLog): The other sketch.
+
+        Returns:
+            None
+        """
+
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+
+        """
+        The estimated number of distinct values (Ertl, "New cardinality estimation algorithms for HyperLogLog
+        sketches", 2017).
+
+        Returns:
+            The estimate (int).
+        """
+
+        m = len(self.registers)
+        q = 64 - self.precision
+        histogram = np.bincount(self.registers, minlength=q + 2)
+
+        z = m * self.__tau(1 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * self.__sigma(histogram[0] / m)
+
+        return int(round(m * m / (2 * math.log(2) * z)))
+
+    @staticmethod
+    def __sigma(x):
+
+        if x == 1:
+            return math.inf
+
+        y, z = 1, x
+        while True:
+            x *= x
+            previous, z = z, z + x * y
+            y += y
+            if z == previous:
+                return z
+
+    @staticmethod
+    def __tau(x):
+
+        if x == 0 or x == 1:
+            return 0
+
+        y, z = 1, 1 - x
+        while True:
+            x = math.sqrt(x)
+            y *= 0.5
+            previous, z = z, z - (1 - x) ** 2 * y
+            if z == previous:
+                return z / 3
+
+    def to_bytes(self):
+
+        """The sketch's registers as bytes - 2^precision bytes."""
+
+        return self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+
+        """
+        A sketch of serialized registers (see to_bytes).
+
+        Args:
+            data (bytes): The registers.
+
+        Returns:
+            The sketch (HyperLogLog).
+        """
+
+        sketch = cls(int(math.log2(len(data))))
+        sketch.registers[:] = np.frombuffer(data, dtype=np.uint8)
+
+        return sketch
+
+
+def make_counter(kind=settings.WORD_COUNTER):
+
+    """
+    Creates a word counter - all of them are filled by update(words) and queried by most_common(n).
+
+    Args:
+        kind (str): 'exact' (Counter), 'space_saving' (SpaceSaving) or 'count_min' (CountMinSketch).
+
+    Returns:
+        The counter.
+    """
+
+    if kind == 'space_saving':
+        return SpaceSaving()
+    if kind == 'count_min':
+        return CountMinSketch()
+
+    return collections.Counter()
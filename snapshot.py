@@ -0,0 +1,117 @@
+import json
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from tweet_buffer import TweetBuffer, UNKNOWN_USER
+from user_cache import shared_cache, UserProfile
+
+# Snapshot's columns of the tweets users's profiles
+PROFILE_COLUMNS = tuple('user_' + field for field in UserProfile._fields)
+
+
+def save_snapshot(tweet_matrix, tag_list, file_name):
+
+    """
+    Persists the session's columnar tweet table as an uncompressed Arrow IPC (Feather v2) file, which can be memory
+    mapped back as an Arrow table without reading or decoding it.
+
+    Args:
+        tweet_matrix (list): The TweetBuffer of each hashtag.
+        tag_list (iterable): Hashtags list itself (same order as tweet_matrix).
+        file_name (str): The snapshot's file name.
+
+    Parameters:
+        columns (dict): Column name -> the column of all the hashtags one after the other.
+        table (Table): The session's table - the buffer's columns, the profile of each tweet's user (so the snapshot
+                       can be re-analyzed without users/lookup) and a 'hashtag' column, with the hashtags, their
+                       number of rows & their search failures in its metadata.
+
+    Returns:
+        None
+    """
+
+    columns = {name: list() for name in TweetBuffer.COLUMNS + PROFILE_COLUMNS}
+    hashtags = list()
+
+    for tweets, tag in zip(tweet_matrix, tag_list):
+        for name, column in tweets.columns().items():
+            columns[name].extend(column)
+
+        profiles = [tweets.users.get(user_id) or UNKNOWN_USER for user_id in tweets.user_ids]
+        for name, column in zip(PROFILE_COLUMNS, zip(*profiles)):
+            columns[name].extend(column)
+
+        hashtags.extend([tag] * len(tweets))
+
+    table = pa.table(columns)
+    table = table.append_column('hashtag', pa.array(hashtags, pa.string()).dictionary_encode())
+
+    # The hashtags, their number of rows & failures - keeps the order, the hashtags without tweets & why they failed
+    table = table.replace_schema_metadata({'tags': json.dumps(list(tag_list)),
+                                           'counts': json.dumps([len(tweets) for tweets in tweet_matrix]),
+                                           'failures': json.dumps([tweets.failure for tweets in tweet_matrix])})
+
+    # Uncompressed, so the file can be memory mapped without decompressing it
+    feather.write_feather(table, file_name, compression='uncompressed')
+
+
+def load_snapshot(file_name, users=shared_cache, store=None):
+
+    """
+    Memory maps a session snapshot & splits it back into the TweetBuffer of each hashtag (with its search failure). The
+    users's profiles are put back into the user cache (unless it holds newer ones). The snapshot keeps the likes &
+    retweets of its session, so the ones refreshed since then (see hydrate) are joined from the data base by tweet id.
+
+    Only the Arrow table is zero copy - the TweetBuffers hold python lists, so each column is copied once into them
+    (to_pylist), which costs about as much memory as the session had when it was searched.
+
+    Args:
+        file_name (str): The snapshot's file name.
+        users (UserCache): The cache of the tweets users's profiles.
+        store (TweetStore): The data base whose likes & retweets replace the snapshot's (None keeps the snapshot's).
+
+    Parameters:
+        table (Table): The session's table, memory mapped (its columns aren't read until they are copied).
+
+    Returns:
+        tweet_matrix (list): The TweetBuffer of each hashtag.
+        tag_list (dict): Hashtags list itself (same order as tweet_matrix).
+    """
+
+    tag_list = dict()
+    tweet_matrix = list()
+    offset = 0
+
+    with pa.memory_map(file_name, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        metadata = table.schema.metadata
+
+        profiles = zip(*(table.column(name).to_pylist() for name in PROFILE_COLUMNS))
+        for user_id, profile in zip(table.column('user_ids').to_pylist(), profiles):
+            users.put(user_id, UserProfile(*profile))
+
+        # The snapshots saved before the failures were kept have none
+        tags = json.loads(metadata[b'tags'])
+        failures = json.loads(metadata.get(b'failures', b'null')) or [None] * len(tags)
+
+        # Each hashtag's rows are stored one after the other - the slices are zero copy, their lists are copies
+        for tag, count, failure in zip(tags, json.loads(metadata[b'counts']), failures):
+            rows = table.slice(offset, count)
+            offset += count
+
+            tag_list[tag] = tag
+            tweets = TweetBuffer.from_columns({name: rows.column(name).to_pylist() for name in TweetBuffer.COLUMNS},
+                                              users)
+            tweets.failure = failure
+            tweet_matrix.append(tweets)
+
+    if store is not None:
+        metrics = store.metrics(list({tweet_id for tweets in tweet_matrix for tweet_id in tweets.ids}))
+
+        for tweets in tweet_matrix:
+            for i, tweet_id in enumerate(tweets.ids):
+                if tweet_id in metrics:
+                    tweets.likes[i], tweets.retweets[i] = metrics[tweet_id]
+
+    return tweet_matrix, tag_list
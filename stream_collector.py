@@ -0,0 +1,255 @@
+import queue
+import threading
+import time
+from datetime import datetime
+
+from tweepy import (Stream, StreamListener)
+
+from search_client import loads
+from tweet_buffer import TweetBuffer
+import settings
+
+
+class HashtagStreamListener(StreamListener):
+
+    """
+    StreamListener which hands the raw stream messages over to a bounded queue.
+
+    The stream's thread only enqueues the raw line - decoding & analysis are done by the collector's consumer, so a
+    slow consumer never stalls the connection. When the queue is full the message is dropped and counted.
+
+    Attributes:
+        tweets_queue (Queue): Bounded queue of raw messages.
+        dropped (int): Number of messages dropped because the queue was full.
+        error_code (int): Last http error code of the stream (None when there was no error).
+    """
+
+    def __init__(self, tweets_queue):
+
+        super().__init__()
+        self.tweets_queue = tweets_queue
+        self.dropped = 0
+        self.error_code = None
+
+    def on_data(self, raw_data):
+
+        try:
+            self.tweets_queue.put_nowait(raw_data)
+        except queue.Full:
+            self.dropped += 1
+
+        return True
+
+    def on_error(self, status_code):
+
+        # Disconnect - StreamCollector reconnects with its own backoff
+        self.error_code = status_code
+        return False
+
+
+class StreamCollector:
+
+    """
+    Real-time collection of the hashtags through the filter stream.
+
+    The stream filters on the hashtag list & feeds a bounded queue. A consumer thread decodes the messages, routes each
+    tweet to the TweetBuffer of every hashtag in its entities and appends the raw tweets to a json lines file in
+    batches of `batch_size` tweets or every `batch_seconds` seconds. The stream is reconnected with exponential backoff
+    until the duration is over, every hashtag has num_of_tweets or stop() is called.
+
+    Attributes:
+        auth (OAuthHandler): Twitter credentials for authentication.
+        tag_list (dict): Hashtags list itself.
+        num_of_tweets (int): Number of tweets to collect for each hashtag.
+        batch_size (int): Number of tweets in each write to disk.
+        batch_seconds (float): Maximum seconds between writes to disk.
+        file_name (str): The json lines file of the collected tweets.
+        tweet_matrix (list): The TweetBuffer of each hashtag (same order as tag_list).
+        listener (HashtagStreamListener): The stream's listener.
+        reconnects (int): Number of reconnections.
+        skipped (int): Number of messages skipped because they couldn't be decoded or routed.
+
+    Methods:
+        __init__(self, auth, tag_list, num_of_tweets, ...): Class's constructor.
+        run(self, duration=settings.STREAM_SECONDS): Collects tweets until the end of the duration or stop().
+        stop(self): Stops the collection (thread safe).
+        backoff(error_code, attempt): Seconds to wait before the next reconnection.
+    """
+
+    def __init__(self, auth, tag_list, num_of_tweets, batch_size=settings.STREAM_BATCH_SIZE,
+                 batch_seconds=settings.STREAM_BATCH_SECONDS, queue_size=settings.STREAM_QUEUE_SIZE, file_name=None):
+
+        """Initializing StreamCollector Class"""
+        self.auth = auth
+        self.tag_list = tag_list
+        self.num_of_tweets = num_of_tweets
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self.file_name = file_name or 'stream' + datetime.now().strftime("_%d_%m_%y_%H_%M") + '.jsonl'
+        self.tweet_matrix = [TweetBuffer() for _ in tag_list]
+        self.listener = HashtagStreamListener(queue.Queue(maxsize=queue_size))
+        self.reconnects = 0
+        self.skipped = 0
+        self.__stream = None
+        self.__stopped = threading.Event()
+
+        # Hashtag without '#' (lowercase, like the entities) -> its buffer
+        self.__buffers = {tag[1:].lower(): tweets for tag, tweets in zip(tag_list, self.tweet_matrix)}
+
+    @staticmethod
+    def backoff(error_code, attempt):
+
+        """
+        Seconds to wait before the next reconnection, following Twitter's streaming guidelines.
+
+        Args:
+            error_code (int): Http error code of the stream, None for a network error.
+            attempt (int): Number of consecutive failed connections (starts at 1).
+
+        Returns:
+            Seconds to wait.
+        """
+
+        if error_code == 420:
+            # Rate limited - exponential from a minute
+            return 60 * 2 ** (attempt - 1)
+        if error_code is not None:
+            # Http errors - exponential from 5 seconds up to 320 seconds
+            return min(5 * 2 ** (attempt - 1), 320)
+
+        # Network errors - linear by 250ms up to 16 seconds
+        return min(0.25 * attempt, 16)
+
+    def stop(self):
+
+        """Stops the collection (thread safe)."""
+
+        self.__stopped.set()
+
+        if self.__stream is not None:
+            self.__stream.disconnect()
+
+    def __is_full(self):
+
+        return all(len(tweets) >= self.num_of_tweets for tweets in self.tweet_matrix)
+
+    def __route(self, raw_data):
+
+        """
+        Decodes a raw stream message & appends the tweet to the buffer of each of its hashtags.
+
+        Args:
+            raw_data (str): A raw stream message.
+
+        Returns:
+            True when the message was a tweet.
+        """
+
+        status = loads(raw_data)
+
+        # Skips delete, limit & warning messages
+        if 'id' not in status or 'user' not in status:
+            return False
+
+        entities = status.get('extended_tweet', status).get('entities', {})
+        for tag in {hashtag['text'].lower() for hashtag in entities.get('hashtags', ())}:
+            tweets = self.__buffers.get(tag)
+
+            if tweets is not None and len(tweets) < self.num_of_tweets:
+                tweets.append(status)
+
+        return True
+
+    def __consume(self):
+
+        """Consumer thread - routes the queued messages & writes them to disk in batches."""
+
+        tweets_queue = self.listener.tweets_queue
+        batch = list()
+        last_write = time.monotonic()
+
+        with open(self.file_name, 'a', encoding='utf8') as f:
+
+            while not (self.__stopped.is_set() and tweets_queue.empty()):
+                try:
+                    raw_data = tweets_queue.get(timeout=0.2)
+                except queue.Empty:
+                    raw_data = None
+
+                if raw_data is not None:
+                    # A bad message is skipped - the consumer thread keeps collecting
+                    try:
+                        routed = self.__route(raw_data)
+                    except Exception as e:
+                        print('Stream Message Error: {0}'.format(e))
+                        self.skipped += 1
+                        routed = False
+
+                    if routed:
+                        batch.append(raw_data.strip())
+
+                        if self.__is_full():
+                            self.stop()
+
+                if len(batch) >= self.batch_size or (batch and time.monotonic() - last_write >= self.batch_seconds):
+                    f.write('\n'.join(batch) + '\n')
+                    f.flush()
+                    batch.clear()
+                    last_write = time.monotonic()
+
+            if batch:
+                f.write('\n'.join(batch) + '\n')
+
+    def run(self, duration=settings.STREAM_SECONDS):
+
+        """
+        Collects tweets until the end of the duration, every hashtag has num_of_tweets or stop() is called.
+
+        Args:
+            duration (float): Maximum seconds of collection.
+
+        Returns:
+            tweet_matrix (list): The TweetBuffer of each hashtag (same order as tag_list).
+        """
+
+        consumer = threading.Thread(target=self.__consume, daemon=True)
+        consumer.start()
+
+        timer = threading.Timer(duration, self.stop)
+        timer.daemon = True
+        timer.start()
+
+        attempt = 0
+
+        try:
+            while not self.__stopped.is_set():
+                self.listener.error_code = None
+                self.__stream = Stream(self.auth, self.listener)
+
+                try:
+                    self.__stream.filter(track=list(self.tag_list), languages=['en'])
+                    error = self.listener.error_code
+                except Exception as e:
+                    print('Stream Error: {0}'.format(e))
+                    error = None
+                else:
+                    if error is None:
+                        # A clean disconnection - reconnect right away
+                        attempt = 0
+                        continue
+
+                if self.__stopped.is_set():
+                    break
+
+                attempt += 1
+                self.reconnects += 1
+                wait = self.backoff(error, attempt)
+                print('Stream disconnected (error {0}), reconnecting in {1} seconds'.format(error, wait))
+                self.__stopped.wait(wait)
+
+        finally:
+            timer.cancel()
+            self.stop()
+            consumer.join()
+
+        return self.tweet_matrix
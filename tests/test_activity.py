@@ -0,0 +1,41 @@
+from activity import (DAYS, hour_of_week)
+from benchmark import make_status
+from tweet_buffer import (TweetBuffer, session_frame)
+from user_cache import UserCache
+
+
+def make_session(dates_of_tags):
+
+    tweet_matrix = list()
+
+    for dates in dates_of_tags.values():
+        tweets = TweetBuffer(UserCache())
+        for i, date in enumerate(dates):
+            status = make_status(i)
+            status['created_at'] = date
+            tweets.append(status)
+        tweet_matrix.append(tweets)
+
+    return session_frame(tweet_matrix, dates_of_tags)
+
+
+def test_hour_of_week_buckets_a_known_timestamp():
+
+    # Wednesday 20:19 & Sunday 22:30 UTC
+    frame = make_session({'#python': ['Wed Oct 10 20:19:24 +0000 2018', 'Wed Oct 10 20:59:59 +0000 2018',
+                                      'Sun Oct 14 22:30:00 +0000 2018'],
+                          '#data': ['Wed Oct 10 21:00:00 +0000 2018'],
+                          '#empty': list()})
+
+    heatmap = hour_of_week(frame, 'UTC')
+    assert heatmap.shape == (2 * len(DAYS), 24)
+    assert heatmap.loc[('#python', DAYS.index('Wednesday')), 20] == 2
+    assert heatmap.loc[('#python', DAYS.index('Sunday')), 22] == 1
+    assert heatmap.loc[('#data', DAYS.index('Wednesday')), 21] == 1
+    assert heatmap.values.sum() == 4
+
+    # 3 hours ahead in October 2018 - Sunday 22:30 is Monday 01:30
+    heatmap = hour_of_week(frame, 'Asia/Jerusalem')
+    assert heatmap.loc[('#python', DAYS.index('Wednesday')), 23] == 2
+    assert heatmap.loc[('#python', DAYS.index('Monday')), 1] == 1
+    assert heatmap.loc[('#data', DAYS.index('Thursday')), 0] == 1
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import (parse_qs, urlsplit)
+
+from async_search import AsyncSearchEngine
+from benchmark import (RateLimitedStandInHandler, StandInHandler, StandInServer, stand_in_auth)
+from search_client import SEARCH_PATH
+
+NUM_OF_TWEETS = 1000
+
+
+class MalformedStandInHandler(StandInHandler):
+
+    """Serves statuses without their user for the '#broken' hashtag - its consumer fails on the first page."""
+
+    def paged_body(self):
+
+        body = super().paged_body()
+        if parse_qs(urlsplit(self.path).query)['q'][0] != '#broken':
+            return body
+
+        page = json.loads(body)
+        for status in page['statuses']:
+            del status['user']
+
+        return json.dumps(page).encode()
+
+
+def run_engine(server, tag_list, auth, **engine_options):
+
+    async def run():
+        engine = AsyncSearchEngine(auth, server.api_root, **engine_options)
+        try:
+            return await asyncio.wait_for(engine.search(tag_list, NUM_OF_TWEETS), 10)
+        finally:
+            await engine.close()
+
+    return asyncio.run(run())
+
+
+def search(tag_list, **engine_options):
+
+    with StandInServer(handler=MalformedStandInHandler, total=NUM_OF_TWEETS) as server:
+        return run_engine(server, tag_list, stand_in_auth(), **engine_options)
+
+
+def test_failed_consumer_stops_its_producer():
+
+    # A single page slot - the producer waits on the full queue as soon as its consumer stops taking pages
+    clean, = search(['#clean'], queue_size=1)
+    tweets, broken = search(['#clean', '#broken'], queue_size=1)
+
+    assert tweets.failure is None
+    assert tweets.ids == clean.ids
+    assert len(clean.ids) == NUM_OF_TWEETS
+
+    assert broken.failure is not None
+    assert all(len(column) == len(broken.ids) for column in broken.columns().values())
+
+
+def test_rate_limit_waits_and_rotates_keys():
+
+    tag_list = ['#tag{0}'.format(k) for k in range(4)]
+    window = 1.0
+
+    with StandInServer(total=1000) as server:
+        clean = run_engine(server, tag_list, stand_in_auth(), rate_limits={})
+
+    with StandInServer(handler=RateLimitedStandInHandler, total=1000) as server:
+        server.limit, server.window, server.usage, server.rejected = 10, window, dict(), 0
+        server.lock = threading.Lock()
+
+        # The first key was used up by another client - its first calls (up to the ones in flight) get a 429
+        time.sleep(window - time.time() % window)
+        server.usage[('access_token0', int(time.time() // window))] = server.limit
+
+        # 4 hashtags x 10 pages over 2 keys of 10 calls per window - most of the pages wait for the next windows
+        limited = run_engine(server, tag_list, [stand_in_auth(0), stand_in_auth(1)],
+                             rate_limits={SEARCH_PATH: server.limit}, rate_window=window)
+
+    assert [tweets.failure for tweets in limited] == [None] * len(tag_list)
+    assert [tweets.ids for tweets in limited] == [tweets.ids for tweets in clean]
+    assert 0 < server.rejected <= server.limit
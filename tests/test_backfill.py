@@ -0,0 +1,42 @@
+import pytest
+
+from backfill import Backfill
+from benchmark import (TOP_ID, StandInServer, stand_in_auth)
+from search_client import SearchClient
+from tweet_buffer import TweetBuffer
+from user_cache import UserCache
+
+
+def run_backfill(total, num_of_tweets, workers, window):
+
+    with StandInServer(total=total) as server:
+        client = SearchClient(stand_in_auth(), server.api_root, pool_size=workers, rate_limits={})
+        backfill = Backfill(client, '#python', num_of_tweets, workers=workers, partitions_per_worker=3,
+                            since_id=TOP_ID - window)
+        tweets = TweetBuffer(UserCache())
+        backfill.run(tweets)
+
+    return backfill, tweets.ids
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+@pytest.mark.parametrize('num_of_tweets', [1250, 2000])
+def test_backfill_matches_a_serial_search(workers, num_of_tweets):
+
+    backfill, ids = run_backfill(5000, num_of_tweets, workers, 5000)
+
+    # The stand-in's ids are consecutive, so the newest num_of_tweets are TOP_ID downwards without a gap
+    assert backfill.error is None
+    assert len(backfill.parts) > 2
+    assert len(ids) == num_of_tweets
+    assert len(set(ids)) == len(ids)
+    assert ids == list(range(TOP_ID, TOP_ID - num_of_tweets, -1))
+
+
+def test_backfill_stops_at_the_bottom_of_the_window():
+
+    # The window holds fewer tweets than requested - all of them, and none below its since_id
+    backfill, ids = run_backfill(5000, 2000, 4, 1500)
+
+    assert backfill.error is None
+    assert ids == list(range(TOP_ID, TOP_ID - 1500, -1))
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from benchmark import (StandInServer, VolumeStandInHandler, make_status, stand_in_auth)
+from budget import (BudgetPlanner, apportion)
+from search_client import (MAX_COUNT, SearchClient)
+
+VOLUMES = {'#dead': 0, '#quiet': 40, '#slow': 150, '#medium': 1500, '#busy': 6000}
+
+
+def test_apportion_uses_the_largest_remainders():
+
+    # Quotas 1.5, 1.2 & 0.3 - the leftover unit goes to the largest fraction
+    assert apportion(3, [5, 4, 1]) == [2, 1, 0]
+    assert apportion(10, [1, 1, 1]) == [4, 3, 3]
+    assert apportion(7, [0, 0]) == [4, 3]
+
+
+@pytest.mark.parametrize('total', [1, 17, 100, 1001])
+def test_apportion_sums_to_the_total_proportionally(total):
+
+    weights = [tag_volume / 200000 for tag_volume in VOLUMES.values()]
+    shares = apportion(total, weights)
+
+    assert sum(shares) == total
+    assert shares[0] == 0
+    assert shares == sorted(shares)
+    # Each share is its quota rounded up or down
+    assert all(abs(share - total * w / sum(weights)) < 1 for share, w in zip(shares, weights))
+
+
+def run_planner(total, unit, floor=MAX_COUNT):
+
+    with StandInServer(handler=VolumeStandInHandler, total=0) as server:
+        server.volumes, server.span = VOLUMES, 200000
+        client = SearchClient(stand_in_auth(), server.api_root, rate_limits={})
+        planner = BudgetPlanner(client, VOLUMES, total, unit, floor)
+        results = planner.run()
+
+    return planner, results, server.requests
+
+
+def test_tweets_budget_stops_at_the_total():
+
+    planner, results, _ = run_planner(2000, 'tweets')
+    counts = {tag: len(tweets) for tag, tweets in results.items()}
+
+    assert planner.spent == sum(counts.values()) == 2000
+    # The floor is respected & the busy hashtags get the quiet ones' leftovers
+    assert counts['#dead'] == 0 and counts['#quiet'] == 40
+    assert min(counts['#slow'], counts['#medium'], counts['#busy']) >= MAX_COUNT
+    assert counts['#busy'] > counts['#medium'] > counts['#slow']
+
+
+def test_requests_budget_stops_at_the_total():
+
+    planner, results, requests = run_planner(12, 'requests')
+
+    assert planner.spent == requests == 12
+    assert all(len(tweets) == VOLUMES[tag] for tag, tweets in results.items() if VOLUMES[tag] <= MAX_COUNT)
+    assert len(results['#busy']) > len(results['#medium'])
+
+
+def test_duplicate_only_page_ends_the_hashtag():
+
+    # The server ignores max_id - every page repeats the first one, so its tweets cost nothing in a tweets budget
+    page = {'statuses': [make_status(i) for i in range(MAX_COUNT)],
+            'search_metadata': {'count': MAX_COUNT, 'next_results': '?max_id=1'}}
+
+    with StandInServer(page=json.dumps(page).encode()) as server:
+        client = SearchClient(stand_in_auth(), server.api_root, rate_limits={})
+        results = BudgetPlanner(client, ['#python'], 1000, 'tweets').run()
+
+    assert len(results['#python']) == MAX_COUNT
+    assert server.requests == 2
@@ -0,0 +1,36 @@
+import pytest
+
+from benchmark import make_status
+from cooccurrence import Cooccurrence
+from tweet_buffer import TweetBuffer
+from user_cache import UserCache
+
+
+def make_tweets(hashtag_lists):
+
+    tweets = TweetBuffer(UserCache())
+
+    for i, hashtags in enumerate(hashtag_lists):
+        status = make_status(i)
+        status['entities']['hashtags'] = [{'text': tag} for tag in hashtags]
+        tweets.append(status)
+
+    return tweets
+
+
+def test_cooccurrence_counts_and_shares():
+
+    cooccurrence = Cooccurrence()
+    cooccurrence.add(make_tweets([['Python', 'data'], ['python', 'data', 'ML'], ['python', 'ml', 'ml']]))
+    # The first 2 tweets found again by another searched hashtag count once
+    cooccurrence.add(make_tweets([['python', 'data'], ['python', 'data', 'ml']]))
+
+    matrix = cooccurrence.build()
+    ids = cooccurrence.vocabulary.ids
+    assert matrix.diagonal()[[ids['python'], ids['data'], ids['ml']]].tolist() == [3, 2, 2]
+    assert matrix[ids['data'], ids['ml']] == matrix[ids['ml'], ids['data']] == 1
+
+    assert cooccurrence.strongest_pairs('#PYTHON', 5) == [('#data', 2, pytest.approx(2 / 3)),
+                                                          ('#ml', 2, pytest.approx(2 / 3))]
+    assert cooccurrence.strongest_pairs('#data', 1) == [('#python', 2, 1.0)]
+    assert cooccurrence.strongest_pairs('#missing', 5) == list()
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from benchmark import (RateLimitedStandInHandler, StandInServer, stand_in_auth)
+from credential_pool import CredentialPool
+from search_client import SEARCH_PATH
+
+TAGS = ['#tag{0}'.format(k) for k in range(4)]
+NUM_OF_TWEETS = 300
+WINDOW = 1.0
+
+
+def search(keys, limit, client_limit, used=()):
+
+    # Each hashtag's tweet ids through a pool of `keys` keys, and the calls of each (key, window) the server counted -
+    # the keys of `used` start with their window's calls taken by another client
+    with StandInServer(handler=RateLimitedStandInHandler, total=1000) as server:
+        server.limit, server.window, server.usage, server.rejected = limit, WINDOW, dict(), 0
+        server.lock = threading.Lock()
+
+        # Start at the beginning of a window, like a fresh 15 minutes window
+        time.sleep(WINDOW - time.time() % WINDOW)
+        window = int(time.time() // WINDOW)
+        server.usage.update({('access_token{0}'.format(key), window): limit for key in used})
+
+        client = CredentialPool([stand_in_auth(key) for key in range(keys)], server.api_root,
+                                rate_limits={SEARCH_PATH: client_limit}, rate_window=WINDOW)
+        ids = {tag: [status['id'] for page in client.pages(tag, NUM_OF_TWEETS) for status in page] for tag in TAGS}
+
+    return ids, server.usage, server.rejected, window
+
+
+def test_keys_rotate_on_rate_limit_responses():
+
+    single, _, _, _ = search(keys=1, limit=100, client_limit=100)
+
+    # Another client used up the first 2 keys - each one's first call gets a 429, which empties it for the window
+    ids, usage, rejected, window = search(keys=3, limit=10, client_limit=10, used=(0, 1))
+
+    assert ids == single
+    assert rejected == 2
+
+    # A single rejected call of each used up key, and the fresh key took the window's pages
+    assert usage[('access_token0', window)] == usage[('access_token1', window)] == 11
+    assert usage[('access_token2', window)] == 10
+
+
+def test_each_key_keeps_its_own_rate_limit():
+
+    single, _, _, _ = search(keys=1, limit=100, client_limit=100)
+    ids, usage, rejected, _ = search(keys=3, limit=2, client_limit=2)
+
+    assert ids == single
+    assert rejected == 0
+    assert max(usage.values()) <= 2
+    assert {key for key, _ in usage} == {'access_token{0}'.format(key) for key in range(3)}
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from distinctive import (log_odds, term_tag_matrix, tf_idf, top_terms)
+from vocabulary import Vocabulary
+
+
+@pytest.mark.parametrize('score', [log_odds, tf_idf])
+def test_a_hashtags_own_word_ranks_above_a_shared_word(score):
+
+    vocabulary = Vocabulary()
+    # 'data' is as frequent in both hashtags, 'pandas' & 'spark' are each hashtag's own word
+    encoded = [vocabulary.encode_tweets([['data', 'data', 'pandas', 'the']] * 5 + [['data', 'pandas', 'numpy']]),
+               vocabulary.encode_tweets([['data', 'data', 'spark', 'the']] * 5 + [['data', 'spark', 'numpy']])]
+    counts = term_tag_matrix(encoded, len(vocabulary))
+    ids = vocabulary.ids
+
+    assert counts[ids['data'], 0] == counts[ids['data'], 1] == 11
+    scores = score(counts)
+    assert scores[ids['pandas'], 0] > scores[ids['data'], 0]
+    assert scores[ids['spark'], 1] > scores[ids['data'], 1]
+
+    top = top_terms(scores, counts, vocabulary.mask(['the']), 5)
+
+    # The shared words don't score above 0
+    assert [[(vocabulary.words[row], count) for row, _, count in terms] for terms in top] == [[('pandas', 6)],
+                                                                                               [('spark', 6)]]
+    assert np.isclose(scores[ids['data'], 0], 0)
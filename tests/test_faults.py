@@ -0,0 +1,74 @@
+import pytest
+
+from benchmark import (FlakyStandInHandler, StandInServer, stand_in_auth)
+from search_client import SearchClient
+from session import search_session
+
+TAGS = ['#tag{0}'.format(k) for k in range(6)]
+NUM_OF_TWEETS = 300
+
+
+def run_session(server, policy, **client_options):
+
+    client = SearchClient(stand_in_auth(), server.api_root, rate_limits={}, **client_options)
+    results = dict()
+
+    return search_session(client, dict.fromkeys(TAGS), NUM_OF_TWEETS, results, policy=policy)
+
+
+@pytest.fixture(scope='module')
+def clean():
+
+    with StandInServer(total=1000) as server:
+        return run_session(server, 'partial')
+
+
+@pytest.mark.parametrize('policy', ['partial', 'skip'])
+def test_flaky_session_keeps_healthy_tags_and_applies_policy(clean, policy):
+
+    with StandInServer(handler=FlakyStandInHandler, total=1000) as server:
+        # Every 4th request fails (503, reset, timeout or truncated body) & the last hashtag goes down after a page
+        server.calls, server.faults, server.fault_every, server.slow = 0, 0, 4, 0.5
+        server.down = {TAGS[-1]}
+        flaky = run_session(server, policy, retries=4, timeout=(1, 0.2), retry_backoff=0.01)
+
+    assert server.faults > 0
+
+    for clean_tweets, tweets in zip(clean[:-1], flaky[:-1]):
+        assert tweets.failure is None
+        assert tweets.ids == clean_tweets.ids
+
+    down = flaky[-1]
+    assert down.failure is not None
+    if policy == 'partial':
+        assert 0 < len(down) < NUM_OF_TWEETS
+        assert down.ids == clean[-1].ids[:len(down)]
+    else:
+        assert len(down) == 0
+
+
+def test_failed_search_hashtag_fails_only_its_tag():
+
+    def search_hashtag(hashtag, results):
+        results[hashtag].extend([])
+        if hashtag == TAGS[1]:
+            raise ConnectionError('down')
+
+    results = dict()
+    tweet_matrix = search_session(None, dict.fromkeys(TAGS), NUM_OF_TWEETS, results, search_hashtag, policy='partial')
+
+    assert [tweets.failure for tweets in tweet_matrix] == [None, 'down'] + [None] * (len(TAGS) - 2)
+
+
+def test_budget_session_fails_only_the_tag_which_is_down():
+
+    with StandInServer(handler=FlakyStandInHandler, total=1000) as server:
+        server.calls, server.faults, server.fault_every, server.slow = 0, 0, 10 ** 9, 0
+        server.down = {TAGS[-1]}
+        client = SearchClient(stand_in_auth(), server.api_root, rate_limits={}, retries=1, retry_backoff=0.01)
+        tweet_matrix = search_session(client, dict.fromkeys(TAGS), NUM_OF_TWEETS, dict(), budget='tweets',
+                                      policy='partial')
+
+    assert all(tweets.failure is None and len(tweets) > 0 for tweets in tweet_matrix[:-1])
+    assert tweet_matrix[-1].failure is not None
+    assert sum(len(tweets) for tweets in tweet_matrix) == NUM_OF_TWEETS * len(TAGS)
@@ -0,0 +1,73 @@
+from benchmark import make_status
+from hydrate import hydrate
+from search_client import LOOKUP_SIZE
+from snapshot import (load_snapshot, save_snapshot)
+from tweet_buffer import TweetBuffer
+from tweet_store import TweetStore
+from user_cache import UserCache
+
+TWEETS = 450
+
+
+class LookupClient:
+
+    """Looks the tweets up with fresh metrics - the batch which holds `broken_id` fails."""
+
+    def __init__(self, broken_id):
+
+        self.broken_id = broken_id
+
+    def lookup(self, ids, **params):
+
+        if self.broken_id in ids:
+            raise ConnectionError('Connection reset by peer')
+
+        return [{'id': tweet_id, 'favorite_count': tweet_id * 2, 'retweet_count': tweet_id * 3} for tweet_id in ids]
+
+
+def test_failed_batch_keeps_the_others(tmp_path):
+
+    with TweetStore(str(tmp_path / 'tweets.db')) as store:
+        with store.connection:
+            store.connection.executemany("INSERT INTO tweets (tweet_id, hashtag, likes, retweets) VALUES (?, ?, 0, 0)",
+                                         [(tweet_id, '#python') for tweet_id in range(1, TWEETS + 1)])
+
+        refreshed, failed = hydrate(LookupClient(broken_id=LOOKUP_SIZE + 1), store, workers=2)
+        rows = store.connection.execute("SELECT tweet_id, likes, retweets FROM tweets").fetchall()
+
+    (failed_ids, error), = failed
+    assert refreshed == TWEETS - len(failed_ids)
+    assert isinstance(error, ConnectionError)
+
+    for tweet_id, likes, retweets in rows:
+        if tweet_id in failed_ids:
+            assert (likes, retweets) == (0, 0)
+        else:
+            assert (likes, retweets) == (tweet_id * 2, tweet_id * 3)
+
+
+def test_reanalyzed_snapshot_gets_the_refreshed_metrics(tmp_path):
+
+    tweets = TweetBuffer(UserCache())
+    tweets.extend([make_status(i) for i in range(300)])
+    save_snapshot([tweets], ['#python'], str(tmp_path / 'session.arrow'))
+
+    with TweetStore(str(tmp_path / 'tweets.db')) as store:
+        # The session's tweets were stored with the snapshot's metrics
+        with store.connection:
+            store.connection.executemany("INSERT INTO tweets (tweet_id, hashtag, likes, retweets) VALUES (?, ?, ?, ?)",
+                                         zip(tweets.ids, ['#python'] * len(tweets), tweets.likes, tweets.retweets))
+
+        # The first batch fails - its tweets keep the snapshot's metrics
+        refreshed, failed = hydrate(LookupClient(broken_id=tweets.ids[0]), store)
+        (snapshot_tweets, ), _ = load_snapshot(str(tmp_path / 'session.arrow'), UserCache(), store)
+
+    (failed_ids, _), = failed
+    assert refreshed == len(tweets) - len(failed_ids)
+    assert snapshot_tweets.ids == tweets.ids
+
+    for i, tweet_id in enumerate(snapshot_tweets.ids):
+        if tweet_id in failed_ids:
+            assert (snapshot_tweets.likes[i], snapshot_tweets.retweets[i]) == (tweets.likes[i], tweets.retweets[i])
+        else:
+            assert (snapshot_tweets.likes[i], snapshot_tweets.retweets[i]) == (tweet_id * 2, tweet_id * 3)
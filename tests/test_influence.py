@@ -0,0 +1,43 @@
+import numpy as np
+
+from benchmark import make_status
+from influence import top_influencers
+from tweet_buffer import (TweetBuffer, session_frame)
+from user_cache import UserCache
+
+
+def make_tweet(i, likes, retweets):
+
+    status = make_status(i)
+    status['favorite_count'], status['retweet_count'] = likes, retweets
+
+    return status
+
+
+def test_top_influencers_per_hashtag_and_unknown_users():
+
+    users = UserCache()
+    python, data = TweetBuffer(users), TweetBuffer(users)
+    python.extend([make_tweet(1, 100, 0), make_tweet(2, 0, 0)])
+    data.extend([make_tweet(3, 50, 25), make_tweet(1, 100, 0)])
+    frame = session_frame([python, data], ['#python', '#data'])
+
+    # The profile of user3 isn't cached - it's ranked as the unknown user (no name, no followers)
+    known = UserCache()
+    for user_id in (1001, 1002):
+        known.put(user_id, users.get(user_id))
+
+    influencers = top_influencers(frame, 2, known)
+
+    assert influencers[['Hashtag', 'User']].values.tolist() == [
+        ['#python', 'user1'], ['#python', 'user2'], ['#data', 'user1'], ['#data', ''],
+        ['All Hashtags', 'user1'], ['All Hashtags', '']]
+
+    unknown = influencers.iloc[3]
+    assert (unknown['Followers'], unknown['Reach'], unknown['Engagement']) == (0, 0, 100)
+    assert np.isclose(unknown['Score'], np.log10(101))
+    assert np.isclose(influencers.iloc[0]['Score'], np.log10(11) + np.log10(101))
+
+    # The tweet found by both hashtags counts once in the session's ranking
+    assert influencers.iloc[4]['Tweets'] == 1
+    assert len(top_influencers(frame, 1, known)) == 3
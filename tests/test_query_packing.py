@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from benchmark import (SparseStandInHandler, StandInServer, make_page, stand_in_auth)
+from search_client import (PagePlan, SearchClient, pack_queries)
+
+NUM_OF_TWEETS = 100
+
+
+SPARSE = {'sparse0': 15, 'sparse1': 40, 'sparse2': 3, 'dead': 0}
+
+
+def search(volumes):
+
+    # Each hashtag's tweet ids searched alone & packed, and the requests of each
+    tag_list = ['#' + tag for tag in volumes]
+
+    with StandInServer(handler=SparseStandInHandler, total=0) as server:
+        server.volumes = volumes
+        client = SearchClient(stand_in_auth(), server.api_root, rate_limits={})
+
+        single = {tag: [status['id'] for page in client.pages(tag, NUM_OF_TWEETS) for status in page]
+                  for tag in tag_list}
+        single_requests, server.requests = server.requests, 0
+
+        packed = dict()
+        for pack in pack_queries(tag_list):
+            for tag, statuses in client.packed_search(pack, NUM_OF_TWEETS).items():
+                packed[tag] = [status['id'] for status in statuses]
+
+    return single, single_requests, packed, server.requests
+
+
+@pytest.mark.parametrize('volumes', [
+    SPARSE,
+    {'busy': 1000, 'sparse0': 15, 'sparse1': 40, 'dead': 0},
+    {'busy0': 500, 'busy1': 300, 'sparse': 7},
+])
+def test_packed_search_matches_each_hashtag_searched_alone(volumes):
+
+    single, _, packed, _ = search(volumes)
+
+    assert packed == single
+    assert all(len(ids) == min(NUM_OF_TWEETS, volumes[tag[1:]]) for tag, ids in packed.items())
+
+
+def test_packed_search_saves_requests_of_sparse_hashtags():
+
+    _, single_requests, _, packed_requests = search(SPARSE)
+
+    assert packed_requests == 1
+    assert single_requests == len(SPARSE)
+
+
+def test_trimmed_page_continues_below_the_last_kept_tweet():
+
+    # A page longer than the plan needs (e.g. a packed query's shared total) - the trimmed tweets aren't skipped
+    page = json.loads(make_page(100))
+    plan = PagePlan(3)
+    plan.params()
+
+    kept = plan.feed(page)
+    assert [status['id'] for status in kept] == [status['id'] for status in page['statuses'][:3]]
+    assert plan.done and not plan.exhausted
+
+    plan.retarget(10, 3)
+    assert plan.params()['max_id'] == kept[-1]['id'] - 1
@@ -0,0 +1,33 @@
+import numpy as np
+
+from sentiment import (NEGATION_SCALAR, NORMALIZATION_ALPHA, SentimentScorer)
+from vocabulary import Vocabulary
+
+
+def compound(valence):
+
+    return valence / np.sqrt(valence * valence + NORMALIZATION_ALPHA)
+
+
+def test_negation_window_flips_the_valence():
+
+    vocabulary = Vocabulary()
+    ids, tweets = vocabulary.encode_tweets([['this', 'is', 'good'], ['this', 'is', 'not', 'good'],
+                                            ['not', 'so', 'very', 'much', 'good'], ['not'], ['good', 'bad'], []])
+    scores = SentimentScorer({'good': 1.9, 'bad': -2.5}).score(vocabulary, ids, tweets, 6)
+
+    # 'not good' is flipped & damped, a negation beyond the window or in the previous tweet isn't
+    assert np.allclose(scores, [compound(1.9), compound(1.9 * NEGATION_SCALAR), compound(1.9), 0,
+                                compound(1.9 - 2.5), 0])
+    assert scores[1] < 0 < scores[0]
+
+
+def test_scorer_follows_the_growing_vocabulary():
+
+    vocabulary = Vocabulary()
+    scorer = SentimentScorer({'good': 1.9, 'bad': -2.5})
+    scorer.score(vocabulary, *vocabulary.encode_tweets([['good']]), 1)
+
+    # The words added by a later batch are looked up as well
+    scores = scorer.score(vocabulary, *vocabulary.encode_tweets([['never', 'bad'], ['bad']]), 2)
+    assert np.allclose(scores, [compound(-2.5 * NEGATION_SCALAR), compound(-2.5)])
@@ -0,0 +1,101 @@
+import collections
+
+import numpy as np
+import pytest
+
+from sketches import (MIN_HLL_PRECISION, CountMinSketch, HyperLogLog, SpaceSaving)
+import settings
+
+WORDS = 200000
+VOCABULARY = 20000
+CAPACITY = 500
+TOP = 20
+
+
+@pytest.fixture(scope='module')
+def stream():
+
+    # A seeded zipfian stream of words - a few heavy hitters & a long tail
+    ranks = np.random.default_rng(7).zipf(1.2, WORDS) % VOCABULARY
+    words = ['word{0}'.format(rank) for rank in ranks.tolist()]
+
+    return words, collections.Counter(words)
+
+
+def test_space_saving_against_counter(stream):
+
+    words, true = stream
+    summary = SpaceSaving(capacity=CAPACITY)
+    summary.update(words)
+
+    assert summary.total == len(words)
+    assert len(summary.counts) <= CAPACITY
+
+    for word, count in summary.counts.items():
+        assert true[word] <= count <= true[word] + summary.error_bound()
+        assert count - true[word] <= summary.errors[word]
+
+    # Every word more frequent than total / capacity is kept
+    for word, count in true.items():
+        if count > summary.error_bound():
+            assert word in summary.counts
+
+    top = [word for word, count in true.most_common(TOP) if count > summary.error_bound()]
+    assert top
+    assert set(top) <= {word for word, _ in summary.most_common(TOP)}
+
+
+def test_count_min_sketch_against_counter(stream):
+
+    words, true = stream
+    sketch = CountMinSketch(capacity=CAPACITY, batch=7919)
+    sketch.update(words)
+
+    assert sketch.total == len(words)
+
+    vocabulary = list(true)
+    estimates = sketch.estimate(vocabulary)
+    counts = np.array([true[word] for word in vocabulary])
+
+    assert (estimates >= counts).all()
+    assert np.mean(estimates - counts > sketch.error_bound()) <= settings.SKETCH_DELTA
+
+    for word, count in sketch.most_common():
+        assert true[word] <= count
+
+    top = [word for word, count in true.most_common(TOP) if count > len(words) / CAPACITY]
+    assert top
+    assert set(top) <= {word for word, _ in sketch.most_common(TOP)}
+
+
+def test_count_min_sketch_merge_matches_a_single_sketch(stream):
+
+    words, _ = stream
+    single, first, second = (CountMinSketch(capacity=CAPACITY) for _ in range(3))
+
+    single.update(words)
+    first.update(words[:len(words) // 3])
+    second.update(words[len(words) // 3:])
+    first.merge(second)
+
+    assert first.total == single.total
+    assert (first.table == single.table).all()
+
+
+@pytest.mark.parametrize('precision', [MIN_HLL_PRECISION, 13, 16])
+def test_hyper_log_log_against_distinct_count(precision):
+
+    # Ids drawn with repeats - the exact distinct count is known
+    values = np.random.default_rng(precision).integers(0, 200000, 500000)
+    sketch = HyperLogLog(precision)
+    sketch.add(values)
+
+    distinct = len(np.unique(values))
+    assert abs(sketch.count() - distinct) <= 4 * 1.04 / np.sqrt(2 ** precision) * distinct
+    assert HyperLogLog.from_bytes(sketch.to_bytes()).count() == sketch.count()
+
+
+def test_hyper_log_log_rejects_an_inexact_precision():
+
+    with pytest.raises(ValueError):
+        HyperLogLog(MIN_HLL_PRECISION - 1)
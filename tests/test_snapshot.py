@@ -0,0 +1,50 @@
+import pyarrow.feather as feather
+
+from benchmark import make_status
+from snapshot import (load_snapshot, save_snapshot)
+from tweet_buffer import TweetBuffer
+from user_cache import UserCache
+
+
+def test_snapshot_round_trip_keeps_the_session(tmp_path):
+
+    users = UserCache()
+    python, data, empty = TweetBuffer(users), TweetBuffer(users), TweetBuffer(users)
+    python.extend([make_status(i) for i in range(300)])
+    data.extend([make_status(i) for i in range(300, 420)])
+    data.failure = 'Connection reset'
+    empty.failure = 'Rate limit exceeded'
+
+    file_name = str(tmp_path / 'session.arrow')
+    save_snapshot([python, data, empty], ['#python', '#data', '#empty'], file_name)
+
+    loaded_users = UserCache()
+    tweet_matrix, tag_list = load_snapshot(file_name, loaded_users)
+
+    # The hashtags keep their order, their rows & failures - the empty one too
+    assert list(tag_list) == ['#python', '#data', '#empty']
+    assert [len(tweets) for tweets in tweet_matrix] == [300, 120, 0]
+    assert [tweets.failure for tweets in tweet_matrix] == [None, 'Connection reset', 'Rate limit exceeded']
+
+    for original, tweets in zip((python, data, empty), tweet_matrix):
+        assert tweets.columns() == original.columns()
+
+    # The users's profiles are put back into the cache
+    assert all(loaded_users.get(user_id) == users.get(user_id) for user_id in python.user_ids)
+
+
+def test_snapshot_without_failures_loads(tmp_path):
+
+    tweets = TweetBuffer(UserCache())
+    tweets.extend([make_status(i) for i in range(10)])
+    file_name = str(tmp_path / 'session.arrow')
+    save_snapshot([tweets], ['#python'], file_name)
+
+    # A snapshot saved before the failures were kept
+    table = feather.read_table(file_name)
+    metadata = {key: value for key, value in table.schema.metadata.items() if key != b'failures'}
+    feather.write_feather(table.replace_schema_metadata(metadata), file_name, compression='uncompressed')
+
+    (loaded, ), tag_list = load_snapshot(file_name, UserCache())
+    assert list(tag_list) == ['#python']
+    assert loaded.ids == tweets.ids and loaded.failure is None
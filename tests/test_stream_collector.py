@@ -0,0 +1,48 @@
+import json
+import threading
+
+import stream_collector
+from benchmark import make_status
+
+MESSAGES = [
+    json.dumps(make_status(0)),
+    '{"id": 1, "truncated',
+    json.dumps({'delete': {'status': {'id': 2}}}),
+    json.dumps(dict(make_status(1), favorite_count=None, user='not a user')),
+    json.dumps(make_status(2)),
+    json.dumps(make_status(3)),
+]
+
+
+class ListStream:
+
+    """Replaces tweepy's Stream - feeds MESSAGES into the listener & stays connected until disconnect()."""
+
+    def __init__(self, auth, listener):
+
+        self.listener = listener
+        self.disconnected = threading.Event()
+
+    def filter(self, track=None, languages=None):
+
+        for raw_data in MESSAGES:
+            self.listener.on_data(raw_data)
+
+        self.disconnected.wait()
+
+    def disconnect(self):
+
+        self.disconnected.set()
+
+
+def test_bad_messages_are_skipped(monkeypatch, tmp_path):
+
+    monkeypatch.setattr(stream_collector, 'Stream', ListStream)
+
+    collector = stream_collector.StreamCollector(None, {'#python': '#python'}, 3,
+                                                 file_name=str(tmp_path / 'stream.jsonl'))
+    tweets, = collector.run(duration=10)
+
+    assert collector.skipped == 2
+    assert tweets.ids == [make_status(i)['id'] for i in (0, 2, 3)]
+    assert len((tmp_path / 'stream.jsonl').read_text().splitlines()) == 3
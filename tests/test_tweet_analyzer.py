@@ -0,0 +1,34 @@
+from benchmark import make_status
+from headless import ConsoleWindow
+from tweet_analyzer import TweetAnalyzer
+from tweet_buffer import TweetBuffer
+from user_cache import UserCache
+
+
+def make_tweets(texts):
+
+    tweets = TweetBuffer(UserCache())
+
+    for i, text in enumerate(texts):
+        status = make_status(i)
+        status['full_text'] = text
+        tweets.append(status)
+
+    return tweets
+
+
+def test_word_counter_reuses_the_encoded_ids():
+
+    tweets = make_tweets(['Python loves data and the data loves #Python',
+                          'the data is big data',
+                          'python and pandas'])
+    tweet_analyzer = TweetAnalyzer(ConsoleWindow())
+    encoded = tweet_analyzer.encode(tweets)
+
+    # The hashtag's word & the stop words are masked out of the single encode pass
+    words = tweet_analyzer.word_counter(tweets, '#python', encoded)
+    assert words.values.tolist()[:2] == [['data', 4], ['loves', 2]]
+    assert not {'python', 'the', 'and', 'is'} & set(words['Words'])
+
+    # Tokenizing again gives the same counts
+    assert words.equals(tweet_analyzer.word_counter(tweets, '#python'))
@@ -0,0 +1,60 @@
+import sqlite3
+
+from benchmark import make_status
+from tweet_buffer import TweetBuffer
+from tweet_store import (SCHEMA, TweetStore)
+from user_cache import UserCache
+
+
+def make_frame(count):
+
+    tweets = TweetBuffer(UserCache())
+    tweets.extend([make_status(i) for i in range(count)])
+
+    return tweets.to_data_frame()
+
+
+def test_an_earlier_data_base_gets_the_sentiment_column(tmp_path):
+
+    path = str(tmp_path / 'tweets.db')
+
+    # A data base created before the sentiment column
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA.replace("    sentiment REAL,\n", ""))
+    connection.execute("INSERT INTO tweets (tweet_id, hashtag, likes) VALUES (1, '#python', 5)")
+    connection.commit()
+    connection.close()
+
+    with TweetStore(path) as store:
+        columns = [row[1] for row in store.connection.execute("PRAGMA table_info(tweets)")]
+        assert 'sentiment' in columns
+        assert store.connection.execute("SELECT tweet_id, likes, sentiment FROM tweets").fetchall() == [(1, 5, None)]
+
+        df = make_frame(10)
+        df['Sentiment'] = 0.5
+        store.append('#python', df, 'session')
+        assert store.query('#python')['sentiment'].count() == 10
+
+    # Opening it again doesn't migrate twice
+    with TweetStore(path) as store:
+        assert len(store.tweet_ids('#python')) == 11
+
+
+def test_append_is_idempotent_per_tweet_and_hashtag(tmp_path):
+
+    df = make_frame(50)
+
+    with TweetStore(str(tmp_path / 'tweets.db')) as store:
+        store.append('#python', df, 'first')
+        store.append('#python', df, 'second')
+        store.append('#data', df, 'second')
+
+        # A tweet is stored once per hashtag - searching it again updates it
+        assert len(store.tweet_ids('#python')) == len(store.tweet_ids('#data')) == 50
+        assert len(store.tweet_ids()) == 50
+        assert set(store.query('#python')['session']) == {'second'}
+
+        df['Likes'] = 7
+        store.append('#python', df, 'third')
+        assert set(store.query('#python')['likes']) == {7}
+        assert len(store.query()) == 100
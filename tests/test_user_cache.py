@@ -0,0 +1,70 @@
+import threading
+
+from benchmark import make_status
+from tweet_buffer import TweetBuffer
+from user_cache import (UserCache, refresh_users)
+
+
+def test_least_recently_used_profiles_are_evicted():
+
+    users = [make_status(i)['user'] for i in range(5)]
+    cache = UserCache(max_size=3)
+
+    for user in users[:3]:
+        cache.add(user)
+
+    # Reading the first user keeps it - the second one is the least recently used
+    assert cache.get(users[0]['id']) is not None
+    cache.add(users[3])
+    cache.add(users[0])
+    cache.add(users[4])
+
+    assert len(cache) == 3
+    assert [user_id for user_id in cache.profiles] == [users[i]['id'] for i in (3, 0, 4)]
+    assert cache.get(users[1]['id']) is None
+    assert sorted(cache.expired([user['id'] for user in users])) == sorted([users[1]['id'], users[2]['id']])
+
+
+def test_concurrent_access_with_evictions():
+
+    users = [make_status(i)['user'] for i in range(250)]
+    cache = UserCache(max_size=50)
+    errors = list()
+
+    def work(offset):
+        try:
+            for _ in range(200):
+                for user in users[offset::4]:
+                    cache.add(user)
+                    cache.get(user['id'])
+                cache.expired([user['id'] for user in users])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache) == 50
+
+
+class RateLimitedLookups:
+
+    """users/lookup which always fails, like a 429 after the retries."""
+
+    def lookup_users(self, user_ids):
+
+        raise ConnectionError('Rate limit exceeded')
+
+
+def test_failed_refresh_keeps_the_session():
+
+    cache = UserCache()
+    tweets = TweetBuffer(cache)
+    tweets.extend([make_status(i) for i in range(10)])
+
+    assert refresh_users(RateLimitedLookups(), [tweets], cache) == 0
+    assert all(cache.get(user_id) is not None for user_id in tweets.user_ids)
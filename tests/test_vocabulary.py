@@ -0,0 +1,36 @@
+import numpy as np
+
+from vocabulary import (ID_BITS, UNKNOWN, NgramCounter, Vocabulary)
+
+
+def test_packed_ngrams_of_the_highest_ids_decode_back():
+
+    # The vocabulary is nearly full, so the words get the highest ids which fit ID_BITS bits
+    vocabulary = Vocabulary()
+    vocabulary.words.extend([''] * (vocabulary.capacity - 5))
+    ids, tweets = vocabulary.encode_tweets([['big', 'data', 'rocks'], ['big', 'data'], ['data', 'rocks', 'the'],
+                                            ['overflow', 'big']])
+
+    assert ids.tolist()[:3] == [(1 << ID_BITS) - 4, (1 << ID_BITS) - 3, (1 << ID_BITS) - 2]
+    assert ids[7] == (1 << ID_BITS) - 1
+    assert ids[-2] == UNKNOWN
+
+    counter = NgramCounter()
+    counter.update(ids, tweets, vocabulary.mask(['the']))
+
+    # No phrase crosses a tweet's end, starts or ends with a stop word or holds an UNKNOWN id
+    assert counter.most_common(vocabulary) == [('big data', 2), ('data rocks', 2), ('big data rocks', 1)]
+
+
+def test_ngram_counts_merge_across_batches():
+
+    vocabulary = Vocabulary()
+    counter = NgramCounter(orders=(2, ))
+
+    for batch in ([['a', 'b', 'c']], [['a', 'b'], ['b', 'c']]):
+        ids, tweets = vocabulary.encode_tweets(batch)
+        counter.update(ids, tweets, vocabulary.mask(()))
+
+    assert counter.most_common(vocabulary, 1) == [('a b', 2)]
+    assert dict(counter.most_common(vocabulary)) == {'a b': 2, 'b c': 2}
+    assert counter.counts.dtype == np.int64
@@ -1,10 +1,39 @@
-import time
-from datetime import datetime
+import threading
 
-from PyQt5.QtCore import (QObject, pyqtSignal)
+from PyQt5.QtCore import (QObject, pyqtSignal, pyqtSlot)
 from PyQt5.QtWidgets import (QApplication, QProgressBar)
 from PyQt5.QtGui import QIcon
-from tweepy import (Cursor, Stream, StreamListener, TweepError, RateLimitError)
+from tweepy import (Cursor, TweepError, RateLimitError)
+
+from backfill import Backfill
+from hydrate import hydrate
+from search_client import (MAX_COUNT, SEARCH_PARAMS, fail_tags)
+from session import search_session
+from stream_collector import StreamCollector
+from tweet_buffer import TweetBuffer
+from tweet_store import TweetStore
+from user_cache import refresh_users
+from warmup import warm_up
+import settings
+
+
+class SearchJob:
+
+    """
+    A hashtag list queued for the search worker.
+
+    Attributes:
+        tag_list (dict): Copy of the hashtags list - editing the list doesn't change a queued job.
+        num_of_tweets (int): Number of tweets to be pulled out for each hashtag.
+        tweet_matrix (list): The TweetBuffer of each hashtag, once the job is done.
+    """
+
+    def __init__(self, tag_list, num_of_tweets):
+
+        """Initializing SearchJob Class"""
+        self.tag_list = dict(tag_list)
+        self.num_of_tweets = num_of_tweets
+        self.tweet_matrix = list()
 
 
 class ThreadsClass(QObject):
@@ -12,31 +41,73 @@ class ThreadsClass(QObject):
     """
     ThreadsClass to perform the data extraction via twitter api with threads.
 
+    A single long-lived worker serves all the sessions on its own thread: the sessions submit SearchJobs, which wait
+    in the thread's event queue and run one after the other, so several hashtag lists can be queued back to back.
+    The thread, the clients' keep-alive connections & the caches are reused by every job.
+
     Attributes:
         twitter_client (API): API instance.
-        num_of_tweets (int): Number of tweets to be pulled out.
-        tag_list (Dict): Our Hash Tags.
+        num_of_tweets (int): Number of tweets to be pulled out (of the running job).
+        tag_list (Dict): Our Hash Tags (of the running job).
         statusbar_table statusbar_table (QTextBrowser): Status var at the UI to inform the user about the actions.
         instance (App): The main instance of App class.
+        fetch_mode (str): 'raw' to decode the search pages straight into TweetBuffer columns or 'cursor' to use
+                          tweepy's Cursor & models.
+        collector (StreamCollector): The real-time collector ('stream' collection mode).
+        pending (int): Number of submitted jobs which aren't done yet - counted up by the GUI thread & down by the
+                       worker's thread, under a lock.
 
     Methods:
-        __init__(self, twitter_client, num_of_tweets, tag_list, statusbar_table, instance): Class's constructor.
+        __init__(self, twitter_client, statusbar_table, instance): Class's constructor.
         super().__init__(): QObject Base Class __init__ constructor.
-        run(self): A method which called when starting the search's thread and it's performs the actual search.
+        submit_job(self, job): Queues a search job for the worker's thread.
+        run(self, job): A slot which runs on the worker's thread and performs the actual search of a job.
+        __search_hashtag(self, hashtag, results): Search a single hashtag according to fetch_mode.
+        __progress(self, fraction): Shows the done fraction of the session's searches on the progress bar.
+        __searched_tweets(self, results, error): The tweets of the hashtags searched before the session stopped.
+        stop(self): Stops a streaming collection.
     """
 
     signal = pyqtSignal('PyQt_PyObject')
+    submitted = pyqtSignal('PyQt_PyObject')
 
-    def __init__(self, twitter_client, num_of_tweets, tag_list, statusbar_table, instance):
+    def __init__(self, twitter_client, statusbar_table, instance):
 
         super().__init__()
         self.app = instance
         self.twitter_client = twitter_client
-        self.num_of_tweets = num_of_tweets
-        self.tag_list = tag_list
+        self.num_of_tweets = 0
+        self.tag_list = dict()
         self.statusbar_table = statusbar_table
         self.tweet_matrix = list()
         self.status_bar = self.app.get_statusbar_table
+        self.fetch_mode = settings.FETCH_MODE
+        self.collector = None
+        self.pending = 0
+        self.__pending_lock = threading.Lock()
+
+        # Submitted jobs are queued to the thread the worker lives in
+        self.submitted.connect(self.run)
+
+    def submit_job(self, job):
+
+        """
+        Queues a search job for the worker's thread.
+
+        Args:
+            job (SearchJob): The hashtag list to search.
+
+        Returns:
+            ahead (int): Number of jobs ahead of this one.
+        """
+
+        with self.__pending_lock:
+            ahead = self.pending
+            self.pending += 1
+
+        self.submitted.emit(job)
+
+        return ahead
 
     @staticmethod
     def __create_progress_bar(self):
@@ -53,90 +124,220 @@ class ThreadsClass(QObject):
 
         return pb
 
-    def run(self):
+    def __search_hashtag(self, hashtag, results):
 
         """
-        Initializing a Stream & Use Search Engine with User's Hashtags.
+        Search a single hashtag and copy its tweets into its TweetBuffer - the tweets copied so far stay in the
+        buffer when the search fails. A large hashtag is backfilled over concurrent id ranges (see Backfill).
 
         Args:
-            None.
+            hashtag (str): The hashtag to search for.
+            results (dict): Hashtag -> TweetBuffer of its tweets.
 
         Parameters:
-            self.app.listener (StreamListener): Initializing & stores StreamListener object.
-            self.app.stream (Stream): Initializing & Store Stream object with auth & listener args.
-            tweets_list[] (list): Temporary list in order to store specific hashtag's tweets
-            self.tweet_matrix (list): list of lists - Storing lists of tweets for each hashtag.
-            self.pb (QProgressBar): Progess bar which present the current status of the search.
-            self.tag_list (dict): Hashtags list itself for searching tweets.
-            temp_value (float): Temporary value for the continuation of the progress bar.
-            start (float): current time in seconds.
-            clock (str): current time.
-            self.signal (pyqtBoundSignal):Emiting the tweets list of lists back to data_and_analasys_to_excel method.
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
+            plan (PagePlan): Pagination plan of the hashtag's prefetched search (None when it wasn't prefetched).
+            cursor (ItemIterator): tweepy's cursor over the search results ('cursor' fetch mode).
 
         Returns:
             None
         """
 
-        # Handles Twitter authetification and the connection to Twitter Streaming API
-        self.app.listener = StreamListener()
-        self.app.stream = Stream(self.app.auth, self.app.listener)
+        tweets, plan = results[hashtag], None
 
-        # Capture the Tweets in a Temporary List
-        tweets_list = []
+        if self.fetch_mode == 'raw' and settings.BACKFILL and self.num_of_tweets >= settings.BACKFILL_MIN_TWEETS:
+            # A large hashtag is searched over concurrent id ranges - its prefetch isn't needed
+            if self.app.prefetcher:
+                self.app.prefetcher.cancel(hashtag)
 
-        try:
-                # Creating the Progress Bar and present it.
-                self.pb = self.__create_progress_bar(self)
-                self.pb.show()
+            Backfill(self.app.search_client, hashtag, self.num_of_tweets).run(tweets)
 
-                # Temporary value for the continuation of the progress bar
-                temp_value = 0
+        elif self.fetch_mode == 'raw':
+            # Continue from the prefetched pages of the hashtag
+            prefetched = self.app.prefetcher.take(hashtag, self.num_of_tweets) if self.app.prefetcher else None
+            if prefetched is not None:
+                tweets, plan = prefetched
+                results[hashtag] = tweets
 
-                for hashtag, search_item in zip(self.tag_list, range(1, len(self.tag_list) + 1)):
+            # Decode the json pages straight into the buffer's columns
+            for page in self.app.search_client.pages(hashtag, self.num_of_tweets, plan, **SEARCH_PARAMS):
 
-                    QApplication.processEvents()
+                QApplication.processEvents()
+                tweets.extend(page)
 
-                    # Starting time
-                    start = time.time()
-                    clock = datetime.now().strftime("%H:%M:%S")
+        else:
+            cursor = Cursor(self.twitter_client.search, q=hashtag, result_type='mixed', tweet_mode='extended',
+                            include_entities=True, lang="en", count=MAX_COUNT).items(self.num_of_tweets)
 
-                    cursor = Cursor(self.twitter_client.search, q=hashtag, result_type='mixed', tweet_mode='extended',
-                                    include_entities=True, lang="en").items(self.num_of_tweets)
+            # Use Cursor to search for hashtag and copy it into the buffer
+            for tweet in cursor:
 
-                    # Use Cursor to search for hashtag and copy it into a tweets_list
-                    for tweet in cursor:
+                QApplication.processEvents()
+                tweets.append(tweet._json)
 
-                        QApplication.processEvents()
-                        # Capture a list of tweets
-                        tweets_list.append(tweet)
+    def __progress(self, fraction):
 
-                    # Progress Bar Continuation's Configuration
-                    time.sleep(0.05)
-                    self.pb.setValue(temp_value + 100/len(self.tag_list))
-                    temp_value += 100/len(self.tag_list)
+        # Progress of the session's searches
+        QApplication.processEvents()
+        self.pb.setValue(int(100 * fraction))
 
-                    print("Search #{} took {} from {}".format(search_item, time.time() - start, clock))
+    def stop(self):
 
-                    # Copy to the List of lists which stores all the tweets for each hashtags & clean the temp list
-                    self.tweet_matrix.append(tweets_list.copy())
-                    tweets_list.clear()
+        """Stops a streaming collection - called by the UI's Stop button."""
 
-                # Hiding the Progress Bar
-                self.pb.close()
+        if self.collector is not None:
+            self.collector.stop()
+
+    @pyqtSlot('PyQt_PyObject')
+    def run(self, job):
+
+        """
+        Use Search Engine or a real-time Stream ('stream' collection mode) with User's Hashtags.
+
+        Args:
+            job (SearchJob): The hashtag list to search.
 
-                # Disconnect from the stream
-                self.app.stream.disconnect()
+        Parameters:
+            self.collector (StreamCollector): Collects the hashtags from the filter stream ('stream' collection mode).
+            tweets (TweetBuffer): Columnar buffer of the specific hashtag's tweets.
+            self.tweet_matrix (list): Storing the TweetBuffer of each hashtag.
+            self.pb (QProgressBar): Progess bar which present the current status of the search.
+            self.tag_list (dict): Hashtags list itself for searching tweets.
+            results (dict): Hashtag -> TweetBuffer of the hashtags searched so far.
+            self.signal (pyqtBoundSignal):Emiting the done job back to data_and_analasys_to_excel method.
+
+        Returns:
+            None
+        """
 
-                # Terminate and delete the search thread.
-                self.app.search_thread.terminate()
-                del self.app.search_thread
+        self.tag_list = job.tag_list
+        self.num_of_tweets = job.num_of_tweets
+        self.tweet_matrix = list()
+        self.pb = None
+        results = dict()
 
-                # Emiting the tweets list of lists back to data_and_analasys_to_excel method.
-                self.signal.emit(self.tweet_matrix)
+        try:
+                if settings.COLLECTION_MODE == 'stream':
+                    # Handles the connection to Twitter Streaming API until the duration is over or Stop is clicked
+                    self.collector = StreamCollector(self.app.auth, self.tag_list, self.num_of_tweets)
+                    self.tweet_matrix = self.collector.run()
+
+                    print("Stream collected {} tweets ({} dropped, {} reconnects) into {}".format(
+                        sum(len(tweets) for tweets in self.tweet_matrix), self.collector.listener.dropped,
+                        self.collector.reconnects, self.collector.file_name))
+                    self.collector = None
+
+                else:
+                    # Creating the Progress Bar and present it.
+                    self.pb = self.__create_progress_bar(self)
+                    self.pb.show()
+
+                    # Each search is a single hashtag or a pack of hashtags searched with one OR query, or the
+                    # hashtags share a total budget - a search which fails only fails its own hashtags
+                    raw = self.fetch_mode == 'raw'
+                    self.tweet_matrix = search_session(self.app.search_client, self.tag_list, self.num_of_tweets,
+                                                       results, self.__search_hashtag, self.__progress,
+                                                       packing=raw and settings.QUERY_PACKING,
+                                                       budget=settings.BUDGET if raw else None)
 
         except RateLimitError as limit:
             print('RateLimit Error: {0}'.format(limit))
+            self.tweet_matrix = self.__searched_tweets(results, limit)
         except TweepError as error:
             print('Tweepy Error: {0}'.format(error))
+            self.tweet_matrix = self.__searched_tweets(results, error)
         except Exception as e:
             print('Search Error: {0}'.format(e))
+            self.tweet_matrix = self.__searched_tweets(results, e)
+        finally:
+            # Hiding the Progress Bar
+            if self.pb is not None:
+                self.pb.close()
+                self.pb = None
+
+        try:
+            # Refreshing the expired profiles of the tweets's users in bulk (best effort)
+            refresh_users(self.app.search_client, self.tweet_matrix)
+
+            # Emiting the done job back to data_and_analasys_to_excel method - the hashtags which were searched
+            # before a failure are exported as well.
+            job.tweet_matrix = self.tweet_matrix
+            self.signal.emit(job)
+
+        finally:
+            with self.__pending_lock:
+                self.pending -= 1
+
+    def __searched_tweets(self, results, error):
+
+        # The hashtags which were searched before the session stopped, the rest fail
+        missing = [hashtag for hashtag in self.tag_list if hashtag not in results]
+        results.update({hashtag: TweetBuffer() for hashtag in missing})
+        if missing:
+            fail_tags(results, missing, error)
+
+        return [results[hashtag] for hashtag in self.tag_list]
+
+
+class WarmUpClass(QObject):
+
+    """
+    Runs the start-up warm-up (see warmup.warm_up) on a background thread once the window is shown.
+
+    Attributes:
+        instance (App): The main instance of App class.
+
+    Methods:
+        __init__(self, instance): Class's constructor.
+        run(self): Performs the warm-up and emits its result - a dict with an 'error' when it failed.
+    """
+
+    signal = pyqtSignal('PyQt_PyObject')
+
+    def __init__(self, instance):
+
+        super().__init__()
+        self.app = instance
+
+    def run(self):
+
+        try:
+            result = warm_up(self.app)
+        except Exception as e:
+            result = {'error': e}
+
+        self.signal.emit(result)
+
+
+class HydrateClass(QObject):
+
+    """
+    Refreshes the likes & retweets of the data base's tweets (see hydrate.hydrate) on a background thread, so the
+    lookups don't freeze the UI.
+
+    Attributes:
+        search_client (SearchClient): The client which performs the lookups.
+
+    Methods:
+        __init__(self, search_client): Class's constructor.
+        run(self): Refreshes the data base and emits the result - a dict with an 'error' when it failed.
+    """
+
+    signal = pyqtSignal('PyQt_PyObject')
+
+    def __init__(self, search_client):
+
+        super().__init__()
+        self.search_client = search_client
+
+    def run(self):
+
+        # The data base is opened on this thread - an sqlite connection stays on the thread which created it
+        try:
+            with TweetStore() as store:
+                refreshed, failed = hydrate(self.search_client, store)
+            result = {'refreshed': refreshed, 'failed': failed}
+        except Exception as e:
+            result = {'error': e}
+
+        self.signal.emit(result)
@@ -1,10 +1,18 @@
-import collections
-import itertools
 import re
 
 import numpy as np
 import pandas as pd
 
+from activity import DAYS
+import distinctive
+from sentiment import SentimentScorer
+from sketches import (HyperLogLog, make_counter)
+from vocabulary import (NgramCounter, Vocabulary)
+import settings
+
+# Tweets tokenized & counted at once by the phrase counter
+PHRASE_BATCH = 10000
+
 
 class TweetAnalyzer:
     """
@@ -14,13 +22,24 @@ class TweetAnalyzer:
     ----------
         self.__stop_words (list): List of unnecessary link words and the user's hashtags for analysis purposes.
         self.status_bar (QTextBrowser): Status bar @ the bottom of UI (A reference of App statusbar_table's object.)
+        self.vocabulary (Vocabulary): Integer ids of the tokens, shared by all the hashtags.
+        self.sentiment_scorer (SentimentScorer): Scores the tweets against the bundled sentiment lexicon.
 
     Methods
     -------
         __init__(self, ,main_window): Initialize Class Attributes.
         tweets_to_data_frame(self, tweets): Get tweets from tweeter's api and extract it into a data frame.
         remove_url(self, text): Remove url from the tweet.
-        word_counter(self, tweets, tag): A method to count the popular words.
+        warm_up(self): Builds the english stop words ahead of the first word count.
+        word_counter(self, tweets, tag, encoded=None): A method to count the popular words.
+        reach(self, tweets): HyperLogLog sketches of the distinct users & tweets of a hashtag.
+        encode(self, tweets): Tokenizes a hashtag's tweets once into the shared vocabulary's integer ids.
+        phrase_counter(self, tweets, tag, encoded=None): A method to count the popular phrases (bigrams & trigrams).
+        distinctive_terms(self, encoded, tags): The most distinctive words of each hashtag against the other ones.
+        sentiment(self, tweets, encoded=None): The lexicon based sentiment score of each tweet.
+        sentiment_to_data_frame(self, df, scores): A method to insert the sentiment distribution into a data frame.
+        phrase_counter_to_data_frame(self, df, phrase_count_df): A method to insert the phrase counter's analysis
+                                into a data frame.
         word_counter_to_data_frame(self, df, word_count_df): A method to insert the word counter analasis into a
                                 data frame.
         user_source_counter_to_data_frame(self, df, source_count_df): A method to insert the popular word counter's
@@ -28,6 +47,9 @@ class TweetAnalyzer:
         words_counter_graph(self, workbook, worksheet, word_count_df, tag): Creates a graph of popular words for
                                 each hashtag.
         user_source_graph(self, workbook, worksheet, df, tag): creates a graph of most common user's source.
+        sentiment_graph(self, workbook, worksheet, df, tag): Creates a graph of the sentiment distribution.
+        activity_graph(self, workbook, worksheet, activity_df): Creates a graph of each hashtag's tweets over time.
+        hour_of_week_sheet(self, writer, heatmap_df): Writes the hour of week heatmap of each hashtag.
 
     """
 
@@ -36,6 +58,8 @@ class TweetAnalyzer:
         """Initializing TweetAnalyzer Class"""
         self.__stop_words = None
         self.status_bar = main_window.get_statusbar_table
+        self.vocabulary = Vocabulary()
+        self.sentiment_scorer = SentimentScorer()
 
     def tweets_to_data_frame(self, tweets):
 
@@ -43,7 +67,7 @@ class TweetAnalyzer:
         Copy data to dataframe in order to export it into excel file.
 
         Args:
-            tweets (list): A list which stored the tweets of specific hashtag at a moment.
+            tweets (TweetBuffer): Columnar buffer which stored the tweets of specific hashtag at a moment.
 
         Parameters:
             df (DataFrame): Stores the data extracted from the tweets.
@@ -54,20 +78,8 @@ class TweetAnalyzer:
 
         try:
 
-            # Copies the Tweets's actual text.
-            df = pd.DataFrame(data=[tweet.full_text for tweet in tweets], columns=['tweets'])
-            # Copies Data according to df's title.
-            df['User'] = np.array([tweet.user.screen_name for tweet in tweets])
-            df['Followers'] = np.array([tweet.user.followers_count for tweet in tweets])
-            df['Friends'] = np.array([tweet.user.friends_count for tweet in tweets])
-            df['User Joined'] = np.array([tweet.user.created_at for tweet in tweets])
-            df['Location'] = np.array([tweet.user.location for tweet in tweets])
-            df['Tweet ID'] = np.array([tweet.id_str for tweet in tweets])
-            df['Tweet Length'] = np.array([len(tweet.full_text) for tweet in tweets])
-            df['Date'] = np.array([tweet.created_at for tweet in tweets])
-            df['Source'] = np.array([tweet.source for tweet in tweets])
-            df['Likes'] = np.array([tweet.favorite_count for tweet in tweets])
-            df['Retweets'] = np.array([tweet.retweet_count for tweet in tweets])
+            # Copies the buffer's columns according to df's titles.
+            df = tweets.to_data_frame()
 
             return df
 
@@ -100,76 +112,95 @@ class TweetAnalyzer:
             self.status_bar.clear()
             self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
 
-    def word_counter(self, tweets, tag):
+    def warm_up(self):
+
+        """
+        Builds the english stop words ahead of the first word count (e.g. by the start-up warm-up).
+
+        Args:
+            self: To set stop words attribute.
+
+        Parameters:
+            english_stop_words (list): English stop words.
+            __stop_words (set): Set of english stop words.
+
+        Returns:
+            None
+        """
+
+        #nltk's stop words doesnt compile into exe file...
+        english_stop_words = ['i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're", "you've",
+                      "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his',
+                      'himself', 'she', "she's", 'her', 'hers', 'herself', 'it', "it's", 'its', 'itself',
+                      'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this',
+                      'that', "that'll", 'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been',
+                      'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 'the',
+                      'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for',
+                      'with', 'about', 'against', 'between', 'into', 'through', 'during', 'before', 'after',
+                      'above', 'below', 'to', 'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under',
+                      'again', 'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
+                      'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not',
+                      'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can', 'will', 'just',
+                      'don', "don't", 'should', "should've", 'now', 'd', 'll', 'm', 'o', 're', 've', 'y', 'ain',
+                      'aren', "aren't", 'couldn', "couldn't", 'didn', "didn't", 'doesn', "doesn't", 'hadn',
+                      "hadn't", 'hasn', "hasn't", 'haven', "haven't", 'isn', "isn't", 'ma', 'mightn',
+                      "mightn't", 'mustn', "mustn't", 'needn', "needn't", 'shan', "shan't", 'shouldn',
+                      "shouldn't", 'wasn', "wasn't", 'weren', "weren't", 'won', "won't", 'wouldn', "wouldn't"]
+        self.__stop_words = set(english_stop_words)
+        self.__stop_words.add('RT'.lower())  # in case of retweet start
+        # Options to add in the future... 'RT @'
+
+    def word_counter(self, tweets, tag, encoded=None):
 
         """
-        A method to count the popular words for each hashtag in the list.
+        A method to count the popular words for each hashtag in the list - counted over the tweets's token ids (see
+        encode), so the tweets are tokenized once for the words, the phrases, the distinctive words & the sentiment.
 
         Args:
             self: To use stop words attribute.
-            tweets (list): List of tweets objects
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
             tag (str): The current hashtag from the list.
+            encoded (tuple): The tweets's token ids (see encode) - encoded here when None.
 
         Parameters:
-            clean_tweets (list): List of tweets without their url inside.
-            words_in_tweet (list): Taking the tweets from clean_tweets and makes it with lowercase and split the
-                                   words for each tweet into a list.
-            tweets_nsw (list): List of Words without the stop words.
-            all_words (list): List of all words across tweets.
-            counts_no_urls (Counter): Creates a counter to gauge the quantity for each word/
+            ids (ndarray): The token ids of all the tweets (lowercase words without urls).
+            skip (ndarray): The ids of the stop words & the hashtag (& the words beyond the vocabulary's capacity).
+            words (ndarray): The ids of the words without the stop words.
+            counts_no_urls (Counter): Gauges the quantity of each word - a bincount of the ids ('exact'), or a bounded
+                                      memory sketch fed with the words according to settings.WORD_COUNTER.
             clean_tweets_df (DataFrame): Creates a Pandas Data Frame with amount limitation of common words
-            english_stop_words (list): English stop words.
             __stop_words (set): Set of english stop words.
         Returns:
              clean_tweets_df (DataFrame): Creates a Pandas Data Frame with amount limitation of common words
         """
 
         try:
-            # Remove Urls from original tweet
-            clean_tweets = [self.remove_url(tweet.full_text) for tweet in tweets]
-
-            # Make all elements in the list lowercase
-            words_in_tweet = [tweet.lower().split() for tweet in clean_tweets]
-
             # List all the Stop words in english & our search hashtags in order to remove it
             if self.__stop_words is None:
-                #nltk's stop words doesnt compile into exe file...
-                english_stop_words = ['i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're", "you've",
-                              "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his',
-                              'himself', 'she', "she's", 'her', 'hers', 'herself', 'it', "it's", 'its', 'itself',
-                              'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this',
-                              'that', "that'll", 'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been',
-                              'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 'the',
-                              'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for',
-                              'with', 'about', 'against', 'between', 'into', 'through', 'during', 'before', 'after',
-                              'above', 'below', 'to', 'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under',
-                              'again', 'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
-                              'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not',
-                              'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can', 'will', 'just',
-                              'don', "don't", 'should', "should've", 'now', 'd', 'll', 'm', 'o', 're', 've', 'y', 'ain',
-                              'aren', "aren't", 'couldn', "couldn't", 'didn', "didn't", 'doesn', "doesn't", 'hadn',
-                              "hadn't", 'hasn', "hasn't", 'haven', "haven't", 'isn', "isn't", 'ma', 'mightn',
-                              "mightn't", 'mustn', "mustn't", 'needn', "needn't", 'shan', "shan't", 'shouldn',
-                              "shouldn't", 'wasn', "wasn't", 'weren', "weren't", 'won', "won't", 'wouldn', "wouldn't"]
-                self.__stop_words = set(english_stop_words)
-                self.__stop_words.add('RT'.lower())  # in case of retweet start
-                # Options to add in the future... 'RT @'
+                self.warm_up()
 
             # Add the hashtag without '#'
             self.__stop_words.add(tag[1:])
 
-            # New List of Words without the stop words/
-            tweets_nsw = [[word for word in tweet_words if not word in self.__stop_words]
-                          for tweet_words in words_in_tweet]
+            ids, _ = encoded if encoded is not None else self.encode(tweets)
+            skip = self.vocabulary.mask(self.__stop_words | {tag[1:].lower()})
 
-            # List of all words across tweets
-            all_words = list(itertools.chain(*tweets_nsw))
+            # Words without the stop words
+            words = ids[~skip[ids]]
 
-            # Create counter
-            counts_no_urls = collections.Counter(all_words)
+            if settings.WORD_COUNTER == 'exact':
+                # The most common ids of a single bincount - ties keep the vocabulary's order, like Counter
+                counts_no_urls = np.bincount(words, minlength=len(self.vocabulary))
+                top = np.argsort(-counts_no_urls, kind='stable')[:5]
+                top = top[counts_no_urls[top] > 0]
+                most_common = list(zip(self.vocabulary.decode(top.tolist()), counts_no_urls[top].tolist()))
+            else:
+                counts_no_urls = make_counter(settings.WORD_COUNTER)
+                counts_no_urls.update(self.vocabulary.decode(words.tolist()))
+                most_common = counts_no_urls.most_common(5)
 
             # Create a Pandas Data Frame with amount limitation of common words
-            clean_tweets_df = pd.DataFrame(counts_no_urls.most_common(5), columns=['Words', 'Count'])
+            clean_tweets_df = pd.DataFrame(most_common, columns=['Words', 'Count'])
 
             return clean_tweets_df
 
@@ -178,6 +209,168 @@ class TweetAnalyzer:
             self.status_bar.clear()
             self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
 
+    def encode(self, tweets):
+
+        """
+        Tokenizes a hashtag's tweets once into the shared vocabulary's integer ids - the phrase counter & the
+        distinctive words of all the hashtags reuse them.
+
+        Args:
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
+
+        Returns:
+            (ids, tweet_numbers): The token ids of all the tweets (lowercase words without urls) & the tweet of each.
+        """
+
+        try:
+
+            return self.vocabulary.encode_tweets(self.remove_url(text).lower().split() for text in tweets.texts)
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
+    def phrase_counter(self, tweets, tag, encoded=None):
+
+        """
+        A method to count the popular phrases (bigrams & trigrams) of a hashtag. The phrases are counted as packed
+        token ids with numpy, a batch of tweets at a time.
+
+        Args:
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
+            tag (str): The current hashtag from the list.
+            encoded (tuple): The tweets's token ids (see encode) - encoded here when None.
+
+        Parameters:
+            counter (NgramCounter): Counts the packed phrases.
+            ids (ndarray): The token ids.
+            tweet_numbers (ndarray): The tweet of each token.
+            bounds (ndarray): The first token of each batch.
+            skip (ndarray): The ids of the stop words & the hashtag - a phrase doesn't start or end with them.
+
+        Returns:
+            phrase_count_df (DataFrame): The most popular phrases & their count.
+        """
+
+        try:
+            if self.__stop_words is None:
+                self.warm_up()
+
+            ids, tweet_numbers = encoded if encoded is not None else self.encode(tweets)
+            skip = self.vocabulary.mask(self.__stop_words | {tag[1:].lower()})
+
+            counter = NgramCounter()
+            bounds = np.searchsorted(tweet_numbers, np.arange(0, len(tweets) + PHRASE_BATCH, PHRASE_BATCH))
+
+            for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+                counter.update(ids[start:end], tweet_numbers[start:end], skip)
+
+            return pd.DataFrame(counter.most_common(self.vocabulary, settings.TOP_PHRASES),
+                                columns=['Phrases', 'Count'])
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
+    def distinctive_terms(self, encoded, tags):
+
+        """
+        The most distinctive words of each hashtag against the session's other hashtags - one sparse term x hashtag
+        count matrix of the whole session, scored at once by settings.DISTINCTIVE_SCORE ('log_odds' or 'tfidf').
+
+        Args:
+            encoded (list): The token ids of each hashtag's tweets (see encode).
+            tags (list): The hashtags (same order as encoded).
+
+        Parameters:
+            counts (csc_matrix): The count of each word in each hashtag.
+            scores (csc_matrix): The score of each word in each hashtag.
+            skip (ndarray): The ids of the stop words & the hashtags themselves.
+
+        Returns:
+            distinctive_df (DataFrame): Hashtag, word, score & count of each hashtag's most distinctive words.
+        """
+
+        try:
+            if self.__stop_words is None:
+                self.warm_up()
+
+            counts = distinctive.term_tag_matrix(encoded, len(self.vocabulary))
+            if settings.DISTINCTIVE_SCORE == 'tfidf':
+                scores = distinctive.tf_idf(counts)
+            else:
+                scores = distinctive.log_odds(counts)
+
+            skip = self.vocabulary.mask(self.__stop_words | {tag[1:].lower() for tag in tags})
+            rows = [[tag, self.vocabulary.words[term], score, count]
+                    for tag, terms in zip(tags, distinctive.top_terms(scores, counts, skip, settings.TOP_DISTINCTIVE))
+                    for term, score, count in terms]
+
+            return pd.DataFrame(data=rows, columns=['Hashtag', 'Word', 'Score', 'Count'])
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
+    def sentiment(self, tweets, encoded=None):
+
+        """
+        The lexicon based sentiment score of each tweet, scored over the token ids at once (no loop per word).
+
+        Args:
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
+            encoded (tuple): The tweets's token ids (see encode) - encoded here when None.
+
+        Parameters:
+            ids (ndarray): The token ids.
+            tweet_numbers (ndarray): The tweet of each token.
+
+        Returns:
+            scores (ndarray): The compound score of each tweet, from -1 (negative) to 1 (positive).
+        """
+
+        try:
+            ids, tweet_numbers = encoded if encoded is not None else self.encode(tweets)
+
+            return self.sentiment_scorer.score(self.vocabulary, ids, tweet_numbers, len(tweets))
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
+    def reach(self, tweets):
+
+        """
+        Sketches the distinct users & distinct tweets of a hashtag - the sketches are mergeable, so the reach of all
+        the hashtags (or sessions) is their merge.
+
+        Args:
+            tweets (TweetBuffer): Columnar buffer of the hashtag's tweets.
+
+        Parameters:
+            users (HyperLogLog): Sketch of the distinct users.
+            tweet_ids (HyperLogLog): Sketch of the distinct tweets.
+
+        Returns:
+            (users, tweet_ids): The hashtag's HyperLogLog sketches.
+        """
+
+        try:
+            users, tweet_ids = HyperLogLog(), HyperLogLog()
+            users.add(tweets.user_ids)
+            tweet_ids.add(tweets.ids)
+
+            return users, tweet_ids
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
     def word_counter_to_data_frame(self, df, word_count_df):
 
         """
@@ -249,6 +442,68 @@ class TweetAnalyzer:
             self.status_bar.clear()
             self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
 
+    def phrase_counter_to_data_frame(self, df, phrase_count_df):
+
+        """
+        Creating Data Frame of Phrases Count for future extraction to Excel File.
+
+        Args:
+           df (DataFrame): Main DataFrame with all the relevant data.
+           phrase_count_df (DataFrame): A dataframe that contains the list of popular phrases and their quantity.
+
+        Parameters:
+            No Parameters.
+
+        Returns:
+             df (DataFrame): Main DataFrame with all the relevant data.
+        """
+
+        try:
+
+            df['Popular Phrases'] = phrase_count_df['Phrases']
+            df['Phrase Count'] = phrase_count_df['Count']
+
+            # Creates Space between columns.
+            df['    '] = " "
+
+            return df
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
+    def sentiment_to_data_frame(self, df, scores):
+
+        """
+        Creating Data Frame of the Sentiment Distribution for future extraction to Excel File.
+
+        Args:
+           df (DataFrame): Main DataFrame with all the relevant data.
+           scores (ndarray): The sentiment score of each tweet (see sentiment).
+
+        Parameters:
+            labels (list): The score ranges.
+            counts (ndarray): The number of tweets in each range.
+
+        Returns:
+             df (DataFrame): Main DataFrame with all the relevant data.
+        """
+
+        try:
+
+            labels, counts = self.sentiment_scorer.distribution(scores)
+
+            df['Sentiment Range'] = pd.Series(labels)
+            df['Sentiment Tweets'] = pd.Series(counts)
+
+            return df
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
     def words_counter_graph(self, workbook, worksheet, word_count_df, tag):
 
         """
@@ -278,8 +533,8 @@ class TweetAnalyzer:
             # Configure the series of the chart from specific cells inside the excel file.
 
             chart.add_series({
-                'categories': "=" + "'" + tag + "'" + '!$O$2:$O$' + str(len(word_count_df['Words'])),
-                'values': "=" + "'" + tag + "'" + '!$P$2:$P$' + str(len(word_count_df['Words'])),
+                'categories': "=" + "'" + tag + "'" + '!$P$2:$P$' + str(len(word_count_df['Words'])),
+                'values': "=" + "'" + tag + "'" + '!$Q$2:$Q$' + str(len(word_count_df['Words'])),
                 'gap': 10,
             })
 
@@ -291,7 +546,7 @@ class TweetAnalyzer:
             chart.set_legend({'position': 'none'})
 
             # Insert the chart into the worksheet.
-            worksheet.insert_chart('W1', chart)
+            worksheet.insert_chart('AA1', chart)
 
         except Exception as e:
             # Clear The Status Bar
@@ -324,8 +579,8 @@ class TweetAnalyzer:
             # Configure the pie graph with categories & values from the specific df
             graph.add_series({
                 'name': 'Most UserSource',
-                'categories': "='" + tag + "'!$R$2:$R$" + str(len(df['Unique Source'])),
-                'values': "='" + tag + "'!$S$2:$S$" + str(len(df['Source Count'])),
+                'categories': "='" + tag + "'!$S$2:$S$" + str(len(df['Unique Source'])),
+                'values': "='" + tag + "'!$T$2:$T$" + str(len(df['Source Count'])),
                 'points': [
                     {'fill': {'color': '#5ABA10'}},
                     {'fill': {'color': '#FE110E'}},
@@ -337,8 +592,143 @@ class TweetAnalyzer:
             graph.set_title({'name': 'User Source'})
 
             # Insert the graph into the worksheet (with an offset)
-            worksheet.insert_chart('AE1', graph)
+            worksheet.insert_chart('AI1', graph)
+
+        except Exception as e:
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
+    def sentiment_graph(self, workbook, worksheet, df, tag):
+
+        """
+        Creates a Chart inside excel file of the Sentiment Distribution analysis.
+        Takes data that copied before from specific two consecutive cells.
+
+        Args:
+            workbook (Workbook): Get the xlsxwriter objects from the dataframe writer object.
+            worksheet (Worksheet):  Object for the Excel worksheet which has the ability to insert items.
+            df (DataFrame): Main DataFrame with all the relevant data.
+            tag (str): Current Hashtag.
+
+        Parameters:
+            chart (Workbook): Graph that will display the data sample
+
+        Returns:
+            None
+        """
+
+        try:
+            # Create a chart object.
+            chart = workbook.add_chart({'type': 'column'})
+
+            # Add a chart title.
+            chart.set_title({'name': 'Sentiment'})
+
+            # Configure the series of the chart from specific cells inside the excel file.
+            rows = str(df['Sentiment Range'].count() + 1)
+            chart.add_series({
+                'categories': "='" + tag + "'!$Y$2:$Y$" + rows,
+                'values': "='" + tag + "'!$Z$2:$Z$" + rows,
+                'gap': 10,
+            })
+
+            # Configure the chart axes.
+            chart.set_x_axis({'name': 'Score'})
+            chart.set_y_axis({'name': 'Tweets'})
+
+            # Turn off chart legend. It is on by default in Excel.
+            chart.set_legend({'position': 'none'})
+
+            # Insert the chart into the worksheet.
+            worksheet.insert_chart('AQ1', chart)
 
         except Exception as e:
+            # Clear The Status Bar
             self.status_bar.clear()
-            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
\ No newline at end of file
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
+    def activity_graph(self, workbook, worksheet, activity_df):
+
+        """
+        Creates a Chart inside excel file of the Activity analysis - a line of tweets over time for each hashtag.
+        Takes the rows of each hashtag, which are one after the other.
+
+        Args:
+            workbook (Workbook): Get the xlsxwriter objects from the dataframe writer object.
+            worksheet (Worksheet):  Object for the Excel worksheet which has the ability to insert items.
+            activity_df (DataFrame): Tweets, likes & retweets of each hashtag per time bucket (see
+                                     activity.time_series).
+
+        Parameters:
+            chart (Workbook): Graph that will display the data sample
+            rows (ndarray): The sheet's rows of a hashtag.
+
+        Returns:
+            None
+        """
+
+        try:
+            # Create a chart object.
+            chart = workbook.add_chart({'type': 'line'})
+
+            # Add a chart title.
+            chart.set_title({'name': 'Activity'})
+
+            # A series for each hashtag from its rows (after the header row).
+            for tag in activity_df['Hashtag'].unique():
+                rows = np.flatnonzero((activity_df['Hashtag'] == tag).to_numpy()) + 2
+                first, last = str(rows[0]), str(rows[-1])
+                chart.add_series({
+                    'name': tag,
+                    'categories': "='Activity'!$B$" + first + ":$B$" + last,
+                    'values': "='Activity'!$C$" + first + ":$C$" + last,
+                })
+
+            # Configure the chart axes.
+            chart.set_x_axis({'name': 'Time', 'date_axis': True, 'num_format': 'dd/mm hh:mm'})
+            chart.set_y_axis({'name': 'Tweets'})
+
+            # Insert the chart into the worksheet.
+            worksheet.insert_chart('G2', chart, {'x_scale': 2, 'y_scale': 1.5})
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
+
+    def hour_of_week_sheet(self, writer, heatmap_df):
+
+        """
+        Writes the hour of week heatmap of each hashtag into the 'Hour of Week' sheet - a day x hour table for each
+        hashtag, one under the other, colored by a 3 color scale.
+
+        Args:
+            writer (ExcelWriter): The Pandas Excel writer of the export.
+            heatmap_df (DataFrame): The tweets of each hashtag & day in each hour (see activity.hour_of_week).
+
+        Parameters:
+            row (int): The first row of the current hashtag's table.
+
+        Returns:
+            None
+        """
+
+        try:
+            row = 0
+
+            for tag in heatmap_df.index.get_level_values(0).unique():
+                table = heatmap_df.loc[tag].set_axis(list(DAYS))
+                table.to_excel(writer, sheet_name='Hour of Week', startrow=row + 1)
+
+                worksheet = writer.sheets['Hour of Week']
+                worksheet.write(row, 0, tag)
+
+                # Colors the hashtag's day x hour cells
+                worksheet.conditional_format(row + 2, 1, row + 1 + len(DAYS), 24, {'type': '3_color_scale'})
+
+                row += len(DAYS) + 3
+
+        except Exception as e:
+            # Clear The Status Bar
+            self.status_bar.clear()
+            self.status_bar.append('<center>Error Has Occurred: {0}'.format(e))
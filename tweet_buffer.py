@@ -0,0 +1,269 @@
+import itertools
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from user_cache import shared_cache, UserProfile
+
+# Twitter's created_at format, e.g. 'Wed Oct 10 20:19:24 +0000 2018'
+TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S +0000 %Y"
+
+# Month of each month's name in created_at, by its 3 letters packed into an int
+MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6, 'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10,
+          'Nov': 11, 'Dec': 12}
+MONTH_KEYS = np.array(sorted((ord(name[0]) << 16) | (ord(name[1]) << 8) | ord(name[2]) for name in MONTHS))
+MONTH_NUMBERS = np.array([MONTHS[chr(key >> 16) + chr((key >> 8) & 255) + chr(key & 255)] for key in MONTH_KEYS])
+
+# Profile of a user which isn't cached (deleted or suspended before its lookup)
+UNKNOWN_USER = UserProfile('', 0, 0, None, '', 0)
+
+# Removes the html anchor around the tweet's source, e.g. '<a href="...">Twitter for iPhone</a>'
+SOURCE_TAG = re.compile(r"<[^>]+>")
+
+
+class TweetBuffer:
+
+    """
+    Columnar buffer of the tweets of a single hashtag.
+
+    Every extracted field is kept in its own list (column) which is filled straight from the decoded json of the
+    search results, so no tweepy Status/User model has to be built for each tweet. The tweets only keep their user's
+    id - the user's profile is kept once in the user cache.
+
+    Attributes:
+        users (UserCache): The cache of the tweets users's profiles.
+        texts (list): Tweet's full text.
+        user_ids (list): User's id.
+        ids (list): Tweet's id (int).
+        dates (list): Tweet's created_at string.
+        sources (list): Tweet's source without its html anchor.
+        likes (list): Tweet's favorite count.
+        retweets (list): Tweet's retweet count.
+        hashtags (list): Tuple of the lowercase hashtags (without '#') found in the tweet's entities.
+        failure (str): Error of the hashtag's search when it failed (None when it succeeded).
+
+    Methods:
+        __init__(self, users=shared_cache): Initialize the empty columns.
+        __len__(self): Amount of tweets inside the buffer.
+        append(self, status): Append a single decoded status (dict) to the columns.
+        extend(self, statuses): Append a list of decoded statuses (dicts) to the columns.
+        to_data_frame(self): Build the per-hashtag data frame that is exported to excel.
+        columns(self): The buffer's columns by name.
+        from_columns(cls, columns, users=shared_cache): Build a buffer from columns (e.g. of a session snapshot).
+    """
+
+    # Names of the column attributes
+    COLUMNS = ('texts', 'user_ids', 'ids', 'dates', 'sources', 'likes', 'retweets', 'hashtags')
+
+    def __init__(self, users=shared_cache):
+
+        """Initializing TweetBuffer Class"""
+        self.users = users
+        self.texts = list()
+        self.user_ids = list()
+        self.ids = list()
+        self.dates = list()
+        self.sources = list()
+        self.likes = list()
+        self.retweets = list()
+        self.hashtags = list()
+        self.failure = None
+
+    def __len__(self):
+
+        return len(self.ids)
+
+    def append(self, status):
+
+        """
+        Append a single decoded status to the columns.
+
+        Args:
+            status (dict): A tweet as returned by the search endpoint with tweet_mode='extended'.
+
+        Returns:
+            None
+        """
+
+        self.extend((status,))
+
+    def extend(self, statuses):
+
+        """
+        Append decoded statuses to the columns.
+
+        Args:
+            statuses (iterable): Tweets (dicts) as returned by the search endpoint with tweet_mode='extended' or by the
+                                 filter stream.
+
+        Returns:
+            None
+        """
+
+        now = time.time()
+
+        for status in statuses:
+            user = status['user']
+
+            # Stream's tweets keep their full text & entities inside 'extended_tweet'
+            extended = status.get('extended_tweet', status)
+            text = extended.get('full_text') or status.get('text', '')
+
+            # The whole row is read before it's appended - a malformed status can't leave the columns misaligned
+            row = (text, user['id'], status['id'], status['created_at'], SOURCE_TAG.sub("", status.get('source', '')),
+                   status['favorite_count'], status['retweet_count'],
+                   tuple(tag['text'].lower() for tag in extended.get('entities', {}).get('hashtags', ())))
+
+            self.users.add(user, now)
+
+            for column, value in zip((self.texts, self.user_ids, self.ids, self.dates, self.sources, self.likes,
+                                      self.retweets, self.hashtags), row):
+                column.append(value)
+
+    def columns(self):
+
+        """
+        The buffer's columns by name.
+
+        Returns:
+            columns (dict): Column name -> list.
+        """
+
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+    @classmethod
+    def from_columns(cls, columns, users=shared_cache):
+
+        """
+        Build a buffer from columns, e.g. of a session snapshot.
+
+        Args:
+            columns (dict): Column name -> list (see COLUMNS).
+            users (UserCache): The cache of the tweets users's profiles.
+
+        Returns:
+            tweets (TweetBuffer): The buffer.
+        """
+
+        tweets = cls(users)
+        for name in cls.COLUMNS:
+            setattr(tweets, name, list(columns[name]))
+
+        tweets.hashtags = [tuple(hashtags) for hashtags in tweets.hashtags]
+
+        return tweets
+
+    def to_data_frame(self):
+
+        """
+        Build the data frame of the buffer's tweets in order to export it into excel file.
+
+        Parameters:
+            codes (ndarray): Index of each tweet's user inside the distinct users.
+            profiles (list): Profile of each distinct user - resolved once per user, not once per tweet.
+
+        Returns:
+            df (DataFrame): Stores the data extracted from the tweets.
+        """
+
+        codes, user_ids = pd.factorize(np.array(self.user_ids, dtype=np.int64))
+        profiles = [self.users.get(user_id) or UNKNOWN_USER for user_id in user_ids.tolist()]
+        screen_names, followers, friends, user_joined, locations, _ = (zip(*profiles) if profiles
+                                                                       else ((),) * len(UNKNOWN_USER))
+
+        df = pd.DataFrame(data=self.texts, columns=['tweets'])
+        df['User'] = np.array(screen_names, dtype=object)[codes]
+        df['Followers'] = np.array(followers, dtype=np.int64)[codes]
+        df['Friends'] = np.array(friends, dtype=np.int64)[codes]
+        df['User Joined'] = pd.to_datetime(np.array(user_joined, dtype=object)[codes], format=TWITTER_DATE_FORMAT)
+        df['Location'] = np.array(locations, dtype=object)[codes]
+        df['Tweet ID'] = np.array([str(tweet_id) for tweet_id in self.ids])
+        df['Tweet Length'] = np.array([len(text) for text in self.texts])
+        df['Date'] = parse_dates(self.dates)
+        df['Source'] = np.array(self.sources)
+        df['Likes'] = np.array(self.likes)
+        df['Retweets'] = np.array(self.retweets)
+
+        return df
+
+
+def parse_dates(dates):
+
+    """
+    Parses created_at strings into datetime64 - the fixed width format is parsed as a byte matrix with numpy, instead
+    of a strptime per date. Any other strings are parsed by pandas.
+
+    Args:
+        dates (list): created_at strings, e.g. 'Wed Oct 10 20:19:24 +0000 2018'.
+
+    Parameters:
+        chars (ndarray): The dates x 30 bytes of the strings.
+        digits (ndarray): The value of each byte as a digit.
+
+    Returns:
+        dates (DatetimeIndex): The dates (UTC, without a timezone).
+    """
+
+    try:
+        chars = np.array(dates, dtype='S30').view(np.uint8).reshape(len(dates), 30).astype(np.int64)
+    except (UnicodeEncodeError, TypeError, ValueError):
+        return pd.to_datetime(dates, format=TWITTER_DATE_FORMAT)
+
+    digits = chars - ord('0')
+    month_keys = (chars[:, 4] << 16) | (chars[:, 5] << 8) | chars[:, 6]
+    month_index = np.minimum(np.searchsorted(MONTH_KEYS, month_keys), len(MONTH_KEYS) - 1)
+
+    # Every date must have the format's separators, digits & a month name
+    numbers = digits[:, [8, 9, 11, 12, 14, 15, 17, 18, 26, 27, 28, 29]]
+    separators = chars[:, [3, 7, 10, 13, 16, 19, 20, 21, 22, 23, 24, 25]]
+    if not (np.all((numbers >= 0) & (numbers <= 9)) and np.all(separators == np.array([ord(c) for c in '   :: +0000 ']))
+            and np.all(MONTH_KEYS[month_index] == month_keys)):
+        return pd.to_datetime(dates, format=TWITTER_DATE_FORMAT)
+
+    years = digits[:, 26] * 1000 + digits[:, 27] * 100 + digits[:, 28] * 10 + digits[:, 29]
+    months = (years - 1970) * 12 + MONTH_NUMBERS[month_index] - 1
+    seconds = ((digits[:, 8] * 10 + digits[:, 9] - 1) * 86400 + (digits[:, 11] * 10 + digits[:, 12]) * 3600
+               + (digits[:, 14] * 10 + digits[:, 15]) * 60 + digits[:, 17] * 10 + digits[:, 18])
+
+    return pd.DatetimeIndex((months.astype('datetime64[M]').astype('datetime64[s]') + seconds.astype('timedelta64[s]'))
+                            .astype('datetime64[ns]'))
+
+
+def session_frame(tweet_matrix, tag_list):
+
+    """
+    Combines the tweets of all the hashtags into a single data frame, so the session's analyses run as a single
+    groupby instead of a data frame per hashtag. The dates are parsed into datetime64 once, for all the hashtags.
+
+    Args:
+        tweet_matrix (list): The TweetBuffer of each hashtag.
+        tag_list (iterable): Hashtags list itself (same order as tweet_matrix).
+
+    Parameters:
+        lengths (ndarray): Number of tweets of each hashtag.
+
+    Returns:
+        frame (DataFrame): 'hashtag' (categorical, in the hashtags's order), 'tweet_id', 'user_id', 'date', 'likes' &
+                           'retweets' of each tweet of each hashtag.
+    """
+
+    tags = list(tag_list)
+    lengths = np.array([len(tweets) for tweets in tweet_matrix], dtype=np.int64)
+
+    # Each integer column of all the hashtags, one after the other
+    columns = {name: np.fromiter(itertools.chain.from_iterable(getattr(tweets, name) for tweets in tweet_matrix),
+                                 dtype=np.int64, count=int(lengths.sum()))
+               for name in ('ids', 'user_ids', 'likes', 'retweets')}
+
+    frame = pd.DataFrame({
+        'hashtag': pd.Categorical.from_codes(np.repeat(np.arange(len(tags)), lengths), categories=tags),
+        'tweet_id': columns['ids'],
+        'user_id': columns['user_ids'],
+        'date': parse_dates(list(itertools.chain.from_iterable(tweets.dates for tweets in tweet_matrix))),
+        'likes': columns['likes'],
+        'retweets': columns['retweets'],
+    })
+
+    return frame
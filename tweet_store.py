@@ -0,0 +1,218 @@
+import sqlite3
+
+import pandas as pd
+
+import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    tweet_id INTEGER NOT NULL,
+    hashtag TEXT NOT NULL,
+    text TEXT,
+    user TEXT,
+    followers INTEGER,
+    friends INTEGER,
+    user_joined TEXT,
+    location TEXT,
+    tweet_length INTEGER,
+    date TEXT,
+    source TEXT,
+    likes INTEGER,
+    retweets INTEGER,
+    session TEXT,
+    sentiment REAL,
+    PRIMARY KEY (tweet_id, hashtag)
+);
+CREATE INDEX IF NOT EXISTS idx_tweets_hashtag ON tweets (hashtag, date);
+CREATE INDEX IF NOT EXISTS idx_tweets_user ON tweets (user, date);
+CREATE INDEX IF NOT EXISTS idx_tweets_date ON tweets (date);
+"""
+
+# SQLite dates are stored as ISO text so they sort & compare correctly
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Columns added after the first release - added to the data bases which were created without them
+MIGRATIONS = [("sentiment", "REAL")]
+
+# Ids of a single metrics select - below SQLite's limit of host parameters
+METRICS_BATCH = 900
+
+COLUMNS = ("tweet_id", "hashtag", "text", "user", "followers", "friends", "user_joined", "location", "tweet_length",
+           "date", "source", "likes", "retweets", "session", "sentiment")
+
+
+class TweetStore:
+
+    """
+    Local SQLite data base of all the tweets of every session.
+
+    The data base runs in WAL mode, so it can be queried while a session appends to it. Each hashtag is appended in a
+    single transaction with executemany. A tweet is stored once per hashtag (tweet id & hashtag are the primary key) -
+    searching it again updates its data. The tweets are indexed by id, hashtag, user and date. The columns added by
+    later versions (MIGRATIONS) are added to an existing data base when it's opened.
+
+    Attributes:
+        path (str): The data base file.
+        connection (Connection): SQLite connection.
+
+    Methods:
+        __init__(self, path=settings.DATABASE_FILE): Class's constructor - opens & creates the data base.
+        append(self, hashtag, df, session): Appends the tweets data frame of a hashtag.
+        query(self, hashtag=None, user=None, since=None, until=None): Selects tweets into a data frame.
+        tweet_ids(self, hashtag=None): The distinct ids of the stored tweets.
+        update_metrics(self, metrics): Updates the likes & retweets of stored tweets.
+        metrics(self, tweet_ids): The stored likes & retweets of tweets.
+        close(self): Closes the connection.
+    """
+
+    def __init__(self, path=settings.DATABASE_FILE):
+
+        """Initializing TweetStore Class"""
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.__migrate()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def __migrate(self):
+
+        # Adds the missing columns of a data base of an earlier version
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(tweets)")}
+
+        with self.connection:
+            for name, column_type in MIGRATIONS:
+                if name not in columns:
+                    self.connection.execute("ALTER TABLE tweets ADD COLUMN {} {}".format(name, column_type))
+
+    def close(self):
+
+        """Closes the connection."""
+        self.connection.close()
+
+    def append(self, hashtag, df, session):
+
+        """
+        Appends the tweets data frame of a hashtag in a single transaction.
+
+        Args:
+            hashtag (str): The hashtag of the tweets.
+            df (DataFrame): The hashtag's data frame (see TweetBuffer.to_data_frame) - with its 'Sentiment' column
+                            when scored.
+            session (str): Name of the session (its excel file).
+
+        Returns:
+            None
+        """
+
+        rows = zip(df['Tweet ID'].astype('int64').tolist(), [hashtag] * len(df.index), df['tweets'].tolist(),
+                   df['User'].tolist(), df['Followers'].tolist(), df['Friends'].tolist(),
+                   df['User Joined'].dt.strftime(DATE_FORMAT).tolist(), df['Location'].tolist(),
+                   df['Tweet Length'].tolist(), df['Date'].dt.strftime(DATE_FORMAT).tolist(), df['Source'].tolist(),
+                   df['Likes'].tolist(), df['Retweets'].tolist(), [session] * len(df.index),
+                   df['Sentiment'].tolist() if 'Sentiment' in df else [None] * len(df.index))
+
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO tweets ({}) VALUES ({})".format(
+                ", ".join(COLUMNS), ", ".join("?" * len(COLUMNS))), rows)
+
+    def query(self, hashtag=None, user=None, since=None, until=None):
+
+        """
+        Selects tweets into a data frame, e.g. all the tweets of #tag from a user since last week.
+
+        Args:
+            hashtag (str): Only tweets of this hashtag.
+            user (str): Only tweets of this user (screen name).
+            since (datetime): Only tweets from this date.
+            until (datetime): Only tweets before this date.
+
+        Returns:
+            df (DataFrame): The selected tweets, newest first.
+        """
+
+        conditions, params = list(), list()
+
+        if hashtag is not None:
+            conditions.append("hashtag = ?")
+            params.append(hashtag)
+        if user is not None:
+            conditions.append("user = ?")
+            params.append(user)
+        if since is not None:
+            conditions.append("date >= ?")
+            params.append(since.strftime(DATE_FORMAT))
+        if until is not None:
+            conditions.append("date < ?")
+            params.append(until.strftime(DATE_FORMAT))
+
+        sql = "SELECT * FROM tweets"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        return pd.read_sql_query(sql + " ORDER BY date DESC", self.connection, params=params,
+                                 parse_dates=['date', 'user_joined'])
+
+    def tweet_ids(self, hashtag=None):
+
+        """
+        The distinct ids of the stored tweets.
+
+        Args:
+            hashtag (str): Only tweets of this hashtag.
+
+        Returns:
+            ids (list): The tweet ids.
+        """
+
+        if hashtag is None:
+            rows = self.connection.execute("SELECT DISTINCT tweet_id FROM tweets")
+        else:
+            rows = self.connection.execute("SELECT tweet_id FROM tweets WHERE hashtag = ?", (hashtag,))
+
+        return [row[0] for row in rows]
+
+    def update_metrics(self, metrics):
+
+        """
+        Updates the likes & retweets of stored tweets (in every hashtag they are stored with) in a single transaction.
+
+        Args:
+            metrics (iterable): (likes, retweets, tweet_id) tuples.
+
+        Returns:
+            None
+        """
+
+        with self.connection:
+            self.connection.executemany("UPDATE tweets SET likes = ?, retweets = ? WHERE tweet_id = ?", metrics)
+
+    def metrics(self, tweet_ids):
+
+        """
+        The stored likes & retweets of tweets (e.g. refreshed by hydrate), selected by batches of ids.
+
+        Args:
+            tweet_ids (list): The tweet ids.
+
+        Returns:
+            metrics (dict): Tweet id -> (likes, retweets) of the stored tweets.
+        """
+
+        metrics = dict()
+
+        for i in range(0, len(tweet_ids), METRICS_BATCH):
+            batch = tweet_ids[i:i + METRICS_BATCH]
+            rows = self.connection.execute("SELECT tweet_id, likes, retweets FROM tweets WHERE tweet_id IN ({}) AND "
+                                           "likes IS NOT NULL".format(", ".join("?" * len(batch))), batch)
+            metrics.update((row[0], row[1:]) for row in rows)
+
+        return metrics
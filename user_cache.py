@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import (OrderedDict, namedtuple)
+
+import settings
+
+# Compact profile of a user - the only user fields the analysis needs
+UserProfile = namedtuple('UserProfile', ['screen_name', 'followers', 'friends', 'created_at', 'location',
+                                         'fetched_at'])
+
+
+class UserCache:
+
+    """
+    Cache of the users's profiles (user id -> UserProfile) shared by all the hashtags & sessions.
+
+    The tweets only keep their user's id, so a prolific user's profile is stored once instead of once per tweet. A
+    profile is taken from the first tweet which embeds it and kept for `ttl` seconds - expired profiles are refreshed
+    by the next embedded copy or in bulk through users/lookup. Beyond `max_size` profiles the least recently added or
+    read profile is evicted, so a long running app doesn't keep every user it ever saw. The cache is shared by the
+    search worker, the thread pools & the asyncio executor, so every access holds its lock.
+
+    Attributes:
+        ttl (float): Seconds a profile stays fresh.
+        max_size (int): Maximum cached profiles.
+        profiles (OrderedDict): User id -> UserProfile, least recently used first.
+
+    Methods:
+        __init__(self, ttl=settings.USER_CACHE_TTL, max_size=settings.USER_CACHE_SIZE): Class's constructor.
+        __len__(self): Number of cached profiles.
+        add(self, user, now=None): Caches the profile of a user object, unless a fresh one is already cached.
+        put(self, user_id, profile): Caches a profile, unless a newer one is already cached.
+        get(self, user_id): The profile of a user (None when unknown).
+        expired(self, user_ids): The users which are unknown or whose profiles are expired.
+        refresh(self, search_client, user_ids): Refreshes the expired profiles through users/lookup.
+    """
+
+    def __init__(self, ttl=settings.USER_CACHE_TTL, max_size=settings.USER_CACHE_SIZE):
+
+        """Initializing UserCache Class"""
+        self.ttl = ttl
+        self.max_size = max_size
+        self.profiles = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __store(self, user_id, profile):
+
+        # The newest profile goes last - the least recently used ones are evicted from the front (lock held)
+        self.profiles[user_id] = profile
+        self.profiles.move_to_end(user_id)
+
+        while len(self.profiles) > self.max_size:
+            self.profiles.popitem(last=False)
+
+    def __add(self, user, now):
+
+        # Caches a user object's profile unless a fresh one is cached - marks it as recently used (lock held)
+        profile = self.profiles.get(user['id'])
+
+        if profile is None or now - profile.fetched_at > self.ttl:
+            self.__store(user['id'], UserProfile(user['screen_name'], user['followers_count'], user['friends_count'],
+                                                 user['created_at'], user['location'], now))
+        else:
+            self.profiles.move_to_end(user['id'])
+
+    def __len__(self):
+
+        with self.__lock:
+            return len(self.profiles)
+
+    def add(self, user, now=None):
+
+        """
+        Caches the profile of a user object, unless a fresh one is already cached.
+
+        Args:
+            user (dict): A user object (embedded in a tweet or returned by users/lookup).
+            now (float): Time of the user object (now when None).
+
+        Returns:
+            None
+        """
+
+        now = time.time() if now is None else now
+
+        with self.__lock:
+            self.__add(user, now)
+
+    def put(self, user_id, profile):
+
+        """
+        Caches a profile (e.g. of a session snapshot), unless a newer one is already cached.
+
+        Args:
+            user_id (int): The user's id.
+            profile (UserProfile): The user's profile.
+
+        Returns:
+            None
+        """
+
+        with self.__lock:
+            cached = self.profiles.get(user_id)
+
+            if cached is None or cached.fetched_at < profile.fetched_at:
+                self.__store(user_id, profile)
+
+    def get(self, user_id):
+
+        """The profile of a user (None when unknown)."""
+
+        with self.__lock:
+            profile = self.profiles.get(user_id)
+
+            if profile is not None:
+                self.profiles.move_to_end(user_id)
+
+            return profile
+
+    def expired(self, user_ids):
+
+        """
+        The users which are unknown or whose profiles are expired.
+
+        Args:
+            user_ids (iterable): User ids.
+
+        Returns:
+            expired (list): The distinct expired user ids.
+        """
+
+        now = time.time()
+        user_ids = set(user_ids)
+
+        with self.__lock:
+            profiles = [self.profiles.get(user_id) for user_id in user_ids]
+
+        return [user_id for user_id, profile in zip(user_ids, profiles)
+                if profile is None or now - profile.fetched_at > self.ttl]
+
+    def refresh(self, search_client, user_ids):
+
+        """
+        Refreshes the unknown & expired profiles in bulk through users/lookup (100 users per call).
+
+        Args:
+            search_client (SearchClient): The client which performs the lookups.
+            user_ids (iterable): User ids.
+
+        Returns:
+            Number of refreshed profiles.
+        """
+
+        expired = self.expired(user_ids)
+
+        # The lookups run without the lock - the other threads keep reading the cache meanwhile
+        users = search_client.lookup_users(expired)
+        now = time.time()
+
+        with self.__lock:
+            for user in users:
+                # A looked up profile is always newer than the cached one
+                self.profiles.pop(user['id'], None)
+                self.__add(user, now)
+
+        return len(expired)
+
+
+# The cache shared by all the hashtags & sessions
+shared_cache = UserCache()
+
+
+def refresh_users(search_client, tweet_matrix, users=shared_cache):
+
+    """
+    Refreshes the expired profiles of a session's users in bulk - best effort: a failed lookup (e.g. a 429) is logged
+    and the profiles which weren't refreshed keep their cached copy, so the session is still exported.
+
+    Args:
+        search_client (SearchClient): The client which performs the lookups.
+        tweet_matrix (list): The TweetBuffer of each hashtag.
+        users (UserCache): The cache of the tweets users's profiles.
+
+    Returns:
+        Number of refreshed profiles (0 when the refresh failed).
+    """
+
+    try:
+        return users.refresh(search_client, [user_id for tweets in tweet_matrix for user_id in tweets.user_ids])
+    except Exception as e:
+        print('Users Refresh Error: {0}'.format(e))
+        return 0
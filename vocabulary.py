@@ -0,0 +1,215 @@
+import numpy as np
+
+import settings
+
+# Bits of a token id - an n-gram of up to 3 ids is packed into a single int64
+ID_BITS = 21
+
+# Id of the words beyond the vocabulary's capacity
+UNKNOWN = 0
+
+
+class Vocabulary:
+
+    """
+    Integer encoding of the tokens, shared by all the hashtags & analyses of a session.
+
+    Every distinct token gets the next id, so the token lists of the tweets become a flat int array which numpy can
+    count n-grams of. The ids fit ID_BITS bits - the tokens beyond the capacity are all encoded as UNKNOWN.
+
+    Attributes:
+        capacity (int): Maximal number of ids.
+        ids (dict): Token -> its id.
+        words (list): Id -> its token.
+
+    Methods:
+        __init__(self, capacity=1 << ID_BITS): Class's constructor.
+        __len__(self): Number of ids.
+        encode(self, tokens): The ids of tokens, adding the new ones.
+        encode_tweets(self, token_lists): The ids of the tweets's tokens as a flat array & the tweet of each token.
+        decode(self, ids): The tokens of ids.
+        mask(self, tokens): Boolean array of the ids, set for the given tokens (& UNKNOWN).
+    """
+
+    def __init__(self, capacity=1 << ID_BITS):
+
+        """Initializing Vocabulary Class"""
+        self.capacity = capacity
+        self.ids = dict()
+        self.words = ['<unknown>']
+
+    def __len__(self):
+
+        return len(self.words)
+
+    def encode(self, tokens):
+
+        """
+        The ids of tokens, adding the new ones (UNKNOWN once the vocabulary is full).
+
+        Args:
+            tokens (list): The tokens.
+
+        Returns:
+            ids (list): The id of each token.
+        """
+
+        ids = self.ids
+        encoded = list()
+
+        for token in tokens:
+            token_id = ids.get(token)
+
+            if token_id is None:
+                if len(self.words) < self.capacity:
+                    token_id = ids[token] = len(self.words)
+                    self.words.append(token)
+                else:
+                    token_id = UNKNOWN
+
+            encoded.append(token_id)
+
+        return encoded
+
+    def encode_tweets(self, token_lists):
+
+        """
+        The ids of the tweets's tokens as a flat array & the tweet of each token.
+
+        Args:
+            token_lists (iterable): The token list of each tweet.
+
+        Returns:
+            (ids, tweets): int64 arrays - each token's id & its tweet's number.
+        """
+
+        ids, lengths = list(), list()
+
+        for tokens in token_lists:
+            ids.extend(self.encode(tokens))
+            lengths.append(len(tokens))
+
+        return (np.array(ids, dtype=np.int64),
+                np.repeat(np.arange(len(lengths), dtype=np.int64), np.array(lengths, dtype=np.int64)))
+
+    def decode(self, ids):
+
+        """The tokens of ids."""
+
+        return [self.words[token_id] for token_id in ids]
+
+    def mask(self, tokens):
+
+        """
+        Boolean array of the ids, set for the given tokens (& UNKNOWN).
+
+        Args:
+            tokens (iterable): The tokens, e.g. the stop words.
+
+        Returns:
+            mask (ndarray): True at the ids of the tokens.
+        """
+
+        mask = np.zeros(len(self.words), dtype=bool)
+        mask[UNKNOWN] = True
+        mask[[self.ids[token] for token in tokens if token in self.ids]] = True
+
+        return mask
+
+
+class NgramCounter:
+
+    """
+    Counts the n-grams (phrases) of integer encoded tweets - each n-gram is packed into an int64 key and counted with
+    numpy, instead of a Counter of string tuples.
+
+    An n-gram never crosses its tweet's end, and it neither starts nor ends with a skipped token (stop words, the
+    hashtag itself & UNKNOWN). Only the `capacity` most counted n-grams are kept between the batches, so the memory is
+    bounded - `dropped` is the highest count which was dropped (a count may be under by that much).
+
+    Attributes:
+        orders (tuple): The counted n-gram lengths (up to 3).
+        capacity (int): Maximal number of kept n-grams.
+        keys (ndarray): The packed n-grams, sorted - an n-gram's first id is never UNKNOWN, so its n is the number of
+                        ID_BITS groups of its key.
+        counts (ndarray): The count of each key.
+        dropped (int): Highest dropped count.
+
+    Methods:
+        __init__(self, orders=(2, 3), capacity=settings.NGRAM_CAPACITY): Class's constructor.
+        update(self, ids, tweets, skip): Counts the n-grams of a batch of encoded tweets.
+        most_common(self, vocabulary, n): The n most counted phrases.
+    """
+
+    def __init__(self, orders=(2, 3), capacity=settings.NGRAM_CAPACITY):
+
+        """Initializing NgramCounter Class"""
+        self.orders = orders
+        self.capacity = capacity
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.dropped = 0
+
+    def update(self, ids, tweets, skip):
+
+        """
+        Counts the n-grams of a batch of encoded tweets.
+
+        Args:
+            ids (ndarray): The tokens's ids (see Vocabulary.encode_tweets).
+            tweets (ndarray): The tweet's number of each token.
+            skip (ndarray): Boolean array of the ids which can't start or end an n-gram (see Vocabulary.mask).
+
+        Returns:
+            None
+        """
+
+        keys, counts = [self.keys], [self.counts]
+
+        for n in self.orders:
+            size = len(ids) - n + 1
+            if size <= 0:
+                continue
+
+            # The n-gram of each position - within its tweet, without a skipped first or last token
+            valid = (tweets[:size] == tweets[n - 1:]) & ~skip[ids[:size]] & ~skip[ids[n - 1:]]
+            packed = np.zeros(size, dtype=np.int64)
+            for k in range(n):
+                packed |= ids[k:k + size] << (ID_BITS * (n - 1 - k))
+
+            unique, unique_counts = np.unique(packed[valid], return_counts=True)
+            keys.append(unique)
+            counts.append(unique_counts)
+
+        # Merge with the counts so far
+        self.keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate(counts)).astype(np.int64)
+
+        if len(self.keys) > self.capacity:
+            keep = np.sort(np.argpartition(-self.counts, self.capacity)[:self.capacity])
+            self.dropped = max(self.dropped, int(np.delete(self.counts, keep).max()))
+            self.keys, self.counts = self.keys[keep], self.counts[keep]
+
+    def most_common(self, vocabulary, n=None):
+
+        """
+        The n most counted phrases.
+
+        Args:
+            vocabulary (Vocabulary): The vocabulary which encoded the tweets.
+            n (int): Number of phrases (all the kept phrases when None).
+
+        Returns:
+            List of (phrase, count) tuples, most counted first.
+        """
+
+        top = np.argsort(-self.counts, kind='stable')[:n]
+        mask = (1 << ID_BITS) - 1
+        phrases = list()
+
+        for key, count in zip(self.keys[top].tolist(), self.counts[top].tolist()):
+            length = (key.bit_length() + ID_BITS - 1) // ID_BITS
+            ids = [(key >> (ID_BITS * (length - 1 - k))) & mask for k in range(length)]
+            phrases.append((' '.join(vocabulary.decode(ids)), count))
+
+        return phrases
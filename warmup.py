@@ -0,0 +1,84 @@
+import importlib
+import time
+
+from tweepy import (API, OAuthHandler)
+
+from credential_pool import build_search_client
+from search_client import RETRY_STATUSES
+from tweet_analyzer import TweetAnalyzer
+import settings
+import twitter_credentials
+
+VERIFY_PATH = "/account/verify_credentials.json"
+
+
+def build_auth():
+
+    """
+    Builds the OAuth handler of the credentials in twitter_credentials.
+
+    Returns:
+        auth (OAuthHandler): Twitter credentials for authentication.
+    """
+
+    auth = OAuthHandler(twitter_credentials.CONSUMER_KEY, twitter_credentials.CONSUMER_SECRET)
+    auth.set_access_token(twitter_credentials.ACCESS_TOKEN, twitter_credentials.ACCESS_TOKEN_SECRET)
+
+    return auth
+
+
+def build_api(auth):
+
+    """
+    Builds the tweepy API ('cursor' fetch mode) with the same retries & timeout as the search client.
+
+    Args:
+        auth (OAuthHandler): Twitter credentials for authentication.
+
+    Returns:
+        api (API): API instance.
+    """
+
+    return API(auth, retry_count=settings.RETRIES, retry_delay=settings.RETRY_BACKOFF,
+               retry_errors=set(RETRY_STATUSES), timeout=settings.REQUEST_TIMEOUT[1])
+
+
+def warm_up(main_window, verify=settings.VERIFY_CREDENTIALS, modules=settings.WARM_UP_MODULES):
+
+    """
+    Does the first session's setup ahead of time - imports the lazily loaded modules, builds the auth, the API & the
+    search client and a TweetAnalyzer with its stop words, and optionally verifies the credentials.
+
+    Args:
+        main_window (App): The main window (shares its status bar with the analyzer).
+        verify (bool): Verify the credentials through the search client.
+        modules (iterable): Names of the modules to import.
+
+    Parameters:
+        result (dict): The warmed up objects.
+
+    Returns:
+        result (dict): 'auth', 'twitter_client', 'search_client', 'tweet_analyzer', 'screen_name' (when verified) and
+                       'seconds' of the warm-up.
+    """
+
+    start = time.perf_counter()
+    result = dict()
+
+    for name in modules:
+        importlib.import_module(name)
+
+    result['auth'] = build_auth()
+    result['twitter_client'] = build_api(result['auth'])
+    result['search_client'] = build_search_client(result['auth'])
+
+    result['tweet_analyzer'] = TweetAnalyzer(main_window)
+    result['tweet_analyzer'].warm_up()
+
+    if verify:
+        result['screen_name'] = result['search_client'].get(VERIFY_PATH, skip_status='true',
+                                                            include_entities='false')['screen_name']
+
+    result['seconds'] = time.perf_counter() - start
+
+    return result